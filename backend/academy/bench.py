@@ -0,0 +1,40 @@
+"""Shared pieces of the ``bench_*`` management commands.
+
+Benchmarks fill a throwaway database, created and dropped the way
+``manage.py test`` does, so they never touch the configured one.
+"""
+
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.db import connection
+
+
+@contextmanager
+def throwaway_database():
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def timed(func, repeat: int) -> list[float]:
+    """Milliseconds taken by each of ``repeat`` calls of ``func``."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def describe(samples: list[float]) -> str:
+    return f"mediana {statistics.median(samples):.2f} ms, p99 {percentile(samples, 99):.2f} ms"
@@ -0,0 +1,54 @@
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+
+from academy.models import Lesson, OutboxEmail, StudentVersion
+from academy.outbox import lesson_emails
+from academy.slots import free_intervals
+
+
+class SlotUnavailable(Exception):
+    pass
+
+
+def _serialize_bookings(user_ids) -> int:
+    """Take the SQLite write lock for the current transaction; returns the rows written.
+
+    SQLite has no row locks; a write as the first statement takes the
+    database write lock, so concurrent bookings run one after another
+    (waiting on the busy timeout) and each sees the lesson before it.
+    The version rows are inserted first, so the UPDATE always writes even
+    for users who never had a version bumped.
+    """
+    ids = set(user_ids)
+    StudentVersion.objects.bulk_create([StudentVersion(user_id=user_id) for user_id in ids], ignore_conflicts=True)
+    return StudentVersion.objects.filter(user_id__in=ids).update(schedule=F("schedule"))
+
+
+def book_lesson(student, professor_id: int, start, end) -> Lesson:
+    """Create an AGENDADA lesson in a free slot of the professor, or raise ``SlotUnavailable``.
+
+    The checks below answer most conflicts without writing. Postgres
+    backs them with exclusion constraints on the professor's and the
+    student's scheduled time ranges, so a booking that races past the
+    checks fails on insert instead of double-booking.
+    """
+    with transaction.atomic():
+        if connection.vendor != "postgresql":
+            _serialize_bookings([student.pk, professor_id])
+        free = free_intervals([professor_id], start, end)[professor_id]
+        if not any(free_start <= start and end <= free_end for free_start, free_end in free):
+            raise SlotUnavailable
+        student_busy = Lesson.objects.filter(
+            student=student, status=Lesson.Status.AGENDADA, start__lt=end, end__gt=start
+        )
+        if student_busy.exists():
+            raise SlotUnavailable
+        try:
+            with transaction.atomic():
+                lesson = Lesson.objects.create(
+                    student=student, professor_id=professor_id, start=start, end=end
+                )
+        except IntegrityError:
+            raise SlotUnavailable
+        lesson_emails([lesson], OutboxEmail.Kind.AGENDAMENTO)
+        return lesson
@@ -0,0 +1,120 @@
+import re
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from django.utils.http import content_disposition_header
+from rest_framework import status
+
+from academy.storage import get_storage
+
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+STREAM_BLOCK_SIZE = 64 * 1024
+
+
+class Unsatisfiable(ValueError):
+    pass
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """Inclusive ``(first, last)`` byte positions of a single-range header.
+
+    Multiple or malformed ranges return None, which serves the whole file
+    as the RFC allows.
+    """
+    match = _RANGE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if not first:
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise Unsatisfiable(header)
+        return max(size - suffix, 0), size - 1
+    start = int(first)
+    if start >= size:
+        raise Unsatisfiable(header)
+    if last and int(last) < start:
+        return None
+    return start, min(int(last), size - 1) if last else size - 1
+
+
+class _RangeFile:
+    """Read at most ``length`` bytes of ``file`` from its current position.
+
+    It keeps ``fileno`` so a WSGI server's file_wrapper (gunicorn) can
+    still sendfile() the range straight from the page cache.
+    """
+
+    def __init__(self, file, length: int):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if self.remaining <= 0:
+            return b""
+        size = self.remaining if size < 0 else min(size, self.remaining)
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self) -> int:
+        return self.file.fileno()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def file_response(request, stored, filename: str = ""):
+    """Serve a stored blob with ETag, single-range and sendfile support."""
+    storage = get_storage()
+    etag = f'"{stored.sha256}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        # Blobs are immutable, so the browser may reuse what it has.
+        "Cache-Control": "private, max-age=86400",
+    }
+    disposition = content_disposition_header(False, filename)
+    if disposition:
+        headers["Content-Disposition"] = disposition
+
+    if etag in request.headers.get("If-None-Match", ""):
+        return HttpResponse(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    sendfile_header = settings.MATERIAL_SENDFILE_HEADER
+    if sendfile_header:
+        # The proxy handles Range itself and streams with sendfile.
+        if sendfile_header.lower() == "x-accel-redirect":
+            target = settings.MATERIAL_SENDFILE_PREFIX.rstrip("/") + "/" + storage.relative_path(stored.sha256)
+        else:
+            target = str(storage.path(stored.sha256))
+        headers[sendfile_header] = target
+        return HttpResponse(content_type=stored.content_type, headers=headers)
+
+    byte_range = None
+    if "Range" in request.headers and request.headers.get("If-Range", etag) == etag:
+        try:
+            byte_range = parse_range(request.headers["Range"], stored.size)
+        except Unsatisfiable:
+            headers["Content-Range"] = f"bytes */{stored.size}"
+            return HttpResponse(status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE, headers=headers)
+
+    file = storage.open(stored.sha256)
+    if byte_range is None:
+        response = FileResponse(file, content_type=stored.content_type)
+    else:
+        first, last = byte_range
+        file.seek(first)
+        response = FileResponse(
+            _RangeFile(file, last - first + 1),
+            status=status.HTTP_206_PARTIAL_CONTENT,
+            content_type=stored.content_type,
+        )
+        response["Content-Length"] = last - first + 1
+        response["Content-Range"] = f"bytes {first}-{last}/{stored.size}"
+    response.block_size = STREAM_BLOCK_SIZE
+    for name, value in headers.items():
+        response[name] = value
+    return response
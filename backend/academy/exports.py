@@ -0,0 +1,139 @@
+import csv
+import json
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+
+from academy.models import Lesson, Material
+
+
+User = get_user_model()
+
+EXPORT_FORMATS = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+# Leading characters that make Excel/LibreOffice/Sheets treat a CSV cell as a formula.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+# name -> (model, [(column, lookup)]); lookups are read with values_list().
+EXPORTS = {
+    "users": (
+        User,
+        [
+            ("id", "id"),
+            ("email", "email"),
+            ("first_name", "first_name"),
+            ("last_name", "last_name"),
+            ("role", "role"),
+            ("is_active", "is_active"),
+            ("date_joined", "date_joined"),
+            ("professor_id", "student_profile__professor_id"),
+            ("turma_id", "student_profile__turma_id"),
+            ("progress", "student_profile__progress"),
+        ],
+    ),
+    "lessons": (
+        Lesson,
+        [
+            ("id", "id"),
+            ("student_id", "student_id"),
+            ("professor_id", "professor_id"),
+            ("start", "start"),
+            ("end", "end"),
+            ("status", "status"),
+            ("created_at", "created_at"),
+            ("updated_at", "updated_at"),
+        ],
+    ),
+    "materials": (
+        Material,
+        [
+            ("id", "id"),
+            ("student_id", "student_id"),
+            ("professor_id", "professor_id"),
+            ("asset_id", "asset_id"),
+            ("title", "asset__title"),
+            ("type", "asset__type"),
+            ("status", "status"),
+            ("uploaded_at", "uploaded_at"),
+            ("updated_at", "updated_at"),
+        ],
+    ),
+}
+
+
+class _Line:
+    """File-like target that hands back what csv.writer writes."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def export_queryset(name: str):
+    model, _ = EXPORTS[name]
+    return model._default_manager.all()
+
+
+def _rows(name: str, qs, chunk_size: int):
+    _, columns = EXPORTS[name]
+    lookups = [lookup for _, lookup in columns]
+    qs = qs.order_by("id")
+    connection = connections[qs.db]
+    if connection.vendor != "postgresql" or not connection.settings_dict.get("DISABLE_SERVER_SIDE_CURSORS"):
+        yield from qs.values_list(*lookups).iterator(chunk_size=chunk_size)
+        return
+    # Without a named cursor psycopg would fetch the whole result at once
+    # (DISABLE_SERVER_SIDE_CURSORS, needed behind a transaction pooler), so
+    # read keyset pages of ``chunk_size`` rows instead.
+    last_id = None
+    while True:
+        page = qs if last_id is None else qs.filter(id__gt=last_id)
+        rows = list(page.values_list("id", *lookups)[:chunk_size])
+        for row in rows:
+            yield row[1:]
+        if len(rows) < chunk_size:
+            return
+        last_id = rows[-1][0]
+
+
+def _value(value):
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def _csv_value(value):
+    """``_value``, with text that a spreadsheet would run as a formula prefixed by ``'``."""
+    value = _value(value)
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def iter_export(name: str, fmt: str, qs=None, chunk_size: int = 2000, rows_per_chunk: int = 500):
+    """Yield ``qs`` (every row of the export by default) as CSV or NDJSON text.
+
+    Rows come from a chunked ``values_list().iterator()`` (keyset pages
+    when Postgres server-side cursors are off) and are written out
+    ``rows_per_chunk`` at a time, so memory stays flat regardless of the
+    table size and the first bytes go out after the first chunk. CSV cells
+    that would start a formula are escaped with ``'``.
+    """
+    _, columns = EXPORTS[name]
+    headers = [column for column, _ in columns]
+    qs = export_queryset(name) if qs is None else qs
+    if fmt == "csv":
+        writer = csv.writer(_Line())
+        yield writer.writerow(headers)
+
+        def encode(row):
+            return writer.writerow(map(_csv_value, row))
+    else:
+        def encode(row):
+            return json.dumps(dict(zip(headers, map(_value, row))), ensure_ascii=False) + "\n"
+
+    buffer = []
+    for row in _rows(name, qs, chunk_size):
+        buffer.append(encode(row))
+        if len(buffer) >= rows_per_chunk:
+            yield "".join(buffer)
+            buffer = []
+    if buffer:
+        yield "".join(buffer)
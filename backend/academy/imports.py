@@ -0,0 +1,202 @@
+import csv
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from academy.models import StudentProfile, Turma
+from academy.search import USER_SEARCH_FIELDS, index_search, search_document
+from academy.serializers import UserCreateSerializer
+from academy.summaries import display_name
+from accounts.hashing import get_password_pool, hash_passwords
+
+
+User = get_user_model()
+
+IMPORT_FORMATS = {"csv", "ndjson"}
+
+
+def detect_format(filename: str, default: str = "csv") -> str:
+    lowered = (filename or "").lower()
+    if lowered.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    if lowered.endswith(".csv"):
+        return "csv"
+    return default
+
+
+def iter_rows(stream, fmt: str):
+    """Yield ``(row_number, data, error)`` from a binary or text stream.
+
+    Rows are read one at a time so memory does not grow with the file.
+    """
+    if isinstance(stream.read(0), bytes):
+        stream = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, {k: v for k, v in row.items() if k and v not in ("", None)}, None
+        return
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            yield number, None, "JSON inválido."
+            continue
+        if not isinstance(data, dict):
+            yield number, None, "Cada linha deve ser um objeto JSON."
+            continue
+        yield number, data, None
+
+
+def _result(row: int, email: str, status: str, detail: str = "") -> dict:
+    return {"row": row, "email": email, "status": status, "detail": detail}
+
+
+def _first_error(errors) -> str:
+    for field, messages in errors.items():
+        message = messages[0] if isinstance(messages, list) else messages
+        return f"{field}: {message}" if field != "non_field_errors" else str(message)
+    return "Linha inválida."
+
+
+def import_users(stream, fmt: str = "csv", batch_size: int = 500, executor=None):
+    """Create users from a CSV/NDJSON stream and yield one result per row.
+
+    Rows take ``UserCreateSerializer`` fields. Each batch is validated
+    against the database in a fixed number of queries and inserted with
+    ``bulk_create`` in its own transaction. PBKDF2 dominates the cost of
+    creating a user, so passwords are hashed on ``executor``; by default
+    that is the shared password pool's threads, which bounds what web
+    requests can start. The management command passes a process pool.
+    """
+    executor = executor or get_password_pool().executor
+    seen_emails: set[str] = set()
+    batch: list[tuple[int, dict]] = []
+    for number, data, error in iter_rows(stream, fmt):
+        if error:
+            yield _result(number, "", "error", error)
+            continue
+        serializer = UserCreateSerializer(data=data)
+        if not serializer.is_valid():
+            yield _result(number, str(data.get("email", "")), "error", _first_error(serializer.errors))
+            continue
+        row = serializer.validated_data
+        email = row["email"].strip().lower()
+        if email in seen_emails:
+            yield _result(number, email, "duplicate", "Email repetido no arquivo.")
+            continue
+        seen_emails.add(email)
+        batch.append((number, {**row, "email": email}))
+        if len(batch) >= batch_size:
+            yield from _import_batch(batch, executor)
+            batch = []
+    if batch:
+        yield from _import_batch(batch, executor)
+
+
+def _import_batch(batch: list[tuple[int, dict]], executor) -> list[dict]:
+    emails = [row["email"] for _, row in batch]
+    taken = set()
+    for username, email in User.objects.filter(Q(username__in=emails) | Q(email__in=emails)).values_list(
+        "username", "email"
+    ):
+        taken.update({username, email})
+    professor_ids = {row["professor_id"] for _, row in batch if row.get("professor_id")}
+    turma_ids = {row["turma_id"] for _, row in batch if row.get("turma_id")}
+    professors = {
+        professor.id: display_name(professor)
+        for professor in User.objects.filter(id__in=professor_ids, role=User.Role.PROFESSOR).only(
+            "first_name", "last_name", "email"
+        )
+    }
+    turmas = set(Turma.objects.filter(id__in=turma_ids).values_list("id", flat=True))
+
+    results = []
+    accepted = []
+    for number, row in batch:
+        if row["email"] in taken:
+            results.append(_result(number, row["email"], "duplicate", "Email já cadastrado."))
+        elif row.get("professor_id") and row["professor_id"] not in professors:
+            results.append(_result(number, row["email"], "error", "Professor inválido."))
+        elif row.get("turma_id") and row["turma_id"] not in turmas:
+            results.append(_result(number, row["email"], "error", "Turma inválida."))
+        else:
+            accepted.append((number, row))
+    if not accepted:
+        return results
+
+    hashes = hash_passwords([row["password"] for _, row in accepted], executor)
+    users = []
+    for (_, row), password in zip(accepted, hashes):
+        user = User(
+            username=row["email"],
+            email=row["email"],
+            password=password,
+            first_name=row.get("first_name", ""),
+            last_name=row.get("last_name", ""),
+            role=row["role"],
+        )
+        user.search_text = search_document(user, USER_SEARCH_FIELDS)
+        users.append(user)
+
+    try:
+        _insert_users(users, accepted, professors)
+    except IntegrityError:
+        # Another writer created one of these emails (or removed a
+        # professor or turma) after the checks above; retry row by row so
+        # only the conflicting rows are reported.
+        for user, (number, row) in zip(users, accepted):
+            user.pk = None
+            try:
+                _insert_users([user], [(number, row)], professors)
+            except IntegrityError:
+                if User.objects.filter(Q(username=row["email"]) | Q(email=row["email"])).exists():
+                    results.append(_result(number, row["email"], "duplicate", "Email já cadastrado."))
+                else:
+                    results.append(_result(number, row["email"], "error", "Conflito ao inserir; reenvie esta linha."))
+            else:
+                results.append(_result(number, row["email"], "created"))
+        return sorted(results, key=lambda result: result["row"])
+
+    results.extend(_result(number, row["email"], "created") for number, row in accepted)
+    return sorted(results, key=lambda result: result["row"])
+
+
+def _insert_users(users: list, rows: list[tuple[int, dict]], professors: dict) -> None:
+    with transaction.atomic():
+        User.objects.bulk_create(users)
+        if any(user.pk is None for user in users):
+            ids = dict(User.objects.filter(username__in=[u.username for u in users]).values_list("username", "id"))
+            for user in users:
+                user.pk = ids[user.username]
+        StudentProfile.objects.bulk_create(
+            [
+                StudentProfile(
+                    user=user,
+                    professor_id=row.get("professor_id"),
+                    professor_name=professors.get(row.get("professor_id"), ""),
+                    turma_id=row.get("turma_id"),
+                )
+                for user, (_, row) in zip(users, rows)
+                if row["role"] == User.Role.ALUNO and (row.get("professor_id") or row.get("turma_id"))
+            ]
+        )
+        index_search(User, users)
+
+
+def summarize(results) -> dict:
+    """Consume ``import_users`` results, keeping only rows that need attention."""
+    summary = {"created": 0, "duplicates": 0, "errors": 0, "rows": []}
+    for result in results:
+        if result["status"] == "created":
+            summary["created"] += 1
+            continue
+        summary["duplicates" if result["status"] == "duplicate" else "errors"] += 1
+        summary["rows"].append(result)
+    summary["rows"].sort(key=lambda result: result["row"])
+    return summary
@@ -0,0 +1,96 @@
+import tempfile
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from academy.bench import describe, throwaway_database, timed
+from academy.models import Lesson, Material, MaterialAsset
+from academy.views import StudentLessonsView, StudentRepositoryView
+from accounts.authentication import CachedJWTAuthentication, TokenClaimsAuthentication
+from accounts.views import _tokens_for_user
+
+
+User = get_user_model()
+
+AUTHENTICATORS = [JWTAuthentication, CachedJWTAuthentication, TokenClaimsAuthentication]
+VIEWS = [("/api/student/lessons/", StudentLessonsView), ("/api/student/repository/", StudentRepositoryView)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede a latência e as consultas por requisição de StudentLessonsView e StudentRepositoryView "
+        "com cada autenticação JWT, em cache local e em cache compartilhado."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lessons", type=int, default=50)
+        parser.add_argument("--materials", type=int, default=30)
+        parser.add_argument("--repeat", type=int, default=500)
+
+    def handle(self, *args, **options):
+        with throwaway_database(), tempfile.TemporaryDirectory() as cache_dir:
+            access = self._seed(options["lessons"], options["materials"])
+            factory = APIRequestFactory()
+            caches = [
+                ("local", {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}),
+                # Stands in for Redis: shared between processes, so claim-only
+                # authentication does not fall back to the cached lookup.
+                (
+                    "compartilhado",
+                    {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": cache_dir},
+                ),
+            ]
+            self.stdout.write(
+                f"{options['lessons']} aulas e {options['materials']} materiais, respostas já em cache, "
+                f"banco {connection.vendor}:"
+            )
+            for cache_label, backend in caches:
+                with override_settings(CACHES={"default": backend}):
+                    for url, view_class in VIEWS:
+                        for authenticator in AUTHENTICATORS:
+                            view = view_class.as_view(authentication_classes=[authenticator])
+
+                            def call():
+                                response = view(factory.get(url, HTTP_AUTHORIZATION=f"Bearer {access}"))
+                                response.render()
+                                assert response.status_code == 200, response.status_code
+
+                            call()
+                            with CaptureQueriesContext(connection) as queries:
+                                call()
+                            samples = timed(call, options["repeat"])
+                            self.stdout.write(
+                                f"  {cache_label:13} {url:26} {authenticator.__name__:25} "
+                                f"{len(queries)} consultas  {describe(samples)}"
+                            )
+
+    def _seed(self, lessons: int, materials: int) -> str:
+        professor = User.objects.create(username="prof@example.com", email="prof@example.com", role=User.Role.PROFESSOR)
+        student = User.objects.create(username="aluno@example.com", email="aluno@example.com")
+        start = timezone.now() - timedelta(days=lessons)
+        Lesson.objects.bulk_create(
+            [
+                Lesson(
+                    student=student,
+                    professor=professor,
+                    start=start + timedelta(days=i),
+                    end=start + timedelta(days=i, hours=1),
+                    status=Lesson.Status.CONCLUIDA,
+                )
+                for i in range(lessons)
+            ]
+        )
+        assets = MaterialAsset.objects.bulk_create(
+            [
+                MaterialAsset(professor=professor, title=f"Material {i}", type=MaterialAsset.MaterialType.LINK)
+                for i in range(materials)
+            ]
+        )
+        Material.objects.bulk_create([Material(student=student, professor=professor, asset=asset) for asset in assets])
+        return _tokens_for_user(student)["access"]
@@ -0,0 +1,126 @@
+import asyncio
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from django.urls import path
+
+from academy.bench import percentile, throwaway_database
+from accounts import async_views
+from accounts.views import LoginView
+from config.views import HealthCheckView
+
+
+User = get_user_model()
+
+PASSWORD = "senha-de-teste-123"
+
+
+class Routes:
+    """Just the login and health routes, so both login views can be served in one process."""
+
+    def __init__(self, login_view):
+        self.urlpatterns = [
+            path("api/health/", HealthCheckView.as_view()),
+            path("api/auth/login/", login_view),
+        ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede logins por segundo, p99 e a latência de /api/health/ sob carga, "
+        "comparando LoginView (WSGI com threads) e a view assíncrona de login (ASGI)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=100)
+        parser.add_argument("--concurrency", type=int, default=20, help="Clientes fazendo login ao mesmo tempo.")
+        parser.add_argument("--threads", type=int, default=4, help="Threads do worker WSGI simulado.")
+        parser.add_argument("--probe-interval", type=float, default=0.1, help="Segundos entre sondagens de saúde.")
+
+    def handle(self, *args, **options):
+        with throwaway_database(), override_settings(ALLOWED_HOSTS=["testserver"]):
+            # A real PBKDF2 hash, computed once and shared by every account.
+            encoded = make_password(PASSWORD)
+            User.objects.bulk_create(
+                [
+                    User(username=f"login{i}@example.com", email=f"login{i}@example.com", password=encoded)
+                    for i in range(options["concurrency"])
+                ]
+            )
+            self.stdout.write(
+                f"{options['requests']} logins, {options['concurrency']} clientes, {options['threads']} threads WSGI, "
+                f"PASSWORD_HASH_WORKERS={settings.PASSWORD_HASH_WORKERS}, "
+                f"PASSWORD_HASH_QUEUE={settings.PASSWORD_HASH_QUEUE}:"
+            )
+            with ThreadPoolExecutor(max_workers=options["threads"]) as server:
+                self._report("WSGI", LoginView.as_view(), self._wsgi_sender(server), options)
+            self._report("ASGI", async_views.login, self._asgi_sender(), options)
+
+    def _wsgi_sender(self, server):
+        # Requests wait for a free worker thread, as in a threaded WSGI server.
+        def send(method, url, data=None):
+            def call():
+                client = Client()
+                if method == "post":
+                    return client.post(url, data, content_type="application/json").status_code
+                return client.get(url).status_code
+
+            return asyncio.get_running_loop().run_in_executor(server, call)
+
+        return send
+
+    def _asgi_sender(self):
+        async def send(method, url, data=None):
+            client = AsyncClient()
+            if method == "post":
+                response = await client.post(url, data, content_type="application/json")
+            else:
+                response = await client.get(url)
+            return response.status_code
+
+        return send
+
+    def _report(self, label, login_view, send, options):
+        with override_settings(ROOT_URLCONF=Routes(login_view)):
+            logins, probes, elapsed = asyncio.run(self._load(send, options))
+        statuses = Counter(status for status, _ in logins)
+        served = [ms for status, ms in logins if status == 200]
+        self.stdout.write(
+            f"  {label}: {len(served) / elapsed:.2f} logins/s ({len(logins) / elapsed:.2f} respostas/s), "
+            f"p99 {percentile(served, 99) if served else 0:.0f} ms, "
+            f"status {dict(sorted(statuses.items()))}, "
+            f"/api/health/ p99 {percentile(probes, 99):.0f} ms em {len(probes)} sondagens"
+        )
+
+    async def _load(self, send, options):
+        remaining = iter(range(options["requests"]))
+        logins, probes = [], []
+
+        async def timed_send(*args):
+            started = time.perf_counter()
+            status = await send(*args)
+            return status, (time.perf_counter() - started) * 1000
+
+        async def client(index):
+            body = {"email": f"login{index}@example.com", "password": PASSWORD}
+            for _ in remaining:
+                logins.append(await timed_send("post", "/api/auth/login/", body))
+
+        async def prober():
+            while True:
+                probes.append((await timed_send("get", "/api/health/"))[1])
+                await asyncio.sleep(options["probe_interval"])
+
+        started = time.perf_counter()
+        probing = asyncio.create_task(prober())
+        await asyncio.gather(*(client(index) for index in range(options["concurrency"])))
+        elapsed = time.perf_counter() - started
+        probing.cancel()
+        return logins, probes, elapsed
@@ -0,0 +1,68 @@
+import random
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Q
+
+from academy.bench import describe, throwaway_database, timed
+from academy.search import USER_SEARCH_FIELDS, index_search, search, search_document
+
+
+User = get_user_model()
+
+FIRST_NAMES = ["André", "Andréa", "Ana", "Zoé", "João", "Maria", "Hélène", "Luís", "Camille", "Bruno", "Inês", "Théo"]
+LAST_NAMES = ["Gonçalves", "Silva", "Souza", "Lima", "Dubois", "Martin", "Araújo", "Pereira", "Lefèvre", "Costa"]
+# Most surnames are made up from these, so rarer terms match a few rows.
+SYLLABLES = ["ba", "ca", "dé", "fon", "ga", "lu", "mar", "ni", "pé", "ra", "sé", "ta", "vi", "zé", "rou", "quin"]
+TERMS = ["Andre", "andréa", "goncalves", "helene", "zo", "araujo", "rouquin", "tavira"]
+
+
+def legacy_filter(qs, term: str):
+    """The admin search before academy.search: four unindexed icontains."""
+    return qs.filter(
+        Q(email__icontains=term)
+        | Q(username__icontains=term)
+        | Q(first_name__icontains=term)
+        | Q(last_name__icontains=term)
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara a busca indexada de usuários com o filtro icontains antigo "
+        "num banco descartável com usuários sintéticos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100_000)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        with throwaway_database():
+            self._seed(options["users"])
+            self.stdout.write(f"{options['users']} usuários, banco {connection.vendor}; primeira página (10) e total:")
+            for term in TERMS:
+                for label, filtered in (
+                    ("icontains", legacy_filter(User.objects.order_by("-date_joined"), term)),
+                    ("indexada", search(User.objects.all(), term).order_by("-search_rank", "-date_joined")),
+                ):
+                    samples = timed(lambda: (list(filtered[:10]), filtered.count()), options["repeat"])
+                    self.stdout.write(f"  {term!r:14} {label:9} {filtered.count():6} resultados  {describe(samples)}")
+
+    def _seed(self, count: int, batch_size: int = 5000):
+        rng = random.Random(42)
+        for start in range(0, count, batch_size):
+            users = []
+            for i in range(start, min(start + batch_size, count)):
+                first = rng.choice(FIRST_NAMES)
+                if rng.random() < 0.1:
+                    last = rng.choice(LAST_NAMES)
+                else:
+                    last = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+                email = f"usuario{i}@example.com"
+                user = User(username=email, email=email, first_name=first, last_name=last)
+                user.search_text = search_document(user, USER_SEARCH_FIELDS)
+                users.append(user)
+            User.objects.bulk_create(users)
+            index_search(User, User.objects.filter(username__in=[user.username for user in users]).only("search_text"))
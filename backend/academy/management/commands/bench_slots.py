@@ -0,0 +1,136 @@
+import random
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from academy.bench import describe, throwaway_database, timed
+from academy.models import Lesson, ScheduleException, WorkingHours
+from academy.slots import available_slots, free_intervals, split_slots
+
+
+User = get_user_model()
+
+WORKING_WINDOWS = [(time(8), time(12)), (time(14), time(18))]
+
+
+def probed_slots(professor_id: int, start: datetime, end: datetime, duration: timedelta) -> list:
+    """One overlap query per candidate slot: what the slot engine replaces."""
+    tz = timezone.get_current_timezone()
+    windows = WorkingHours.objects.filter(professor_id=professor_id).values_list("weekday", "start_time", "end_time")
+    slots = []
+    day = timezone.localtime(start, tz).date()
+    while day < timezone.localtime(end, tz).date():
+        for weekday, start_time, end_time in windows:
+            if weekday != day.weekday():
+                continue
+            slot_start = timezone.make_aware(datetime.combine(day, start_time), tz)
+            window_end = timezone.make_aware(datetime.combine(day, end_time), tz)
+            while slot_start + duration <= window_end:
+                slot_end = slot_start + duration
+                taken = Lesson.objects.filter(
+                    professor_id=professor_id, status=Lesson.Status.AGENDADA, start__lt=slot_end, end__gt=slot_start
+                ).exists() or ScheduleException.objects.filter(
+                    professor_id=professor_id,
+                    kind=ScheduleException.Kind.BLOQUEIO,
+                    start__lt=slot_end,
+                    end__gt=slot_start,
+                ).exists()
+                if not taken:
+                    slots.append((slot_start, slot_end))
+                slot_start = slot_end
+        day += timedelta(days=1)
+    return slots
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede o cálculo de horários livres (a frio e com cache) para vários professores "
+        "num banco descartável, comparado a uma consulta por horário."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--professors", type=int, default=200)
+        parser.add_argument("--weeks", type=int, default=8)
+        parser.add_argument("--lessons", type=int, default=40, help="Aulas agendadas por professor.")
+        parser.add_argument("--repeat", type=int, default=10)
+
+    def handle(self, *args, **options):
+        with throwaway_database():
+            start = timezone.make_aware(datetime.combine(timezone.localdate() + timedelta(days=1), time.min))
+            end = start + timedelta(weeks=options["weeks"])
+            ids = self._seed(options["professors"], options["lessons"], start, end)
+            duration = timedelta(minutes=60)
+            self.stdout.write(
+                f"{len(ids)} professores, {options['weeks']} semanas, {options['lessons']} aulas cada, "
+                f"banco {connection.vendor}:"
+            )
+
+            def cold(professor_ids):
+                cache.clear()
+                return available_slots(professor_ids, start, end, duration)
+
+            def report(label, func):
+                with CaptureQueriesContext(connection) as queries:
+                    func()
+                samples = timed(func, options["repeat"])
+                self.stdout.write(f"  {label:42} {len(queries):4} consultas  {describe(samples)}")
+
+            report("free_intervals, todos", lambda: free_intervals(ids, start, end))
+            report("available_slots, todos, sem cache", lambda: cold(ids))
+            available_slots(ids, start, end, duration)
+            report("available_slots, todos, com cache", lambda: available_slots(ids, start, end, duration))
+            report("available_slots, um professor, sem cache", lambda: cold(ids[:1]))
+            available_slots(ids[:1], start, end, duration)
+            report("available_slots, um professor, com cache", lambda: available_slots(ids[:1], start, end, duration))
+            report("consulta por horário, um professor", lambda: probed_slots(ids[0], start, end, duration))
+
+            engine = split_slots(free_intervals(ids[:1], start, end)[ids[0]], duration)
+            if engine != probed_slots(ids[0], start, end, duration):
+                self.stderr.write("Os horários calculados divergem da consulta por horário.")
+
+    def _seed(self, professors: int, lessons: int, start: datetime, end: datetime) -> list[int]:
+        rng = random.Random(15)
+        User.objects.bulk_create(
+            [
+                User(username=f"prof{i}@example.com", email=f"prof{i}@example.com", role=User.Role.PROFESSOR)
+                for i in range(professors)
+            ]
+        )
+        ids = list(User.objects.filter(role=User.Role.PROFESSOR).order_by("id").values_list("id", flat=True))
+        student = User.objects.create(username="aluno@example.com", email="aluno@example.com")
+        WorkingHours.objects.bulk_create(
+            [
+                WorkingHours(professor_id=professor_id, weekday=weekday, start_time=window_start, end_time=window_end)
+                for professor_id in ids
+                for weekday in range(5)
+                for window_start, window_end in WORKING_WINDOWS
+            ]
+        )
+        # Lessons and blocks on whole hours inside the working windows.
+        hours = []
+        day = timezone.localtime(start).date()
+        while day < timezone.localtime(end).date():
+            if day.weekday() < 5:
+                for window_start, window_end in WORKING_WINDOWS:
+                    for hour in range(window_start.hour, window_end.hour):
+                        hours.append(timezone.make_aware(datetime.combine(day, time(hour))))
+            day += timedelta(days=1)
+        rows, blocks = [], []
+        for professor_id in ids:
+            picked = rng.sample(hours, lessons + 4)
+            rows += [
+                Lesson(student=student, professor_id=professor_id, start=moment, end=moment + timedelta(hours=1))
+                for moment in picked[:lessons]
+            ]
+            blocks += [
+                ScheduleException(professor_id=professor_id, start=moment, end=moment + timedelta(hours=1))
+                for moment in picked[lessons:]
+            ]
+        Lesson.objects.bulk_create(rows)
+        ScheduleException.objects.bulk_create(blocks)
+        return ids
@@ -0,0 +1,42 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from academy.query_plans import explain, hot_queries, plan_problems
+
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Executa EXPLAIN nas consultas mais frequentes de aulas e materiais e falha "
+        "se alguma usar varredura sequencial ou ordenação sem índice."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--student", type=int, help="Aluno usado nas consultas (padrão: o primeiro).")
+        parser.add_argument("--professor", type=int, help="Professor usado nas consultas (padrão: o primeiro).")
+        parser.add_argument("--verbose-plans", action="store_true", help="Mostra o plano completo de cada consulta.")
+
+    def handle(self, *args, **options):
+        student_id = options["student"] or self._first_id(User.Role.ALUNO)
+        professor_id = options["professor"] or self._first_id(User.Role.PROFESSOR)
+        failures = 0
+        for name, qs in hot_queries(student_id, professor_id).items():
+            plan = explain(qs)
+            problems = plan_problems(plan, connection.vendor)
+            if problems:
+                failures += 1
+                self.stderr.write(f"{name}: {'; '.join(problems)}")
+            else:
+                self.stdout.write(f"{name}: ok")
+            if options["verbose_plans"]:
+                self.stdout.write(plan)
+        if failures:
+            raise CommandError(f"{failures} consulta(s) sem índice adequado.")
+        self.stdout.write(self.style.SUCCESS("Todas as consultas usam índices."))
+
+    @staticmethod
+    def _first_id(role) -> int:
+        return User.objects.filter(role=role).order_by("id").values_list("id", flat=True).first() or 0
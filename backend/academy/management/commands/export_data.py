@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from academy.exports import EXPORT_FORMATS, EXPORTS, iter_export
+
+
+class Command(BaseCommand):
+    help = "Exporta usuários, aulas ou materiais em CSV ou NDJSON, lendo o banco em blocos."
+
+    def add_arguments(self, parser):
+        parser.add_argument("name", choices=sorted(EXPORTS))
+        parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="csv")
+        parser.add_argument("--output", help="Arquivo de saída (padrão: saída padrão).")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        chunks = iter_export(options["name"], options["format"], chunk_size=options["chunk_size"])
+        if not options["output"]:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+        try:
+            stream = open(options["output"], "w", encoding="utf-8", newline="")
+        except OSError as exc:
+            raise CommandError(str(exc))
+        with stream:
+            for chunk in chunks:
+                stream.write(chunk)
+        self.stderr.write(self.style.SUCCESS(f"Exportação salva em {options['output']}."))
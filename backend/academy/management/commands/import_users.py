@@ -0,0 +1,45 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from academy.imports import IMPORT_FORMATS, detect_format, import_users
+
+
+class Command(BaseCommand):
+    help = "Importa usuários em lote a partir de um arquivo CSV ou NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=sorted(IMPORT_FORMATS))
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--workers", type=int, default=None)
+
+    def handle(self, *args, **options):
+        fmt = options["format"] or detect_format(options["path"])
+        counts = {"created": 0, "duplicate": 0, "error": 0}
+        try:
+            stream = open(options["path"], "rb")
+        except OSError as exc:
+            raise CommandError(str(exc))
+        # A one-off process pool: hashing a whole file is worth the startup
+        # cost here, unlike in a web worker.
+        workers = options["workers"] or os.cpu_count() or 1
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            with stream:
+                for result in import_users(stream, fmt, batch_size=options["batch_size"], executor=executor):
+                    counts[result["status"]] += 1
+                    if result["status"] != "created":
+                        self.stderr.write(
+                            f"linha {result['row']} ({result['email'] or '-'}): "
+                            f"{result['status']} - {result['detail']}"
+                        )
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{counts['created']} criados, {counts['duplicate']} duplicados, {counts['error']} com erro."
+            )
+        )
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from academy.sync import TOMBSTONE_RETENTION, prune_tombstones
+
+
+class Command(BaseCommand):
+    help = "Remove registros de exclusão mais antigos que o prazo de retenção da sincronização."
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones()
+        self.stdout.write(
+            self.style.SUCCESS(f"{deleted} registros removidos (retenção de {TOMBSTONE_RETENTION.days} dias).")
+        )
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from academy.uploads import UPLOAD_RETENTION, prune_uploads
+
+
+class Command(BaseCommand):
+    help = "Remove uploads antigos e os blocos de envios que nunca foram concluídos."
+
+    def handle(self, *args, **options):
+        deleted = prune_uploads()
+        self.stdout.write(
+            self.style.SUCCESS(f"{deleted} uploads removidos (retenção de {UPLOAD_RETENTION.days} dias).")
+        )
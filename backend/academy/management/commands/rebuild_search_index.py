@@ -0,0 +1,14 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from academy.models import Turma
+from academy.search import TURMA_SEARCH_FIELDS, USER_SEARCH_FIELDS, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Recalcula o texto de busca de usuários e turmas e reconstrói o índice."
+
+    def handle(self, *args, **options):
+        users = rebuild_search_index(get_user_model(), USER_SEARCH_FIELDS)
+        turmas = rebuild_search_index(Turma, TURMA_SEARCH_FIELDS)
+        self.stdout.write(self.style.SUCCESS(f"Índice reconstruído: {users} usuários, {turmas} turmas."))
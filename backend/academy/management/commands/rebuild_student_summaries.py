@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from academy.summaries import rebuild_summaries
+
+
+class Command(BaseCommand):
+    help = "Recalcula o resumo (última/próxima aula, professor) de todos os alunos."
+
+    def handle(self, *args, **options):
+        updated = rebuild_summaries()
+        self.stdout.write(self.style.SUCCESS(f"Resumo recalculado para {updated} alunos."))
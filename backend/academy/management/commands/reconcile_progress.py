@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from academy.summaries import refresh_progress
+
+
+class Command(BaseCommand):
+    help = "Reconta materiais e aulas de cada aluno e corrige o progresso que divergiu dos contadores."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--student", type=int, action="append", dest="students", help="Somente este aluno (repetível).")
+
+    def handle(self, *args, **options):
+        fixed = refresh_progress(options["students"])
+        self.stdout.write(self.style.SUCCESS(f"Progresso corrigido para {fixed} alunos."))
@@ -0,0 +1,35 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from academy.scheduler import LessonScheduler
+
+
+class Command(BaseCommand):
+    help = (
+        "Conclui as aulas encerradas e coloca na fila os lembretes antes do prazo de cancelamento, "
+        "dormindo até o próximo horário em vez de varrer a tabela."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Só processa o que já venceu e termina.")
+        parser.add_argument("--horizon", type=float, default=6, help="Horas de prazos mantidos em memória.")
+        parser.add_argument(
+            "--refresh", type=float, default=60, help="Segundos entre as buscas por aulas criadas ou alteradas."
+        )
+
+    def handle(self, *args, **options):
+        scheduler = LessonScheduler(
+            horizon=timedelta(hours=options["horizon"]), refresh=timedelta(seconds=options["refresh"])
+        )
+        if options["once"]:
+            self.report(*scheduler.start())
+            return
+        try:
+            scheduler.run(report=self.report)
+        except KeyboardInterrupt:
+            pass
+
+    def report(self, concluded: int, reminded: int) -> None:
+        if concluded or reminded:
+            self.stdout.write(f"{concluded} aulas concluídas, {reminded} lembretes na fila.")
@@ -0,0 +1,44 @@
+import time
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+
+from academy.outbox import claim, deliver
+
+
+class Command(BaseCommand):
+    help = (
+        "Envia os emails de notificação pendentes na fila do banco, em lotes, "
+        "reaproveitando a conexão SMTP. Vários workers podem rodar ao mesmo tempo."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=settings.OUTBOX_BATCH_SIZE, help="Emails por lote.")
+        parser.add_argument(
+            "--interval", type=float, default=5, help="Segundos de espera quando a fila está vazia."
+        )
+        parser.add_argument("--once", action="store_true", help="Esvazia a fila uma vez e termina.")
+
+    def handle(self, *args, **options):
+        mail = get_connection()
+        total_sent = total_failed = 0
+        try:
+            while True:
+                emails = claim(options["batch_size"])
+                if not emails:
+                    if options["once"]:
+                        break
+                    mail.close()
+                    time.sleep(options["interval"])
+                    continue
+                sent, failed = deliver(emails, mail)
+                total_sent += sent
+                total_failed += failed
+                if failed:
+                    self.stderr.write(f"{failed} emails falharam; nova tentativa mais tarde.")
+        except KeyboardInterrupt:
+            pass
+        finally:
+            mail.close()
+        self.stdout.write(self.style.SUCCESS(f"{total_sent} emails enviados, {total_failed} falhas."))
@@ -0,0 +1,89 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from academy.models import Material, StudentProfile
+from academy.outbox import material_emails
+from academy.summaries import adjust_progress, ensure_profiles
+from academy.versions import MATERIALS, PROFILE, bump_versions
+
+
+User = get_user_model()
+
+BATCH_SIZE = 1000
+
+COMPLETED = "concluido"
+ALREADY_COMPLETED = "ja_concluido"
+NOT_FOUND = "nao_encontrado"
+
+
+def recipient_ids(professor, student_ids=(), turma=None) -> set[int]:
+    """Ids among ``student_ids`` that are students of ``professor``, plus every student of ``turma``."""
+    ids = set()
+    requested = list(dict.fromkeys(student_ids))
+    students = User.objects.filter(role=User.Role.ALUNO, student_profile__professor=professor)
+    for start in range(0, len(requested), BATCH_SIZE):
+        chunk = requested[start : start + BATCH_SIZE]
+        ids.update(students.filter(id__in=chunk).values_list("id", flat=True))
+    if turma is not None:
+        ids.update(StudentProfile.objects.filter(turma=turma).values_list("user_id", flat=True))
+    return ids
+
+
+def assign_asset(asset, student_ids: set[int], professor=None) -> int:
+    """Give each student a ``Material`` row for ``asset``; returns how many were new.
+
+    One batched insert, skipping students who already have the asset.
+    Signals do not fire for ``bulk_create``, so the repository versions
+    and progress counters are updated here, and the notification emails
+    are queued in the same transaction.
+    """
+    with transaction.atomic():
+        existing = set()
+        ids = list(student_ids)
+        for start in range(0, len(ids), BATCH_SIZE):
+            existing.update(
+                Material.objects.filter(asset=asset, student_id__in=ids[start : start + BATCH_SIZE]).values_list(
+                    "student_id", flat=True
+                )
+            )
+        new_ids = set(student_ids) - existing
+        Material.objects.bulk_create(
+            [Material(asset=asset, student_id=student_id, professor=professor) for student_id in new_ids],
+            batch_size=BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        ensure_profiles(new_ids)
+        adjust_progress(new_ids, materials_assigned=1)
+        bump_versions(new_ids, MATERIALS, PROFILE)
+        material_emails(asset, new_ids)
+    return len(new_ids)
+
+
+def complete_materials(student, material_ids) -> dict[int, str]:
+    """Mark the student's ``material_ids`` as done; returns a result per id.
+
+    The rows are completed by one UPDATE filtered on both the ids and the
+    student, so ids belonging to someone else are reported as not found.
+    Progress moves by the UPDATE's row count, which keeps replays and
+    concurrent requests from counting a material twice.
+    """
+    ids = list(dict.fromkeys(material_ids))
+    with transaction.atomic():
+        owned = Material.objects.filter(id__in=ids, student=student)
+        statuses = dict(owned.select_for_update().values_list("id", "status"))
+        completed = owned.exclude(status=Material.Status.CONCLUIDO).update(
+            status=Material.Status.CONCLUIDO, updated_at=timezone.now()
+        )
+        if completed:
+            adjust_progress([student.pk], materials_completed=completed)
+            bump_versions([student.pk], MATERIALS, PROFILE)
+    results = {}
+    for material_id in ids:
+        if material_id not in statuses:
+            results[material_id] = NOT_FOUND
+        elif statuses[material_id] == Material.Status.CONCLUIDO:
+            results[material_id] = ALREADY_COMPLETED
+        else:
+            results[material_id] = COMPLETED
+    return results
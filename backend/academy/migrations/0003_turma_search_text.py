@@ -0,0 +1,73 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:14
+
+import unicodedata
+
+from django.db import OperationalError, migrations, models
+
+
+FIELDS = ("name", "description")
+
+
+def _normalize(value):
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
+
+
+def backfill_search_text(apps, schema_editor):
+    Model = apps.get_model("academy", "Turma")
+    db = schema_editor.connection.alias
+    batch = []
+    for obj in Model.objects.using(db).only("pk", *FIELDS).iterator(chunk_size=2000):
+        obj.search_text = _normalize(" ".join(getattr(obj, name) or "" for name in FIELDS))
+        batch.append(obj)
+        if len(batch) >= 2000:
+            Model.objects.using(db).bulk_update(batch, ["search_text"])
+            batch = []
+    if batch:
+        Model.objects.using(db).bulk_update(batch, ["search_text"])
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS academy_turma_search_trgm ON academy_turma USING gin (search_text gin_trgm_ops)"
+        )
+    elif vendor == "sqlite":
+        try:
+            schema_editor.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS academy_turma_fts USING fts5(search_text, tokenize='trigram')"
+            )
+        except OperationalError:
+            # SQLite without FTS5 or older than 3.34: search falls back to LIKE.
+            return
+        schema_editor.execute(
+            "INSERT INTO academy_turma_fts (rowid, search_text) SELECT id, search_text FROM academy_turma"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS academy_turma_search_trgm")
+    elif vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS academy_turma_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academy', '0002_add_turma_model'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='turma',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(backfill_search_text, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
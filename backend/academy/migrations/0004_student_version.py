@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academy', '0003_turma_search_text'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentVersion',
+            fields=[
+                ('user_id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('materials', models.PositiveBigIntegerField(default=0)),
+                ('lessons', models.PositiveBigIntegerField(default=0)),
+                ('profile', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:26
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+
+def backfill_summaries(apps, schema_editor):
+    User = apps.get_model("accounts", "User")
+    StudentProfile = apps.get_model("academy", "StudentProfile")
+    Lesson = apps.get_model("academy", "Lesson")
+    db = schema_editor.connection.alias
+
+    students = User.objects.using(db).filter(role="aluno").values_list("id", flat=True)
+    StudentProfile.objects.using(db).bulk_create(
+        [StudentProfile(user_id=student_id) for student_id in students], ignore_conflicts=True
+    )
+
+    professor_ids = StudentProfile.objects.using(db).exclude(professor=None).values_list("professor_id", flat=True)
+    for professor in User.objects.using(db).filter(id__in=set(professor_ids)):
+        name = f"{professor.first_name} {professor.last_name}".strip() or professor.email
+        StudentProfile.objects.using(db).filter(professor_id=professor.id).update(professor_name=name)
+
+    lessons = Lesson.objects.using(db).filter(student=OuterRef("user_id"))
+    StudentProfile.objects.using(db).update(
+        last_lesson=Subquery(lessons.filter(status="concluida").order_by("-end").values("end")[:1]),
+        next_lesson=Subquery(
+            lessons.filter(status="agendada", start__gte=timezone.now()).order_by("start").values("start")[:1]
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academy', '0004_student_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentprofile',
+            name='last_lesson',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='studentprofile',
+            name='next_lesson',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='studentprofile',
+            name='professor_name',
+            field=models.CharField(blank=True, default='', max_length=301),
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academy', '0005_student_profile_summary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='lesson',
+            index=models.Index(fields=['student', '-start', '-id'], name='lesson_student_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lesson',
+            index=models.Index(condition=models.Q(('status', 'agendada')), fields=['student', 'start'], name='lesson_student_upcoming_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lesson',
+            index=models.Index(condition=models.Q(('status', 'concluida')), fields=['student', '-end'], name='lesson_student_done_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lesson',
+            index=models.Index(condition=models.Q(('status', 'agendada')), fields=['professor', 'student', 'start'], name='lesson_prof_upcoming_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lesson',
+            index=models.Index(condition=models.Q(('status', 'concluida')), fields=['professor', 'student', '-end'], name='lesson_prof_done_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='material',
+            index=models.Index(fields=['student', '-uploaded_at', '-id'], name='material_student_uploaded_idx'),
+        ),
+    ]
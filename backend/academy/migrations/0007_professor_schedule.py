@@ -0,0 +1,73 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:29
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academy', '0006_lesson_material_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduleException',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('bloqueio', 'Bloqueio'), ('extra', 'Horário extra')], default='bloqueio', max_length=20)),
+                ('start', models.DateTimeField()),
+                ('end', models.DateTimeField()),
+                ('reason', models.CharField(blank=True, default='', max_length=200)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='WorkingHours',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weekday', models.PositiveSmallIntegerField(help_text='0 = segunda-feira, 6 = domingo')),
+                ('start_time', models.TimeField()),
+                ('end_time', models.TimeField()),
+            ],
+            options={
+                'ordering': ['weekday', 'start_time'],
+            },
+        ),
+        migrations.AddField(
+            model_name='studentversion',
+            name='schedule',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='lesson',
+            index=models.Index(condition=models.Q(('status', 'agendada')), fields=['professor', 'start'], name='lesson_prof_schedule_idx'),
+        ),
+        migrations.AddField(
+            model_name='scheduleexception',
+            name='professor',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedule_exceptions', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='workinghours',
+            name='professor',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='working_hours', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='scheduleexception',
+            index=models.Index(fields=['professor', 'start'], name='schedule_exc_prof_start_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='scheduleexception',
+            constraint=models.CheckConstraint(condition=models.Q(('end__gt', models.F('start'))), name='schedule_exception_start_before_end'),
+        ),
+        migrations.AddConstraint(
+            model_name='workinghours',
+            constraint=models.CheckConstraint(condition=models.Q(('weekday__lte', 6)), name='working_hours_weekday_range'),
+        ),
+        migrations.AddConstraint(
+            model_name='workinghours',
+            constraint=models.CheckConstraint(condition=models.Q(('end_time__gt', models.F('start_time'))), name='working_hours_start_before_end'),
+        ),
+    ]
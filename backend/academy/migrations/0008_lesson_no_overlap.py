@@ -0,0 +1,37 @@
+from django.db import migrations
+
+
+CONSTRAINTS = {
+    "academy_lesson_professor_no_overlap": "professor_id",
+    "academy_lesson_student_no_overlap": "student_id",
+}
+
+
+def add_exclusion_constraints(apps, schema_editor):
+    # Postgres only: SQLite bookings are serialized in academy.booking.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    for name, column in CONSTRAINTS.items():
+        schema_editor.execute(
+            f"ALTER TABLE academy_lesson ADD CONSTRAINT {name} EXCLUDE USING gist "
+            f"({column} WITH =, tstzrange(start, \"end\", '[)') WITH &&) WHERE (status = 'agendada')"
+        )
+
+
+def drop_exclusion_constraints(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name in CONSTRAINTS:
+        schema_editor.execute(f"ALTER TABLE academy_lesson DROP CONSTRAINT IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("academy", "0007_professor_schedule"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_exclusion_constraints, drop_exclusion_constraints),
+    ]
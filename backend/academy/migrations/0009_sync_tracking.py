@@ -0,0 +1,67 @@
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_updated_at(apps, schema_editor):
+    db = schema_editor.connection.alias
+    apps.get_model("academy", "Lesson").objects.using(db).update(updated_at=F("created_at"))
+    apps.get_model("academy", "Material").objects.using(db).update(updated_at=F("uploaded_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("academy", "0008_lesson_no_overlap"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="lesson",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="material",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.CreateModel(
+            name="Tombstone",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("kind", models.CharField(choices=[("lesson", "Aula"), ("material", "Material")], max_length=20)),
+                ("object_id", models.BigIntegerField()),
+                ("student_id", models.BigIntegerField(blank=True, null=True)),
+                ("professor_id", models.BigIntegerField(blank=True, null=True)),
+                ("deleted_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="lesson",
+            index=models.Index(fields=["student", "updated_at"], name="lesson_student_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="lesson",
+            index=models.Index(fields=["professor", "updated_at"], name="lesson_prof_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="material",
+            index=models.Index(fields=["student", "updated_at"], name="material_student_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="material",
+            index=models.Index(fields=["professor", "updated_at"], name="material_prof_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="tombstone",
+            index=models.Index(fields=["student_id", "deleted_at"], name="tombstone_student_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="tombstone",
+            index=models.Index(fields=["professor_id", "deleted_at"], name="tombstone_professor_idx"),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+    ]
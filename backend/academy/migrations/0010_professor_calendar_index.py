@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academy', '0009_sync_tracking'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='lesson',
+            name='lesson_prof_schedule_idx',
+        ),
+        migrations.AddIndex(
+            model_name='lesson',
+            index=models.Index(fields=['professor', 'start', 'id'], name='lesson_prof_start_idx'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# Third step after 0012_material_assets_schema and the data move in
+# 0012_material_assets_backfill, kept separate so Postgres has no pending
+# trigger events when the columns are dropped.
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("academy", "0012_material_assets_backfill"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="material",
+            name="asset",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="assignments",
+                to="academy.materialasset",
+            ),
+        ),
+        # Defaults only so that unapplying can re-add the columns before the
+        # backfill runs in reverse.
+        migrations.AlterField(
+            model_name="material",
+            name="title",
+            field=models.CharField(default="", max_length=200),
+        ),
+        migrations.AlterField(
+            model_name="material",
+            name="type",
+            field=models.CharField(
+                choices=[("pdf", "PDF"), ("video", "Vídeo"), ("audio", "Áudio"), ("link", "Link")],
+                default="",
+                max_length=20,
+            ),
+        ),
+        migrations.RemoveField(model_name="material", name="title"),
+        migrations.RemoveField(model_name="material", name="type"),
+        migrations.RemoveField(model_name="material", name="file"),
+        migrations.RemoveField(model_name="material", name="file_name"),
+        migrations.AddConstraint(
+            model_name="material",
+            constraint=models.UniqueConstraint(fields=("asset", "student"), name="material_asset_student_unique"),
+        ),
+    ]
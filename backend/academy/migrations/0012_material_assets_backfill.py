@@ -0,0 +1,60 @@
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+BATCH_SIZE = 1000
+
+
+def move_to_assets(apps, schema_editor):
+    """One asset per distinct (professor, title, type, file) of the old rows."""
+    Material = apps.get_model("academy", "Material")
+    MaterialAsset = apps.get_model("academy", "MaterialAsset")
+    db = schema_editor.connection.alias
+    open_groups = {}
+    groups = []
+    rows = Material.objects.using(db).order_by("id").values_list(
+        "id", "student_id", "professor_id", "title", "type", "file_id", "file_name"
+    )
+    for pk, student_id, *key in rows.iterator(chunk_size=2000):
+        key = tuple(key)
+        group = open_groups.get(key)
+        # A student with two identical copies keeps both, on separate assets.
+        if group is None or student_id in group["students"]:
+            group = {"key": key, "students": set(), "ids": []}
+            open_groups[key] = group
+            groups.append(group)
+        group["students"].add(student_id)
+        group["ids"].append(pk)
+
+    for group in groups:
+        professor_id, title, type, file_id, file_name = group["key"]
+        asset = MaterialAsset.objects.using(db).create(
+            professor_id=professor_id, title=title, type=type, file_id=file_id, file_name=file_name
+        )
+        ids = group["ids"]
+        for start in range(0, len(ids), BATCH_SIZE):
+            Material.objects.using(db).filter(pk__in=ids[start : start + BATCH_SIZE]).update(asset=asset)
+
+
+def move_from_assets(apps, schema_editor):
+    Material = apps.get_model("academy", "Material")
+    MaterialAsset = apps.get_model("academy", "MaterialAsset")
+    db = schema_editor.connection.alias
+    asset = MaterialAsset.objects.using(db).filter(pk=OuterRef("asset_id"))
+    Material.objects.using(db).update(
+        title=Subquery(asset.values("title")[:1]),
+        type=Subquery(asset.values("type")[:1]),
+        file_id=Subquery(asset.values("file_id")[:1]),
+        file_name=Subquery(asset.values("file_name")[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("academy", "0012_material_assets_schema"),
+    ]
+
+    operations = [
+        migrations.RunPython(move_to_assets, move_from_assets),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:44
+
+from django.db import migrations, models
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce, Least
+
+
+def backfill_progress(apps, schema_editor):
+    StudentProfile = apps.get_model("academy", "StudentProfile")
+    Material = apps.get_model("academy", "Material")
+    Lesson = apps.get_model("academy", "Lesson")
+    db = schema_editor.connection.alias
+
+    students = set(Material.objects.using(db).values_list("student_id", flat=True).distinct())
+    students |= set(Lesson.objects.using(db).values_list("student_id", flat=True).distinct())
+    StudentProfile.objects.using(db).bulk_create(
+        [StudentProfile(user_id=student_id) for student_id in students], ignore_conflicts=True
+    )
+
+    def counted(model, *filters):
+        rows = (
+            model.objects.using(db)
+            .filter(*filters, student=OuterRef("user_id"))
+            .order_by()
+            .values("student")
+            .annotate(total=Count("id"))
+            .values("total")
+        )
+        return Coalesce(Subquery(rows), 0)
+
+    profiles = StudentProfile.objects.using(db)
+    profiles.update(
+        materials_assigned=counted(Material),
+        materials_completed=counted(Material, Q(status="concluido")),
+        lessons_booked=counted(Lesson, ~Q(status="cancelada")),
+        lessons_concluded=counted(Lesson, Q(status="concluida")),
+    )
+    done = F("materials_completed") + F("lessons_concluded")
+    total = F("materials_assigned") + F("lessons_booked")
+    profiles.update(
+        progress=Case(
+            When(Q(materials_assigned__gt=0) | Q(lessons_booked__gt=0), then=Least(done * 100 / total, Value(100))),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academy', '0012_material_assets'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentprofile',
+            name='lessons_booked',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='studentprofile',
+            name='lessons_concluded',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='studentprofile',
+            name='materials_assigned',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='studentprofile',
+            name='materials_completed',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_progress, migrations.RunPython.noop),
+    ]
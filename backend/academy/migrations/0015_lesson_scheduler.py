@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academy', '0014_outbox_email'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lesson',
+            name='reminder_sent_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='outboxemail',
+            name='kind',
+            field=models.CharField(choices=[('boas_vindas', 'Boas-vindas'), ('agendamento', 'Agendamento'), ('cancelamento', 'Cancelamento'), ('lembrete', 'Lembrete de aula'), ('material', 'Novo material')], max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='lesson',
+            index=models.Index(condition=models.Q(('status', 'agendada')), fields=['end'], name='lesson_due_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lesson',
+            index=models.Index(condition=models.Q(('reminder_sent_at__isnull', True), ('status', 'agendada')), fields=['start'], name='lesson_due_reminder_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lesson',
+            index=models.Index(fields=['updated_at'], name='lesson_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academy', '0015_lesson_scheduler'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='studentprofile',
+            index=models.Index(fields=['next_lesson'], name='profile_next_lesson_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:29
+
+from django.db import migrations
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.db.models.functions import Least
+
+
+def recompute_progress(apps, schema_editor):
+    StudentProfile = apps.get_model("academy", "StudentProfile")
+    done = F("materials_completed") + F("lessons_concluded")
+    total = F("materials_assigned") + F("lessons_concluded")
+    StudentProfile.objects.using(schema_editor.connection.alias).update(
+        progress=Case(
+            When(Q(materials_assigned__gt=0) | Q(lessons_concluded__gt=0), then=Least(done * 100 / total, Value(100))),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academy', '0016_student_profile_next_lesson_index'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='studentprofile',
+            name='lessons_booked',
+        ),
+        migrations.RunPython(recompute_progress, migrations.RunPython.noop),
+    ]
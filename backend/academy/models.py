@@ -1,5 +1,8 @@
+import uuid
+
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 
 class Turma(models.Model):
@@ -13,6 +16,7 @@ class Turma(models.Model):
         related_name="turmas",
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    search_text = models.TextField(blank=True, default="", editable=False)
 
     def __str__(self) -> str:
         return self.name
@@ -36,19 +40,88 @@ class StudentProfile(models.Model):
         blank=True,
         related_name="students",
     )
+    # Percentage of completed over assigned work, derived from the counters
+    # below (lessons count once concluded). academy.summaries.adjust_progress
+    # keeps them in step with F() increments; `manage.py reconcile_progress`
+    # recounts after drift.
     progress = models.PositiveSmallIntegerField(default=0)
+    materials_assigned = models.PositiveIntegerField(default=0)
+    materials_completed = models.PositiveIntegerField(default=0)
+    lessons_concluded = models.PositiveIntegerField(default=0)
+    # Denormalized summary for the student dashboard, maintained by
+    # academy.summaries; rebuild with `manage.py rebuild_student_summaries`.
+    last_lesson = models.DateTimeField(null=True, blank=True)
+    next_lesson = models.DateTimeField(null=True, blank=True)
+    professor_name = models.CharField(max_length=301, blank=True, default="")
+
+    class Meta:
+        # academy.scheduler: profiles whose next lesson has started.
+        indexes = [models.Index(fields=["next_lesson"], name="profile_next_lesson_idx")]
 
     def __str__(self) -> str:
         return f"{self.user_id}"
 
 
-class Material(models.Model):
+class StoredFile(models.Model):
+    """A blob in academy.storage, shared by every material with the same content."""
+
+    sha256 = models.CharField(max_length=64, unique=True)
+    size = models.PositiveBigIntegerField()
+    content_type = models.CharField(max_length=100, default="application/octet-stream")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return self.sha256
+
+
+class Upload(models.Model):
+    """A resumable upload in progress; ``offset`` bytes have been received."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="uploads")
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100, default="application/octet-stream")
+    size = models.PositiveBigIntegerField()
+    sha256 = models.CharField(max_length=64)
+    offset = models.PositiveBigIntegerField(default=0)
+    file = models.ForeignKey(StoredFile, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return str(self.id)
+
+
+class MaterialAsset(models.Model):
+    """A material as authored once; students receive it through ``Material`` rows."""
+
     class MaterialType(models.TextChoices):
         PDF = "pdf", "PDF"
         VIDEO = "video", "Vídeo"
         AUDIO = "audio", "Áudio"
         LINK = "link", "Link"
 
+    professor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="material_assets",
+    )
+    title = models.CharField(max_length=200)
+    type = models.CharField(max_length=20, choices=MaterialType.choices)
+    file = models.ForeignKey(
+        StoredFile, on_delete=models.PROTECT, null=True, blank=True, related_name="assets"
+    )
+    file_name = models.CharField(max_length=255, blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return self.title
+
+
+class Material(models.Model):
+    """One student's copy of a ``MaterialAsset``, with its own completion status."""
+
     class Status(models.TextChoices):
         PENDENTE = "pendente", "Pendente"
         CONCLUIDO = "concluido", "Concluído"
@@ -63,10 +136,22 @@ class Material(models.Model):
         blank=True,
         related_name="materials_created",
     )
-    title = models.CharField(max_length=200)
-    type = models.CharField(max_length=20, choices=MaterialType.choices)
+    asset = models.ForeignKey(MaterialAsset, on_delete=models.CASCADE, related_name="assignments")
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDENTE)
     uploaded_at = models.DateTimeField(auto_now_add=True)
+    # Maintained by save(); queryset .update() calls must set it explicitly
+    # or the change is invisible to academy.sync.
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["student", "-uploaded_at", "-id"], name="material_student_uploaded_idx"),
+            models.Index(fields=["student", "updated_at"], name="material_student_updated_idx"),
+            models.Index(fields=["professor", "updated_at"], name="material_prof_updated_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=["asset", "student"], name="material_asset_student_unique"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.id}"
@@ -88,6 +173,177 @@ class Lesson(models.Model):
     end = models.DateTimeField()
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.AGENDADA)
     created_at = models.DateTimeField(auto_now_add=True)
+    # See Material.updated_at.
+    updated_at = models.DateTimeField(auto_now=True)
+    # Set by academy.scheduler; cleared when the lesson is moved.
+    reminder_sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        # Matched to the lesson queries in academy.views and academy.summaries;
+        # `manage.py check_query_plans` fails if one of them stops using these.
+        indexes = [
+            models.Index(fields=["student", "-start", "-id"], name="lesson_student_start_idx"),
+            models.Index(
+                fields=["student", "start"],
+                name="lesson_student_upcoming_idx",
+                condition=models.Q(status="agendada"),
+            ),
+            models.Index(
+                fields=["student", "-end"],
+                name="lesson_student_done_idx",
+                condition=models.Q(status="concluida"),
+            ),
+            models.Index(
+                fields=["professor", "student", "start"],
+                name="lesson_prof_upcoming_idx",
+                condition=models.Q(status="agendada"),
+            ),
+            models.Index(
+                fields=["professor", "student", "-end"],
+                name="lesson_prof_done_idx",
+                condition=models.Q(status="concluida"),
+            ),
+            models.Index(fields=["professor", "start", "id"], name="lesson_prof_start_idx"),
+            models.Index(fields=["student", "updated_at"], name="lesson_student_updated_idx"),
+            models.Index(fields=["professor", "updated_at"], name="lesson_prof_updated_idx"),
+            # academy.scheduler: deadlines of scheduled lessons and edits since its last look.
+            models.Index(fields=["end"], name="lesson_due_end_idx", condition=models.Q(status="agendada")),
+            models.Index(
+                fields=["start"],
+                name="lesson_due_reminder_idx",
+                condition=models.Q(status="agendada", reminder_sent_at__isnull=True),
+            ),
+            models.Index(fields=["updated_at"], name="lesson_updated_idx"),
+        ]
+
+
+class Tombstone(models.Model):
+    """Record of a deleted lesson or material, kept for delta sync clients."""
+
+    class Kind(models.TextChoices):
+        LESSON = "lesson", "Aula"
+        MATERIAL = "material", "Material"
+
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    object_id = models.BigIntegerField()
+    # Plain ids: tombstones are written while cascades delete the owners.
+    student_id = models.BigIntegerField(null=True, blank=True)
+    professor_id = models.BigIntegerField(null=True, blank=True)
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["student_id", "deleted_at"], name="tombstone_student_idx"),
+            models.Index(fields=["professor_id", "deleted_at"], name="tombstone_professor_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.kind}:{self.object_id}"
+
+
+class WorkingHours(models.Model):
+    """A weekly availability window of a professor, in local time."""
+
+    professor = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="working_hours"
+    )
+    weekday = models.PositiveSmallIntegerField(help_text="0 = segunda-feira, 6 = domingo")
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+
+    class Meta:
+        ordering = ["weekday", "start_time"]
+        constraints = [
+            models.CheckConstraint(condition=models.Q(weekday__lte=6), name="working_hours_weekday_range"),
+            models.CheckConstraint(
+                condition=models.Q(end_time__gt=models.F("start_time")), name="working_hours_start_before_end"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.professor_id}:{self.weekday}"
+
+
+class ScheduleException(models.Model):
+    """A one-off change to a professor's working hours."""
+
+    class Kind(models.TextChoices):
+        BLOQUEIO = "bloqueio", "Bloqueio"
+        EXTRA = "extra", "Horário extra"
+
+    professor = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="schedule_exceptions"
+    )
+    kind = models.CharField(max_length=20, choices=Kind.choices, default=Kind.BLOQUEIO)
+    start = models.DateTimeField()
+    end = models.DateTimeField()
+    reason = models.CharField(max_length=200, blank=True, default="")
+
+    class Meta:
+        indexes = [models.Index(fields=["professor", "start"], name="schedule_exc_prof_start_idx")]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(end__gt=models.F("start")), name="schedule_exception_start_before_end"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.id}"
+
+
+class StudentVersion(models.Model):
+    # Plain id instead of a FK: versions are bumped from delete signals,
+    # including cascades that remove the user itself.
+    user_id = models.BigIntegerField(primary_key=True)
+    materials = models.PositiveBigIntegerField(default=0)
+    lessons = models.PositiveBigIntegerField(default=0)
+    profile = models.PositiveBigIntegerField(default=0)
+    # Bumped for professors: lessons, working hours and exceptions.
+    schedule = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.user_id}"
+
+
+class OutboxEmail(models.Model):
+    """A notification email, written in the transaction of the change it reports.
+
+    Delivered by `manage.py send_outbox_emails`; see academy.outbox.
+    """
+
+    class Kind(models.TextChoices):
+        BOAS_VINDAS = "boas_vindas", "Boas-vindas"
+        AGENDAMENTO = "agendamento", "Agendamento"
+        CANCELAMENTO = "cancelamento", "Cancelamento"
+        LEMBRETE = "lembrete", "Lembrete de aula"
+        MATERIAL = "material", "Novo material"
+
+    class Status(models.TextChoices):
+        PENDENTE = "pendente", "Pendente"
+        ENVIADO = "enviado", "Enviado"
+        FALHOU = "falhou", "Falhou"
+
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    to = models.EmailField()
+    subject = models.CharField(max_length=200)
+    body = models.TextField()
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDENTE)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # Next time a worker may pick the row up: pushed forward while a worker
+    # holds it and after each failure (backoff).
+    available_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["available_at", "id"],
+                name="outbox_due_idx",
+                condition=models.Q(status="pendente"),
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.id}"
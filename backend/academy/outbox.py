@@ -0,0 +1,162 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import EmailMessage
+from django.db import connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from academy.models import OutboxEmail
+from academy.summaries import display_name
+
+
+User = get_user_model()
+
+BATCH_SIZE = 1000
+
+
+def _when(value) -> str:
+    return timezone.localtime(value).strftime("%d/%m/%Y às %H:%M")
+
+
+def welcome_email(user) -> OutboxEmail:
+    return OutboxEmail.objects.create(
+        kind=OutboxEmail.Kind.BOAS_VINDAS,
+        to=user.email,
+        subject="Bem-vindo(a) à plataforma",
+        body=f"Olá, {display_name(user)}!\n\nSua conta foi criada com o email {user.email}.",
+    )
+
+
+_LESSON_SUBJECTS = {
+    OutboxEmail.Kind.AGENDAMENTO: "Aula agendada: {when}",
+    OutboxEmail.Kind.CANCELAMENTO: "Aula cancelada: {when}",
+    OutboxEmail.Kind.LEMBRETE: "Lembrete: aula em {when}",
+}
+_LESSON_BODIES = {
+    OutboxEmail.Kind.AGENDAMENTO: "A aula{with_whom} em {when} foi agendada.",
+    OutboxEmail.Kind.CANCELAMENTO: "A aula{with_whom} em {when} foi cancelada.",
+    OutboxEmail.Kind.LEMBRETE: "Você tem aula{with_whom} em {when}. Cancelamentos são aceitos até {cutoff}.",
+}
+
+
+def lesson_emails(lessons, kind: str) -> list[OutboxEmail]:
+    """Tell the student and the professor of each lesson that it was booked, cancelled or is coming up."""
+    lessons = list(lessons)
+    user_ids = {user_id for lesson in lessons for user_id in (lesson.student_id, lesson.professor_id)}
+    users = User.objects.filter(id__in=user_ids).only("first_name", "last_name", "email")
+    people = {user.id: user for user in users}
+    cutoff = timedelta(seconds=settings.LESSON_CANCEL_CUTOFF)
+    emails = []
+    for lesson in lessons:
+        student, professor = people.get(lesson.student_id), people.get(lesson.professor_id)
+        for recipient, other in ((student, professor), (professor, student)):
+            if recipient is None or not recipient.email:
+                continue
+            context = {
+                "when": _when(lesson.start),
+                "cutoff": _when(lesson.start - cutoff),
+                "with_whom": f" com {display_name(other)}" if other else "",
+            }
+            emails.append(
+                OutboxEmail(
+                    kind=kind,
+                    to=recipient.email,
+                    subject=_LESSON_SUBJECTS[kind].format(**context),
+                    body=f"Olá, {display_name(recipient)}!\n\n" + _LESSON_BODIES[kind].format(**context),
+                )
+            )
+    return OutboxEmail.objects.bulk_create(emails, batch_size=BATCH_SIZE)
+
+
+def material_emails(asset, student_ids) -> int:
+    """One email per student in ``student_ids`` about the new ``asset``."""
+    ids = list(student_ids)
+    created = 0
+    for start in range(0, len(ids), BATCH_SIZE):
+        students = User.objects.filter(id__in=ids[start : start + BATCH_SIZE]).exclude(email="")
+        created += len(
+            OutboxEmail.objects.bulk_create(
+                [
+                    OutboxEmail(
+                        kind=OutboxEmail.Kind.MATERIAL,
+                        to=student.email,
+                        subject=f"Novo material: {asset.title}",
+                        body=f"Olá, {display_name(student)}!\n\n"
+                        f"O material \"{asset.title}\" foi adicionado ao seu repositório.",
+                    )
+                    for student in students.only("first_name", "last_name", "email")
+                ]
+            )
+        )
+    return created
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff: base, 2x base, 4x base, ... capped at the maximum."""
+    base = settings.OUTBOX_RETRY_BASE
+    return timedelta(seconds=min(base * 2 ** max(attempts - 1, 0), settings.OUTBOX_RETRY_MAX))
+
+
+def claim(limit: int, using: str = "default") -> list[OutboxEmail]:
+    """Take up to ``limit`` due emails for this worker.
+
+    Claimed rows get their ``available_at`` pushed past the claim timeout,
+    so other workers skip them and a worker that dies mid-batch only
+    delays its rows. Postgres locks the candidates with ``SKIP LOCKED``
+    so concurrent workers never wait on each other; SQLite has no row
+    locks, so the first statement is a write that takes the database
+    lock and claims run one after another.
+    """
+    now = timezone.now()
+    connection = connections[using]
+    with transaction.atomic(using=using):
+        due = OutboxEmail.objects.using(using).filter(status=OutboxEmail.Status.PENDENTE, available_at__lte=now)
+        due = due.order_by("available_at", "id")
+        if connection.features.has_select_for_update_skip_locked:
+            ids = list(due.select_for_update(skip_locked=True).values_list("id", flat=True)[:limit])
+        else:
+            due.filter(pk__in=due.values("pk")[:limit]).update(attempts=F("attempts"))
+            ids = list(due.values_list("id", flat=True)[:limit])
+        if not ids:
+            return []
+        OutboxEmail.objects.using(using).filter(id__in=ids).update(
+            available_at=now + timedelta(seconds=settings.OUTBOX_CLAIM_TIMEOUT), attempts=F("attempts") + 1
+        )
+        return list(OutboxEmail.objects.using(using).filter(id__in=ids).order_by("id"))
+
+
+def deliver(emails: list[OutboxEmail], mail_connection, using: str = "default") -> tuple[int, int]:
+    """Send ``emails`` over ``mail_connection`` and record each outcome.
+
+    The connection is opened once and left open for the next batch; a
+    failed send closes it so the following message reconnects. Returns
+    ``(sent, failed)``.
+    """
+    sent, failed = [], []
+    for email in emails:
+        message = EmailMessage(email.subject, email.body, to=[email.to], connection=mail_connection)
+        try:
+            mail_connection.open()
+            mail_connection.send_messages([message])
+        except Exception as e:
+            email.last_error = f"{type(e).__name__}: {e}"[:2000]
+            failed.append(email)
+            mail_connection.close()
+        else:
+            sent.append(email.id)
+
+    now = timezone.now()
+    if sent:
+        OutboxEmail.objects.using(using).filter(id__in=sent).update(
+            status=OutboxEmail.Status.ENVIADO, sent_at=now, last_error=""
+        )
+    for email in failed:
+        if email.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+            email.status = OutboxEmail.Status.FALHOU
+        else:
+            email.available_at = now + retry_delay(email.attempts)
+    if failed:
+        OutboxEmail.objects.using(using).bulk_update(failed, ["status", "available_at", "last_error"])
+    return len(sent), len(failed)
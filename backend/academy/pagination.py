@@ -0,0 +1,158 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import ParseError
+
+
+def _int_param(request, name: str, default: int) -> int:
+    try:
+        return int(request.query_params.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def page_params(request, default_page_size: int = 10, max_page_size: int = 50) -> tuple[int, int]:
+    page = max(_int_param(request, "page", 1), 1)
+    page_size = max(min(_int_param(request, "page_size", default_page_size), max_page_size), 1)
+    return page, page_size
+
+
+def wants_pagination(request) -> bool:
+    return "page" in request.query_params or "page_size" in request.query_params
+
+
+def paginate(qs, request, serialize, default_page_size: int = 10, max_page_size: int = 50) -> dict:
+    page, page_size = page_params(request, default_page_size, max_page_size)
+    total = qs.count()
+    start = (page - 1) * page_size
+    end = start + page_size
+    return {"count": total, "page": page, "page_size": page_size, "results": serialize(qs[start:end])}
+
+
+def wants_cursor(request) -> bool:
+    return request.query_params.get("pagination") == "cursor" or "cursor" in request.query_params
+
+
+def cursor_variant(request, default_page_size: int = 10, max_page_size: int = 50) -> str:
+    """The parameters ``cursor_paginate`` reads, normalized, as a cache key part."""
+    _, page_size = page_params(request, default_page_size, max_page_size)
+    count_mode = request.query_params.get("count")
+    if count_mode not in {"exact", "estimate"}:
+        count_mode = "none"
+    return f"cursor:{page_size}:{count_mode}:{request.query_params.get('cursor', '')}"
+
+
+def encode_cursor(values: list, direction: str) -> str:
+    # isoformat() keeps microseconds, which the seek needs to be exact.
+    values = [value.isoformat() if hasattr(value, "isoformat") else value for value in values]
+    raw = json.dumps({"v": values, "d": direction}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, qs, fields: tuple[str, ...]) -> tuple[list, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        direction = data["d"]
+        raw_values = data["v"]
+        if direction not in {"next", "prev"} or len(raw_values) != len(fields):
+            raise ValueError(direction)
+        values = [
+            qs.model._meta.get_field(name).to_python(raw) for name, raw in zip(fields, raw_values)
+        ]
+    except (ValueError, TypeError, KeyError, binascii.Error, DjangoValidationError):
+        raise ParseError("Cursor inválido.")
+    if any(value is None for value in values):
+        raise ParseError("Cursor inválido.")
+    return values, direction
+
+
+def _seek(fields: tuple[str, ...], values: list, lookup: str) -> Q:
+    condition = Q()
+    for index, name in enumerate(fields):
+        step = Q(**{f"{name}__{lookup}": values[index]})
+        for prior, value in zip(fields[:index], values[:index]):
+            step &= Q(**{prior: value})
+        condition |= step
+    # The redundant bound on the leading field lets the planner use it as an
+    # index range instead of evaluating the OR row by row.
+    return Q(**{f"{fields[0]}__{lookup}e": values[0]}) & condition
+
+
+def estimate_count(qs) -> int:
+    if connections[qs.db].vendor != "postgresql":
+        return qs.count()
+    sql, params = qs.query.sql_with_params()
+    with connections[qs.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def cursor_paginate(
+    qs,
+    request,
+    serialize,
+    fields: tuple[str, ...],
+    default_page_size: int = 10,
+    max_page_size: int = 50,
+    descending: bool = True,
+) -> dict:
+    """Keyset pagination over ``fields``, all ordered descending (or all ascending).
+
+    The last field must be unique (normally ``id``) so every row has a
+    stable position. ``count`` may be ``exact``, ``estimate`` or ``none``.
+    """
+    _, page_size = page_params(request, default_page_size, max_page_size)
+    count_mode = request.query_params.get("count", "none")
+    if count_mode == "exact":
+        total = qs.count()
+    elif count_mode == "estimate":
+        total = estimate_count(qs)
+    else:
+        total = None
+
+    forward = [f"-{name}" for name in fields] if descending else list(fields)
+    backward = list(fields) if descending else [f"-{name}" for name in fields]
+    after, before = ("lt", "gt") if descending else ("gt", "lt")
+    cursor = request.query_params.get("cursor")
+    direction = "next"
+    page_qs = qs.order_by(*forward)
+    if cursor:
+        values, direction = decode_cursor(cursor, qs, fields)
+        if direction == "next":
+            page_qs = page_qs.filter(_seek(fields, values, after))
+        else:
+            page_qs = qs.order_by(*backward).filter(_seek(fields, values, before))
+
+    rows = list(page_qs[: page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if direction == "prev":
+        rows.reverse()
+
+    def position(obj) -> list:
+        return [getattr(obj, name) for name in fields]
+
+    next_cursor = previous_cursor = None
+    if rows:
+        if direction == "next":
+            next_cursor = encode_cursor(position(rows[-1]), "next") if has_more else None
+            previous_cursor = encode_cursor(position(rows[0]), "prev") if cursor else None
+        else:
+            next_cursor = encode_cursor(position(rows[-1]), "next")
+            previous_cursor = encode_cursor(position(rows[0]), "prev") if has_more else None
+
+    return {
+        "count": total,
+        "page_size": page_size,
+        "next": next_cursor,
+        "previous": previous_cursor,
+        "results": serialize(rows),
+    }
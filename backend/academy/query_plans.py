@@ -0,0 +1,77 @@
+import re
+from datetime import timedelta
+
+from django.db import connections, transaction
+from django.utils import timezone
+
+from academy.models import Lesson
+from academy.scheduler import edited_lessons, finished_lessons, reminder_lessons, started_profiles
+from academy.slots import booked_lessons, schedule_exceptions
+from academy.summaries import last_lesson_end, next_lesson_start
+from academy.sync import deleted_since, updated_since
+from academy.views import (
+    professor_calendar,
+    professor_change_sources,
+    student_change_sources,
+    student_lessons,
+    student_materials,
+)
+
+
+# Plan fragments that mean a hot query is not served by an index.
+_SQLITE_PROBLEMS = re.compile(r"\bSCAN\b|USE TEMP B-TREE")
+_POSTGRES_PROBLEMS = re.compile(r"Seq Scan|\bSort\b")
+
+# First page of the paginated lists, as cursor_paginate fetches it.
+_PAGE = 10 + 1
+
+
+def hot_queries(student_id: int, professor_id: int) -> dict:
+    """The per-request Lesson/Material queries, built by the same helpers the views and the scheduler use.
+
+    The summary subqueries are correlated on the student in the views;
+    here the student is fixed, which gives the same index lookup.
+    """
+    now = timezone.now()
+    student = Lesson.objects.filter(student_id=student_id)
+    pair = student.filter(professor_id=professor_id)
+    queries = {
+        "student lessons": student_lessons(student_id, {})[:_PAGE],
+        "student materials": student_materials(student_id)[:_PAGE],
+        "student next lesson": next_lesson_start(student, now),
+        "student last lesson": last_lesson_end(student),
+        "professor next lesson": next_lesson_start(pair, now),
+        "professor last lesson": last_lesson_end(pair),
+        "professor calendar": professor_calendar(professor_id, {"from": now, "to": now + timedelta(weeks=1)}),
+        "scheduler finished lessons": finished_lessons(now).values_list("id", "student_id", "professor_id"),
+        "scheduler reminders": reminder_lessons(now).values_list("id", "start"),
+        "scheduler started lessons": started_profiles(now).values_list("user_id", flat=True),
+        "scheduler lesson edits": edited_lessons(now).values_list("id", "start", "end", "reminder_sent_at"),
+        "professor booked lessons": booked_lessons([professor_id], now, now + timedelta(weeks=8)),
+        "professor schedule exceptions": schedule_exceptions([professor_id], now, now + timedelta(weeks=8)),
+    }
+    for owner, sources in (
+        ("student", student_change_sources(student_id)),
+        ("professor", professor_change_sources(professor_id)),
+    ):
+        for name, (qs, kind, owner_filter, _) in sources.items():
+            queries[f"{owner} {name} changes"] = updated_since(qs, now)
+            queries[f"{owner} {name} deletions"] = deleted_since(kind, owner_filter, now)
+    return queries
+
+
+def explain(qs) -> str:
+    connection = connections[qs.db]
+    if connection.vendor != "postgresql":
+        return qs.explain()
+    # Small or freshly seeded tables make a sequential scan the cheapest
+    # plan; penalising it shows whether an index could serve the query.
+    with transaction.atomic(using=qs.db), connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        cursor.execute("SET LOCAL enable_sort = off")
+        return qs.explain()
+
+
+def plan_problems(plan: str, vendor: str) -> list[str]:
+    pattern = _POSTGRES_PROBLEMS if vendor == "postgresql" else _SQLITE_PROBLEMS
+    return [line.strip() for line in plan.splitlines() if pattern.search(line)]
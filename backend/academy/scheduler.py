@@ -0,0 +1,221 @@
+import heapq
+import time
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from academy.models import Lesson, OutboxEmail, StudentProfile
+from academy.outbox import lesson_emails
+from academy.summaries import adjust_progress, refresh_lesson_summaries
+from academy.versions import LESSONS, PROFILE, SCHEDULE, bump_versions
+
+
+CONCLUDE = "concluir"
+REMIND = "lembrar"
+ADVANCE = "avancar"
+
+BATCH_SIZE = 1000
+
+# updated_at is set before the saving transaction commits; looking back
+# this far catches edits that committed after the previous check.
+CHANGE_OVERLAP = timedelta(seconds=30)
+
+
+def reminder_lead() -> timedelta:
+    return timedelta(seconds=settings.LESSON_REMINDER_LEAD)
+
+
+def finished_lessons(now):
+    return Lesson.objects.filter(status=Lesson.Status.AGENDADA, end__lte=now)
+
+
+def reminder_lessons(now):
+    """Scheduled lessons inside the reminder lead that can still be cancelled."""
+    return Lesson.objects.filter(
+        status=Lesson.Status.AGENDADA,
+        reminder_sent_at__isnull=True,
+        start__gt=now + timedelta(seconds=settings.LESSON_CANCEL_CUTOFF),
+        start__lte=now + reminder_lead(),
+    )
+
+
+def started_profiles(now):
+    """Profiles whose summarized next lesson has already started."""
+    return StudentProfile.objects.filter(next_lesson__lte=now)
+
+
+def edited_lessons(since):
+    return Lesson.objects.filter(status=Lesson.Status.AGENDADA, updated_at__gt=since)
+
+
+def _locked(qs):
+    if connection.features.has_select_for_update:
+        return qs.select_for_update()
+    # SQLite has no row locks; a write as the first statement takes the
+    # database lock, so two schedulers cannot handle the same rows.
+    qs.update(status=F("status"))
+    return qs
+
+
+def conclude_finished(now=None) -> int:
+    """Mark every scheduled lesson that has ended as CONCLUIDA; returns how many.
+
+    Batched UPDATEs instead of a save per lesson, so the work the signals
+    would do happens here: progress counters, last-lesson summaries and
+    versions.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        rows = list(_locked(finished_lessons(now)).values_list("id", "student_id", "professor_id"))
+        if not rows:
+            return 0
+        changed_at = timezone.now()
+        for start in range(0, len(rows), BATCH_SIZE):
+            Lesson.objects.filter(id__in=[row[0] for row in rows[start : start + BATCH_SIZE]]).update(
+                status=Lesson.Status.CONCLUIDA, updated_at=changed_at
+            )
+        per_student = Counter(student_id for _, student_id, _ in rows)
+        students_by_count = defaultdict(list)
+        for student_id, count in per_student.items():
+            students_by_count[count].append(student_id)
+        for count, student_ids in students_by_count.items():
+            adjust_progress(student_ids, lessons_concluded=count)
+        refresh_lesson_summaries(per_student)
+        bump_versions(per_student, LESSONS, PROFILE)
+        bump_versions({professor_id for _, _, professor_id in rows}, SCHEDULE)
+    return len(rows)
+
+
+def advance_next_lessons(now=None) -> int:
+    """Point profiles whose next lesson started at the following one; returns how many.
+
+    Keeps the student profile read-only: the summary is moved on here, at
+    the lesson start, instead of by the first request that sees it stale.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        student_ids = list(started_profiles(now).values_list("user_id", flat=True))
+        for start in range(0, len(student_ids), BATCH_SIZE):
+            chunk = student_ids[start : start + BATCH_SIZE]
+            refresh_lesson_summaries(chunk, now=now)
+            bump_versions(chunk, PROFILE)
+    return len(student_ids)
+
+
+def send_due_reminders(now=None) -> int:
+    """Queue reminder emails for lessons entering the reminder lead; returns how many lessons."""
+    now = now or timezone.now()
+    with transaction.atomic():
+        lessons = list(_locked(reminder_lessons(now)).only("id", "student_id", "professor_id", "start"))
+        for start in range(0, len(lessons), BATCH_SIZE):
+            Lesson.objects.filter(id__in=[lesson.id for lesson in lessons[start : start + BATCH_SIZE]]).update(
+                reminder_sent_at=now
+            )
+        lesson_emails(lessons, OutboxEmail.Kind.LEMBRETE)
+    return len(lessons)
+
+
+class LessonScheduler:
+    """Sleeps until the next lesson deadline instead of polling the table.
+
+    Deadlines (lesson starts and ends, reminder times) up to ``horizon`` ahead are
+    kept in a min-heap. A deadline only decides when to wake up: the jobs
+    above then act on every due row, so an entry made stale by an edit
+    costs one empty query. Edits and new bookings are picked up every
+    ``refresh`` through the updated_at index, and the horizon is extended
+    as time passes. Nothing is persisted; after a restart ``start`` catches
+    up on whatever became due while the scheduler was down.
+    """
+
+    def __init__(self, horizon=timedelta(hours=6), refresh=timedelta(minutes=1), clock=timezone.now):
+        self.horizon = horizon
+        self.refresh = refresh
+        self.clock = clock
+        self.heap: list[tuple] = []
+        self.queued: set[tuple] = set()
+        self.loaded_until = None
+        self.checked_at = None
+        self.next_refresh = None
+
+    def push(self, when, job: str, lesson_id: int) -> None:
+        entry = (when, job, lesson_id)
+        if entry not in self.queued:
+            self.queued.add(entry)
+            heapq.heappush(self.heap, entry)
+
+    def _push_deadlines(self, lesson_id, start, end, reminder_sent_at) -> None:
+        if start <= self.loaded_until:
+            self.push(start, ADVANCE, lesson_id)
+        if end <= self.loaded_until:
+            self.push(end, CONCLUDE, lesson_id)
+        if reminder_sent_at is None and start - reminder_lead() <= self.loaded_until:
+            self.push(start - reminder_lead(), REMIND, lesson_id)
+
+    def load(self, until) -> None:
+        """Queue the deadlines between the current horizon and ``until``."""
+        since, lead = self.loaded_until, reminder_lead()
+        ends = Lesson.objects.filter(status=Lesson.Status.AGENDADA, end__gt=since, end__lte=until)
+        for lesson_id, end in ends.values_list("id", "end"):
+            self.push(end, CONCLUDE, lesson_id)
+        reminders = Lesson.objects.filter(
+            status=Lesson.Status.AGENDADA,
+            reminder_sent_at__isnull=True,
+            start__gt=since + lead,
+            start__lte=until + lead,
+        )
+        for lesson_id, start in reminders.values_list("id", "start"):
+            self.push(start - lead, REMIND, lesson_id)
+        # Only the next lesson of each student matters to the summaries.
+        starts = StudentProfile.objects.filter(next_lesson__gt=since, next_lesson__lte=until)
+        for student_id, start in starts.values_list("user_id", "next_lesson"):
+            self.push(start, ADVANCE, student_id)
+        self.loaded_until = until
+
+    def load_changes(self, now) -> None:
+        changed = edited_lessons(self.checked_at - CHANGE_OVERLAP)
+        self.checked_at = now
+        for row in changed.values_list("id", "start", "end", "reminder_sent_at"):
+            self._push_deadlines(*row)
+
+    def start(self) -> tuple[int, int]:
+        now = self.clock()
+        done = conclude_finished(now), send_due_reminders(now)
+        advance_next_lessons(now)
+        self.loaded_until = self.checked_at = now
+        self.load(now + self.horizon)
+        self.next_refresh = now + self.refresh
+        return done
+
+    def step(self, now) -> tuple[int, int]:
+        """Run the jobs whose deadlines passed; returns ``(concluded, reminded)``."""
+        jobs = set()
+        while self.heap and self.heap[0][0] <= now:
+            entry = heapq.heappop(self.heap)
+            self.queued.discard(entry)
+            jobs.add(entry[1])
+        concluded = conclude_finished(now) if CONCLUDE in jobs else 0
+        reminded = send_due_reminders(now) if REMIND in jobs else 0
+        if ADVANCE in jobs:
+            advance_next_lessons(now)
+        if now >= self.next_refresh:
+            self.load_changes(now)
+            self.next_refresh = now + self.refresh
+        if self.loaded_until - now <= self.horizon / 2:
+            self.load(now + self.horizon)
+        return concluded, reminded
+
+    def next_wakeup(self):
+        return min(self.heap[0][0], self.next_refresh) if self.heap else self.next_refresh
+
+    def run(self, sleep=time.sleep, report=None) -> None:
+        report = report or (lambda concluded, reminded: None)
+        report(*self.start())
+        while True:
+            report(*self.step(self.clock()))
+            delay = (self.next_wakeup() - self.clock()).total_seconds()
+            if delay > 0:
+                sleep(delay)
@@ -0,0 +1,140 @@
+import unicodedata
+
+from django.db import connections
+from django.db.models import BooleanField, F, FloatField, Func, Q, Value
+from django.db.models.expressions import RawSQL
+
+
+USER_SEARCH_FIELDS = ("email", "username", "first_name", "last_name")
+TURMA_SEARCH_FIELDS = ("name", "description")
+
+# FTS5's trigram tokenizer cannot match anything shorter than one trigram.
+MIN_FTS_TERM = 3
+
+
+def normalize(value: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(stripped.casefold().split())
+
+
+def search_document(obj, fields: tuple[str, ...]) -> str:
+    return normalize(" ".join(getattr(obj, name) or "" for name in fields))
+
+
+def fts_table(model) -> str:
+    return f"{model._meta.db_table}_fts"
+
+
+_known_fts_tables: set[tuple[str, str, str]] = set()
+
+
+def _has_fts(connection, model) -> bool:
+    key = (connection.alias, str(connection.settings_dict["NAME"]), fts_table(model))
+    if key not in _known_fts_tables and key[2] in connection.introspection.table_names():
+        _known_fts_tables.add(key)
+    return key in _known_fts_tables
+
+
+def index_search(model, objs, using: str = "default") -> None:
+    """Mirror ``search_text`` of ``objs`` into the SQLite FTS shadow table.
+
+    Saves go through the signal handlers; bulk writes call this directly.
+    Postgres indexes the column itself, so this is a no-op there.
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite" or not objs or not _has_fts(connection, model):
+        return
+    table = connection.ops.quote_name(fts_table(model))
+    rows = [(obj.pk, obj.search_text) for obj in objs]
+    with connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {table} WHERE rowid = %s", [(pk,) for pk, _ in rows])
+        cursor.executemany(f"INSERT INTO {table} (rowid, search_text) VALUES (%s, %s)", rows)
+
+
+def unindex_search(model, pks, using: str = "default") -> None:
+    connection = connections[using]
+    if connection.vendor != "sqlite" or not pks or not _has_fts(connection, model):
+        return
+    table = connection.ops.quote_name(fts_table(model))
+    with connection.cursor() as cursor:
+        cursor.executemany(f"DELETE FROM {table} WHERE rowid = %s", [(pk,) for pk in pks])
+
+
+def rebuild_search_index(model, fields: tuple[str, ...], using: str = "default", batch_size: int = 2000) -> int:
+    """Recompute ``search_text`` for every row and refill the FTS table."""
+    connection = connections[using]
+    if connection.vendor == "sqlite" and _has_fts(connection, model):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {connection.ops.quote_name(fts_table(model))}")
+    total = 0
+    batch = []
+    for obj in model._default_manager.using(using).only("pk", *fields).iterator(chunk_size=batch_size):
+        obj.search_text = search_document(obj, fields)
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            total += _flush_rebuild(model, batch, using)
+            batch = []
+    if batch:
+        total += _flush_rebuild(model, batch, using)
+    return total
+
+
+def _flush_rebuild(model, batch, using: str) -> int:
+    model._default_manager.using(using).bulk_update(batch, ["search_text"])
+    index_search(model, batch, using=using)
+    return len(batch)
+
+
+def search(qs, term: str):
+    """Filter ``qs`` by ``term`` and annotate a ``search_rank`` (higher is better).
+
+    Matching is accent and case insensitive because both sides go through
+    ``normalize``. Postgres uses a pg_trgm GIN index on ``search_text``
+    (substring or word-similarity match); SQLite uses the FTS5 trigram
+    shadow table; anything else falls back to a LIKE on ``search_text``.
+    """
+    term = normalize(term)
+    if not term:
+        return qs
+    connection = connections[qs.db]
+
+    if connection.vendor == "postgresql":
+        similar = Func(
+            Value(term), F("search_text"), arg_joiner=" <%% ", template="(%(expressions)s)",
+            output_field=BooleanField(),
+        )
+        rank = Func(Value(term), F("search_text"), function="word_similarity", output_field=FloatField())
+        return (
+            qs.alias(search_similar=similar)
+            .filter(Q(search_text__contains=term) | Q(search_similar=True))
+            .annotate(search_rank=rank)
+        )
+
+    if connection.vendor == "sqlite" and len(term) >= MIN_FTS_TERM and _has_fts(connection, qs.model):
+        table = connection.ops.quote_name(fts_table(qs.model))
+        outer = connection.ops.quote_name(qs.model._meta.db_table)
+        match = '"' + term.replace('"', '""') + '"'
+        pk = connection.ops.quote_name(qs.model._meta.pk.column)
+        if qs.query.group_by is None:
+            # Joined, so the MATCH runs once. Ranking through a correlated
+            # subquery would run it again for every matching row.
+            return qs.extra(
+                tables=[fts_table(qs.model)],
+                where=[f"{table}.rowid = {outer}.{pk}", f"{table} MATCH %s"],
+                params=[match],
+                select={"search_rank": f"-bm25({table})"},
+            )
+        # bm25() cannot be used in a grouped query (e.g. turmas annotated
+        # with counts); those tables are small enough to rank row by row.
+        return qs.filter(
+            pk__in=RawSQL(f"SELECT rowid FROM {table} WHERE {table} MATCH %s", (match,))
+        ).annotate(
+            search_rank=RawSQL(
+                f"SELECT -bm25({table}) FROM {table} WHERE {table} MATCH %s AND {table}.rowid = {outer}.{pk}",
+                (match,),
+                output_field=FloatField(),
+            )
+        )
+
+    return qs.filter(search_text__contains=term).annotate(search_rank=Value(0.0, output_field=FloatField()))
@@ -1,7 +1,20 @@
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from rest_framework import serializers
 
-from academy.models import Lesson, Material, StudentProfile, Turma
+from academy.models import (
+    Lesson,
+    Material,
+    MaterialAsset,
+    ScheduleException,
+    StudentProfile,
+    Turma,
+    Upload,
+    WorkingHours,
+)
 
 
 User = get_user_model()
@@ -23,7 +36,10 @@ class TurmaSerializer(serializers.ModelSerializer):
         return ""
 
     def get_student_count(self, obj):
-        return obj.students.count()
+        count = getattr(obj, "student_count", None)
+        if count is None:
+            return obj.students.count()
+        return count
 
 
 class AdminUserSerializer(serializers.ModelSerializer):
@@ -76,17 +92,27 @@ class AdminUserUpdateSerializer(serializers.Serializer):
 
 
 class AssignStudentsSerializer(serializers.Serializer):
-    professor_id = serializers.IntegerField()
-    student_ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+    professor_id = serializers.IntegerField(required=False, allow_null=True)
+    turma_id = serializers.IntegerField(required=False, allow_null=True)
+    student_ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False, max_length=20000
+    )
+
+    def validate(self, attrs):
+        if "professor_id" not in attrs and "turma_id" not in attrs:
+            raise serializers.ValidationError("Informe professor_id e/ou turma_id.")
+        return attrs
 
 
 class ProfessorStudentSerializer(serializers.ModelSerializer):
     name = serializers.SerializerMethodField()
     progress = serializers.IntegerField(source="student_profile.progress")
+    last_lesson = serializers.DateTimeField(read_only=True, allow_null=True)
+    next_lesson = serializers.DateTimeField(read_only=True, allow_null=True)
 
     class Meta:
         model = User
-        fields = ["id", "name", "email", "progress"]
+        fields = ["id", "name", "email", "progress", "last_lesson", "next_lesson"]
 
     def get_name(self, obj):
         raw = f"{obj.first_name} {obj.last_name}".strip()
@@ -94,15 +120,59 @@ class ProfessorStudentSerializer(serializers.ModelSerializer):
 
 
 class MaterialSerializer(serializers.ModelSerializer):
+    """Student view of an assignment; querysets should select_related("asset")."""
+
+    title = serializers.CharField(source="asset.title")
+    type = serializers.CharField(source="asset.type")
+    file_name = serializers.CharField(source="asset.file_name")
+    has_file = serializers.SerializerMethodField()
+
     class Meta:
         model = Material
-        fields = ["id", "title", "type", "uploaded_at", "status"]
+        fields = ["id", "title", "type", "uploaded_at", "status", "updated_at", "has_file", "file_name"]
+
+    def get_has_file(self, obj):
+        return obj.asset.file_id is not None
 
 
 class LessonSerializer(serializers.ModelSerializer):
     class Meta:
         model = Lesson
-        fields = ["id", "start", "end", "status", "professor_id"]
+        fields = ["id", "start", "end", "status", "professor_id", "updated_at"]
+
+
+class ProfessorLessonSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Lesson
+        fields = ["id", "start", "end", "status", "student_id", "updated_at"]
+
+
+class ProfessorMaterialSerializer(MaterialSerializer):
+    class Meta(MaterialSerializer.Meta):
+        fields = MaterialSerializer.Meta.fields + ["student_id", "asset_id"]
+
+
+class MaterialAssetSerializer(serializers.ModelSerializer):
+    has_file = serializers.SerializerMethodField()
+
+    class Meta:
+        model = MaterialAsset
+        fields = ["id", "title", "type", "file_name", "has_file", "created_at"]
+
+    def get_has_file(self, obj):
+        return obj.file_id is not None
+
+
+class ProfessorCalendarLessonSerializer(serializers.ModelSerializer):
+    student_name = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Lesson
+        fields = ["id", "start", "end", "status", "student_id", "student_name"]
+
+    def get_student_name(self, obj):
+        raw = f"{obj.student.first_name} {obj.student.last_name}".strip()
+        return raw or obj.student.email
 
 
 class StudentProfileSerializer(serializers.Serializer):
@@ -114,3 +184,144 @@ class StudentProfileSerializer(serializers.Serializer):
     last_lesson = serializers.DateTimeField(allow_null=True)
     next_lesson = serializers.DateTimeField(allow_null=True)
     professor = serializers.CharField(allow_blank=True)
+
+
+class WorkingHoursSerializer(serializers.ModelSerializer):
+    weekday = serializers.IntegerField(min_value=0, max_value=6)
+
+    class Meta:
+        model = WorkingHours
+        fields = ["id", "weekday", "start_time", "end_time"]
+        read_only_fields = ["id"]
+
+    def validate(self, attrs):
+        if attrs["end_time"] <= attrs["start_time"]:
+            raise serializers.ValidationError("O horário final deve ser depois do inicial.")
+        return attrs
+
+
+class ScheduleExceptionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ScheduleException
+        fields = ["id", "kind", "start", "end", "reason"]
+        read_only_fields = ["id"]
+
+    def validate(self, attrs):
+        if attrs["end"] <= attrs["start"]:
+            raise serializers.ValidationError("O fim deve ser depois do início.")
+        return attrs
+
+
+class BookLessonSerializer(serializers.Serializer):
+    professor_id = serializers.IntegerField()
+    start = serializers.DateTimeField()
+    duration = serializers.IntegerField(min_value=15, max_value=240, default=60)
+
+    def validate_start(self, value):
+        if value <= timezone.now():
+            raise serializers.ValidationError("O horário já passou.")
+        return value
+
+
+class LessonWindowSerializer(serializers.Serializer):
+    """Optional ``from``/``to`` bounds on lesson start times."""
+
+    to = serializers.DateTimeField(required=False)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fields["from"] = serializers.DateTimeField(required=False)
+        return fields
+
+    def validate(self, attrs):
+        if "from" in attrs and "to" in attrs and attrs["to"] <= attrs["from"]:
+            raise serializers.ValidationError("O fim da janela deve ser depois do início.")
+        return attrs
+
+
+class CalendarWindowSerializer(LessonWindowSerializer):
+    """Window that is always bounded: a week from today by default."""
+
+    default_days = 7
+    max_days = 62
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        start = attrs.get("from") or timezone.make_aware(datetime.combine(timezone.localdate(), time.min))
+        end = attrs.get("to") or start + timedelta(days=self.default_days)
+        if end <= start:
+            raise serializers.ValidationError("O fim da janela deve ser depois do início.")
+        if end - start > timedelta(days=self.max_days):
+            raise serializers.ValidationError(f"O intervalo máximo é de {self.max_days} dias.")
+        attrs["from"], attrs["to"] = start, end
+        return attrs
+
+
+class SlotQuerySerializer(serializers.Serializer):
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    duration = serializers.IntegerField(min_value=15, max_value=240, default=60)
+
+    max_days = 62
+
+    def validate(self, attrs):
+        start = attrs.get("start") or timezone.localdate()
+        end = attrs.get("end") or start + timedelta(days=7)
+        if end < start:
+            raise serializers.ValidationError("A data final deve ser igual ou posterior à inicial.")
+        if (end - start).days > self.max_days:
+            raise serializers.ValidationError(f"O intervalo máximo é de {self.max_days} dias.")
+        attrs["start"], attrs["end"] = start, end
+        return attrs
+
+
+class UploadCreateSerializer(serializers.Serializer):
+    filename = serializers.CharField(max_length=255)
+    size = serializers.IntegerField(min_value=1)
+    sha256 = serializers.RegexField(r"^[0-9a-fA-F]{64}$")
+    content_type = serializers.CharField(max_length=100, default="application/octet-stream")
+
+    def validate_size(self, value):
+        if value > settings.MATERIAL_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError("Arquivo maior que o permitido.")
+        return value
+
+    def validate_sha256(self, value):
+        return value.lower()
+
+
+class UploadSerializer(serializers.ModelSerializer):
+    complete = serializers.SerializerMethodField()
+    chunk_size = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Upload
+        fields = ["id", "filename", "content_type", "size", "sha256", "offset", "complete", "chunk_size"]
+
+    def get_complete(self, obj):
+        return obj.file_id is not None
+
+    def get_chunk_size(self, obj):
+        return settings.MATERIAL_UPLOAD_CHUNK_SIZE
+
+
+class MaterialRecipientsSerializer(serializers.Serializer):
+    student_ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, allow_empty=False, max_length=20000
+    )
+    turma_id = serializers.IntegerField(required=False)
+
+    def validate(self, attrs):
+        if "student_ids" not in attrs and "turma_id" not in attrs:
+            raise serializers.ValidationError("Informe student_ids e/ou turma_id.")
+        return attrs
+
+
+class MaterialBatchCompleteSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=500)
+
+
+class MaterialCreateSerializer(MaterialRecipientsSerializer):
+    title = serializers.CharField(max_length=200)
+    type = serializers.ChoiceField(choices=MaterialAsset.MaterialType.choices)
+    upload_id = serializers.UUIDField(required=False)
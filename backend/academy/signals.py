@@ -0,0 +1,221 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from academy.models import (
+    Lesson,
+    Material,
+    OutboxEmail,
+    ScheduleException,
+    StudentProfile,
+    Tombstone,
+    Turma,
+    WorkingHours,
+)
+from academy.outbox import lesson_emails
+from academy.search import (
+    TURMA_SEARCH_FIELDS,
+    USER_SEARCH_FIELDS,
+    index_search,
+    search_document,
+    unindex_search,
+)
+from academy.summaries import (
+    display_name,
+    ensure_profiles,
+    progress_counts,
+    refresh_lesson_summaries,
+    refresh_professor_names,
+    shift_progress,
+)
+from academy.versions import LESSONS, MATERIALS, PROFILE, SCHEDULE, bump_versions
+
+
+User = get_user_model()
+
+SEARCH_FIELDS = {User: USER_SEARCH_FIELDS, Turma: TURMA_SEARCH_FIELDS}
+
+# Fields of a user that appear in their own or their students' profile payload.
+PROFILE_USER_FIELDS = {"first_name", "last_name", "email", "role"}
+PROFESSOR_NAME_FIELDS = {"first_name", "last_name", "email"}
+
+# Stored values that the save handlers compare against; read in pre_save.
+SAVED_STATE_FIELDS = {
+    StudentProfile: ("professor_id",),
+    Lesson: ("student_id", "status", "start"),
+    Material: ("student_id", "status"),
+}
+
+
+@receiver(pre_save, sender=User)
+@receiver(pre_save, sender=Turma)
+def set_search_text(sender, instance, **kwargs):
+    instance.search_text = search_document(instance, SEARCH_FIELDS[sender])
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Turma)
+def index_saved(sender, instance, using, update_fields=None, **kwargs):
+    if update_fields is not None:
+        if not set(update_fields) & set(SEARCH_FIELDS[sender]):
+            return
+        if "search_text" not in update_fields:
+            sender._default_manager.using(using).filter(pk=instance.pk).update(
+                search_text=instance.search_text
+            )
+    index_search(sender, [instance], using=using)
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Turma)
+def unindex_deleted(sender, instance, using, **kwargs):
+    unindex_search(sender, [instance.pk], using=using)
+
+
+@receiver(pre_save, sender=StudentProfile)
+@receiver(pre_save, sender=Lesson)
+@receiver(pre_save, sender=Material)
+def remember_saved_state(sender, instance, using, update_fields=None, **kwargs):
+    """Read the stored values the save handlers compare against, in one query.
+
+    Left as None for new rows and for saves whose ``update_fields`` leave
+    all of them alone, so those cost nothing extra.
+    """
+    fields = SAVED_STATE_FIELDS[sender]
+    instance._saved_state = None
+    if instance._state.adding:
+        return
+    # update_fields may name a foreign key either way ("student" or "student_id").
+    if update_fields is not None and not set(fields) & {sender._meta.get_field(name).attname for name in update_fields}:
+        return
+    instance._saved_state = sender._default_manager.using(using).filter(pk=instance.pk).values(*fields).first()
+
+
+@receiver(pre_save, sender=StudentProfile)
+def set_professor_name(sender, instance, **kwargs):
+    saved = instance._saved_state
+    instance._professor_changed = instance._state.adding or (
+        saved is not None and saved["professor_id"] != instance.professor_id
+    )
+    if instance._professor_changed:
+        instance.professor_name = display_name(instance.professor) if instance.professor_id else ""
+
+
+@receiver(post_save, sender=StudentProfile)
+def save_professor_name(sender, instance, using, update_fields=None, **kwargs):
+    if update_fields is not None and instance._professor_changed and "professor_name" not in update_fields:
+        sender._default_manager.using(using).filter(pk=instance.pk).update(
+            professor_name=instance.professor_name
+        )
+
+
+@receiver(pre_save, sender=Lesson)
+def reset_moved_lesson_reminder(sender, instance, using, update_fields=None, **kwargs):
+    # A moved lesson gets a new reminder from academy.scheduler.
+    saved = instance._saved_state
+    if saved is None or saved["start"] == instance.start:
+        return
+    if update_fields is not None and "start" not in update_fields:
+        return
+    instance.reminder_sent_at = None
+    if update_fields is not None and "reminder_sent_at" not in update_fields:
+        sender._default_manager.using(using).filter(pk=instance.pk).update(reminder_sent_at=None)
+
+
+def _shift_saved_progress(sender, instance, created) -> set[int]:
+    saved = instance._saved_state
+    # An update that left student and status alone moves nothing.
+    if not created and saved is None:
+        return set()
+    before = None if created else (saved["student_id"], progress_counts(sender, saved["status"]))
+    return shift_progress(before, (instance.student_id, progress_counts(sender, instance.status)))
+
+
+def _record_tombstone(sender, instance, using) -> None:
+    kind = Tombstone.Kind.LESSON if sender is Lesson else Tombstone.Kind.MATERIAL
+    Tombstone.objects.using(using).create(
+        kind=kind, object_id=instance.pk, student_id=instance.student_id, professor_id=instance.professor_id
+    )
+
+
+@receiver(post_save, sender=Lesson)
+def lesson_saved(sender, instance, created, using, **kwargs):
+    """Profile, summaries, progress, versions and emails for a saved lesson.
+
+    One handler in one transaction, so a save outside ``atomic`` does not
+    commit each step on its own and the profile work runs once.
+    """
+    saved = instance._saved_state or {}
+    previous_student = saved.get("student_id", instance.student_id)
+    previous_status = saved.get("status")
+    student_ids = {previous_student, instance.student_id}
+    with transaction.atomic(using=using, savepoint=False):
+        if created or previous_student != instance.student_id:
+            ensure_profiles([instance.student_id])
+        refresh_lesson_summaries(student_ids)
+        _shift_saved_progress(sender, instance, created)
+        bump_versions(student_ids, LESSONS, PROFILE)
+        bump_versions([instance.professor_id], SCHEDULE)
+        # Queued in the same transaction, so the email only exists if the
+        # cancellation commits.
+        cancelled = previous_status not in (None, instance.status) and instance.status == Lesson.Status.CANCELADA
+        if not created and cancelled:
+            lesson_emails([instance], OutboxEmail.Kind.CANCELAMENTO)
+
+
+@receiver(post_delete, sender=Lesson)
+def lesson_deleted(sender, instance, using, **kwargs):
+    _record_tombstone(sender, instance, using)
+    refresh_lesson_summaries([instance.student_id])
+    shift_progress((instance.student_id, progress_counts(sender, instance.status)), None)
+    bump_versions([instance.student_id], LESSONS, PROFILE)
+    bump_versions([instance.professor_id], SCHEDULE)
+
+
+@receiver(post_save, sender=Material)
+def material_saved(sender, instance, created, using, **kwargs):
+    with transaction.atomic(using=using, savepoint=False):
+        if created:
+            ensure_profiles([instance.student_id])
+        moved = _shift_saved_progress(sender, instance, created)
+        bump_versions({instance.student_id} | moved, MATERIALS, *([PROFILE] if moved else []))
+
+
+@receiver(post_delete, sender=Material)
+def material_deleted(sender, instance, using, **kwargs):
+    _record_tombstone(sender, instance, using)
+    moved = shift_progress((instance.student_id, progress_counts(sender, instance.status)), None)
+    bump_versions([instance.student_id], MATERIALS, *([PROFILE] if moved else []))
+
+
+@receiver(post_save, sender=User)
+def refresh_professor_summary(sender, instance, created, update_fields=None, **kwargs):
+    if created or instance.role != User.Role.PROFESSOR:
+        return
+    if update_fields is None or set(update_fields) & PROFESSOR_NAME_FIELDS:
+        refresh_professor_names([instance.pk])
+
+
+@receiver(post_save, sender=WorkingHours)
+@receiver(post_delete, sender=WorkingHours)
+@receiver(post_save, sender=ScheduleException)
+@receiver(post_delete, sender=ScheduleException)
+def bump_schedule_version(sender, instance, **kwargs):
+    bump_versions([instance.professor_id], SCHEDULE)
+
+
+@receiver(post_save, sender=StudentProfile)
+@receiver(post_delete, sender=StudentProfile)
+def bump_profile_version(sender, instance, **kwargs):
+    bump_versions([instance.user_id], PROFILE)
+
+
+@receiver(post_save, sender=User)
+def bump_user_profile_versions(sender, instance, created, update_fields=None, **kwargs):
+    if created or (update_fields is not None and not set(update_fields) & PROFILE_USER_FIELDS):
+        return
+    user_ids = [instance.pk]
+    if instance.role == User.Role.PROFESSOR:
+        user_ids += list(StudentProfile.objects.filter(professor=instance).values_list("user_id", flat=True))
+    bump_versions(user_ids, PROFILE)
@@ -0,0 +1,138 @@
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from academy.models import Lesson, ScheduleException, WorkingHours
+from academy.versions import SCHEDULE, get_versions
+
+
+# Slots start on multiples of this many minutes (local time for whole-hour
+# and half-hour UTC offsets), so a lesson ending at 10:07 frees 10:15.
+SLOT_GRANULARITY = 15
+
+SLOTS_CACHE_TIMEOUT = 60 * 60
+
+
+def _clip(events: list, start: datetime, end: datetime, lo: datetime, hi: datetime, opens: int, busy: int):
+    start, end = max(start, lo), min(end, hi)
+    if start < end:
+        events.append((start, opens, busy))
+        events.append((end, -opens, -busy))
+
+
+def _sweep(events: list) -> list[tuple[datetime, datetime]]:
+    """Merge open/busy edge events into the intervals that are open and not busy."""
+    events.sort(key=lambda event: event[0])
+    free = []
+    opened = None
+    available = busy = 0
+    index = 0
+    while index < len(events):
+        moment = events[index][0]
+        while index < len(events) and events[index][0] == moment:
+            available += events[index][1]
+            busy += events[index][2]
+            index += 1
+        if available > 0 and busy == 0:
+            if opened is None:
+                opened = moment
+        elif opened is not None:
+            free.append((opened, moment))
+            opened = None
+    return free
+
+
+def schedule_exceptions(professor_ids, start: datetime, end: datetime):
+    return ScheduleException.objects.filter(professor_id__in=professor_ids, start__lt=end, end__gt=start).values_list(
+        "professor_id", "kind", "start", "end"
+    )
+
+
+def booked_lessons(professor_ids, start: datetime, end: datetime):
+    return Lesson.objects.filter(
+        professor_id__in=professor_ids, status=Lesson.Status.AGENDADA, start__lt=end, end__gt=start
+    ).values_list("professor_id", "start", "end")
+
+
+def free_intervals(professor_ids, start: datetime, end: datetime) -> dict[int, list[tuple[datetime, datetime]]]:
+    """Free time of each professor in ``[start, end)``.
+
+    Working hours are expanded day by day in the current time zone, extra
+    hours are added and blocks and scheduled lessons are subtracted. Each
+    source is a single range query for all professors, and each professor's
+    intervals are resolved with one sort-and-sweep.
+    """
+    ids = set(professor_ids)
+    events: dict[int, list] = {professor_id: [] for professor_id in ids}
+    tz = timezone.get_current_timezone()
+
+    weekly = defaultdict(list)
+    for professor_id, weekday, start_time, end_time in WorkingHours.objects.filter(
+        professor_id__in=ids
+    ).values_list("professor_id", "weekday", "start_time", "end_time"):
+        weekly[weekday].append((professor_id, start_time, end_time))
+    day = timezone.localtime(start, tz).date()
+    last_day = timezone.localtime(end, tz).date()
+    while day <= last_day:
+        for professor_id, start_time, end_time in weekly[day.weekday()]:
+            window_start = timezone.make_aware(datetime.combine(day, start_time), tz)
+            window_end = timezone.make_aware(datetime.combine(day, end_time), tz)
+            _clip(events[professor_id], window_start, window_end, start, end, 1, 0)
+        day += timedelta(days=1)
+
+    for professor_id, kind, exc_start, exc_end in schedule_exceptions(ids, start, end):
+        if kind == ScheduleException.Kind.EXTRA:
+            _clip(events[professor_id], exc_start, exc_end, start, end, 1, 0)
+        else:
+            _clip(events[professor_id], exc_start, exc_end, start, end, 0, 1)
+
+    for professor_id, lesson_start, lesson_end in booked_lessons(ids, start, end):
+        _clip(events[professor_id], lesson_start, lesson_end, start, end, 0, 1)
+
+    return {professor_id: _sweep(professor_events) for professor_id, professor_events in events.items()}
+
+
+def _align(moment: datetime) -> datetime:
+    step = SLOT_GRANULARITY * 60
+    timestamp = math.ceil(moment.timestamp() / step) * step
+    return datetime.fromtimestamp(timestamp, tz=moment.tzinfo)
+
+
+def split_slots(intervals, duration: timedelta) -> list[tuple[datetime, datetime]]:
+    slots = []
+    for interval_start, interval_end in intervals:
+        slot_start = _align(timezone.localtime(interval_start))
+        while slot_start + duration <= interval_end:
+            slots.append((slot_start, slot_start + duration))
+            slot_start += duration
+    return slots
+
+
+def available_slots(professor_ids, start: datetime, end: datetime, duration: timedelta) -> dict[int, list]:
+    """Bookable ``(start, end)`` slots per professor, cached per schedule version.
+
+    Lesson, working hours and exception changes bump the professor's
+    ``schedule`` version, so stale entries are simply never read again.
+    Slots in the past are not removed here; callers filter them so the
+    cached value does not depend on the clock.
+    """
+    versions = get_versions(professor_ids, SCHEDULE)
+    minutes = int(duration.total_seconds() // 60)
+    keys = {
+        professor_id: f"slots:{professor_id}:{version}:{start.isoformat()}:{end.isoformat()}:{minutes}"
+        for professor_id, version in versions.items()
+    }
+    cached = cache.get_many(keys.values())
+    result = {professor_id: cached[key] for professor_id, key in keys.items() if key in cached}
+    missing = [professor_id for professor_id in keys if professor_id not in result]
+    if missing:
+        computed = {
+            professor_id: split_slots(intervals, duration)
+            for professor_id, intervals in free_intervals(missing, start, end).items()
+        }
+        cache.set_many({keys[professor_id]: slots for professor_id, slots in computed.items()}, SLOTS_CACHE_TIMEOUT)
+        result.update(computed)
+    return result
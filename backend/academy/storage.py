@@ -0,0 +1,139 @@
+import hashlib
+import os
+import shutil
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+class BlobStorage:
+    """Content-addressed file store: blobs are named by their SHA-256.
+
+    Each chunk of an upload is staged to its own file while the request
+    body is read, then put in place under its offset once the upload row
+    accepts it. A complete upload is assembled into one file, hashed on
+    the way, and committed under its digest, so identical content is
+    stored once.
+    """
+
+    def stage(self, upload_id, stream, length: int) -> tuple[str, str]:
+        """Write ``length`` bytes from ``stream`` to a new staged file; return its name and SHA-256."""
+        raise NotImplementedError
+
+    def place(self, upload_id, staged: str, offset: int) -> None:
+        """Make a staged file the upload's chunk starting at ``offset``."""
+        raise NotImplementedError
+
+    def assemble(self, upload_id) -> tuple[str, str]:
+        """Join the upload's chunks in order into a staged file; return its name and SHA-256."""
+        raise NotImplementedError
+
+    def commit(self, upload_id, staged: str, digest: str) -> None:
+        """Move an assembled file under ``digest``, keeping an existing blob, and drop the chunks."""
+        raise NotImplementedError
+
+    def drop(self, upload_id, staged: str) -> None:
+        raise NotImplementedError
+
+    def discard(self, upload_id) -> None:
+        raise NotImplementedError
+
+    def exists(self, digest: str) -> bool:
+        raise NotImplementedError
+
+    def open(self, digest: str):
+        raise NotImplementedError
+
+    def relative_path(self, digest: str) -> str:
+        raise NotImplementedError
+
+    def path(self, digest: str) -> Path:
+        raise NotImplementedError
+
+
+class LocalBlobStorage(BlobStorage):
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def _upload_dir(self, upload_id) -> Path:
+        return self.root / "uploads" / str(upload_id)
+
+    def _staged_path(self, upload_id, staged: str) -> Path:
+        return self._upload_dir(upload_id) / f"{staged}.staged"
+
+    def _new_staged(self, upload_id) -> tuple[str, Path]:
+        staged = uuid.uuid4().hex
+        path = self._staged_path(upload_id, staged)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return staged, path
+
+    def relative_path(self, digest: str) -> str:
+        return f"blobs/{digest[:2]}/{digest[2:4]}/{digest}"
+
+    def path(self, digest: str) -> Path:
+        return self.root / self.relative_path(digest)
+
+    def stage(self, upload_id, stream, length: int) -> tuple[str, str]:
+        staged, path = self._new_staged(upload_id)
+        digest = hashlib.sha256()
+        remaining = length
+        with open(path, "wb") as part:
+            while remaining > 0:
+                block = stream.read(min(HASH_BLOCK_SIZE, remaining))
+                if not block:
+                    break
+                part.write(block)
+                digest.update(block)
+                remaining -= len(block)
+        if remaining:
+            self.drop(upload_id, staged)
+            raise EOFError("Corpo da requisição menor que o informado.")
+        return staged, digest.hexdigest()
+
+    def place(self, upload_id, staged: str, offset: int) -> None:
+        # Zero-padded so the chunks sort by offset.
+        os.replace(self._staged_path(upload_id, staged), self._upload_dir(upload_id) / f"{offset:020d}.chunk")
+
+    def assemble(self, upload_id) -> tuple[str, str]:
+        staged, path = self._new_staged(upload_id)
+        digest = hashlib.sha256()
+        with open(path, "wb") as assembled:
+            for chunk_path in sorted(self._upload_dir(upload_id).glob("*.chunk")):
+                with open(chunk_path, "rb") as chunk:
+                    while block := chunk.read(HASH_BLOCK_SIZE):
+                        assembled.write(block)
+                        digest.update(block)
+        return staged, digest.hexdigest()
+
+    def commit(self, upload_id, staged: str, digest: str) -> None:
+        target = self.path(digest)
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(self._staged_path(upload_id, staged), target)
+        self.discard(upload_id)
+
+    def drop(self, upload_id, staged: str) -> None:
+        self._staged_path(upload_id, staged).unlink(missing_ok=True)
+
+    def discard(self, upload_id) -> None:
+        shutil.rmtree(self._upload_dir(upload_id), ignore_errors=True)
+
+    def exists(self, digest: str) -> bool:
+        return self.path(digest).exists()
+
+    def open(self, digest: str):
+        return open(self.path(digest), "rb")
+
+
+_storage = None
+
+
+def get_storage() -> BlobStorage:
+    global _storage
+    if _storage is None or _storage.root != Path(settings.MATERIAL_STORAGE_ROOT):
+        _storage = LocalBlobStorage(settings.MATERIAL_STORAGE_ROOT)
+    return _storage
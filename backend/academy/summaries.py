@@ -0,0 +1,193 @@
+from functools import reduce
+from operator import or_
+
+from django.contrib.auth import get_user_model
+from django.db.models import (
+    Case,
+    Count,
+    ExpressionWrapper,
+    F,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Greatest, Least
+from django.db.models.lookups import GreaterThan
+from django.utils import timezone
+
+from academy.models import Lesson, Material, StudentProfile
+from academy.versions import PROFILE, bump_versions
+
+
+User = get_user_model()
+
+
+def display_name(user) -> str:
+    return f"{user.first_name} {user.last_name}".strip() or user.email
+
+
+def professor_names(professor_ids) -> dict[int, str]:
+    users = User.objects.filter(id__in=professor_ids).only("first_name", "last_name", "email")
+    return {user.id: display_name(user) for user in users}
+
+
+def ensure_profiles(student_ids) -> None:
+    ids = {student_id for student_id in student_ids if student_id}
+    if ids:
+        StudentProfile.objects.bulk_create(
+            [StudentProfile(user_id=student_id) for student_id in ids], ignore_conflicts=True
+        )
+
+
+def last_lesson_end(lessons):
+    return lessons.filter(status=Lesson.Status.CONCLUIDA).order_by("-end").values("end")[:1]
+
+
+def next_lesson_start(lessons, now):
+    return lessons.filter(status=Lesson.Status.AGENDADA, start__gt=now).order_by("start").values("start")[:1]
+
+
+def refresh_lesson_summaries(student_ids=None, now=None) -> int:
+    """Recompute last/next lesson for ``student_ids`` (all when None) in one UPDATE."""
+    lessons = Lesson.objects.filter(student=OuterRef("user_id"))
+    last_lesson = last_lesson_end(lessons)
+    next_lesson = next_lesson_start(lessons, now or timezone.now())
+    profiles = StudentProfile.objects.all()
+    if student_ids is not None:
+        ids = {student_id for student_id in student_ids if student_id}
+        if not ids:
+            return 0
+        profiles = profiles.filter(user_id__in=ids)
+    return profiles.update(last_lesson=Subquery(last_lesson), next_lesson=Subquery(next_lesson))
+
+
+def refresh_professor_names(professor_ids=None) -> int:
+    """Copy the display name of ``professor_ids`` (all when None) to their students."""
+    profiles = StudentProfile.objects.filter(professor__isnull=False)
+    if professor_ids is not None:
+        profiles = profiles.filter(professor_id__in=professor_ids)
+    ids = set(profiles.values_list("professor_id", flat=True).distinct())
+    updated = 0
+    for professor_id, name in professor_names(ids).items():
+        updated += StudentProfile.objects.filter(professor_id=professor_id).update(professor_name=name)
+    if professor_ids is None:
+        updated += (
+            StudentProfile.objects.filter(professor__isnull=True).exclude(professor_name="").update(professor_name="")
+        )
+    return updated
+
+
+PROGRESS_COUNTERS = ("materials_assigned", "materials_completed", "lessons_concluded")
+
+BATCH_SIZE = 1000
+
+
+def progress_counts(model, status: str) -> dict[str, int]:
+    """What one ``model`` row (material or lesson) in ``status`` adds to its student's progress counters."""
+    if model is Material:
+        return {"materials_assigned": 1, "materials_completed": int(status == Material.Status.CONCLUIDO)}
+    return {"lessons_concluded": int(status == Lesson.Status.CONCLUIDA)}
+
+
+def progress_expression(counters: dict):
+    """Completed over assigned work, as a 0-100 integer.
+
+    Lessons only count once concluded (``conclude_finished`` concludes them
+    when they end), in both terms: booking a lesson never lowers progress.
+    """
+    done = counters["materials_completed"] + counters["lessons_concluded"]
+    total = counters["materials_assigned"] + counters["lessons_concluded"]
+    percent = ExpressionWrapper(done * 100 / total, output_field=IntegerField())
+    return Case(
+        When(GreaterThan(total, 0), then=Least(percent, Value(100))),
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def adjust_progress(student_ids, **deltas: int) -> int:
+    """Add ``deltas`` to the counters of ``student_ids`` and recompute progress.
+
+    A single UPDATE of F() increments, so concurrent writers never lose a
+    count. Rows are not created here: callers that add work for a student
+    call ``ensure_profiles`` first, and bump ``PROFILE`` together with
+    their own versions.
+    """
+    ids = {student_id for student_id in student_ids if student_id}
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if not ids or not deltas:
+        return 0
+    counters = {name: F(name) for name in PROGRESS_COUNTERS}
+    for name, delta in deltas.items():
+        # Clamped so a counter that already drifted low cannot go negative.
+        counters[name] = F(name) + delta if delta > 0 else Greatest(F(name) + delta, Value(0))
+    return StudentProfile.objects.filter(user_id__in=ids).update(
+        progress=progress_expression(counters), **{name: counters[name] for name in deltas}
+    )
+
+
+def shift_progress(before, after) -> set[int]:
+    """Move a row's contribution from ``before`` to ``after``.
+
+    Both are ``(student_id, progress_counts(...))`` or None, for a row that
+    did not exist yet or no longer exists. Returns the students whose
+    counters moved.
+    """
+    old_student, old_counts = before or (None, {})
+    new_student, new_counts = after or (None, {})
+    if old_student == new_student:
+        names = set(old_counts) | set(new_counts)
+        deltas = {name: new_counts.get(name, 0) - old_counts.get(name, 0) for name in names}
+        changes = {new_student: deltas}
+    else:
+        changes = {old_student: {name: -count for name, count in old_counts.items()}, new_student: new_counts}
+    moved = set()
+    for student_id, deltas in changes.items():
+        if student_id and any(deltas.values()):
+            adjust_progress([student_id], **deltas)
+            moved.add(student_id)
+    return moved
+
+
+def _counted(model, *filters, **lookups):
+    rows = (
+        model.objects.filter(*filters, student=OuterRef("user_id"), **lookups)
+        .order_by()
+        .values("student")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    return Coalesce(Subquery(rows), 0)
+
+
+def refresh_progress(student_ids=None) -> int:
+    """Recount the progress counters that drifted; returns how many profiles changed."""
+    counters = {
+        "materials_assigned": _counted(Material),
+        "materials_completed": _counted(Material, status=Material.Status.CONCLUIDO),
+        "lessons_concluded": _counted(Lesson, status=Lesson.Status.CONCLUIDA),
+    }
+    profiles = StudentProfile.objects.all()
+    if student_ids is not None:
+        profiles = profiles.filter(user_id__in={student_id for student_id in student_ids if student_id})
+    actual = {f"actual_{name}": expression for name, expression in counters.items()}
+    drifted = profiles.alias(**actual).filter(
+        reduce(or_, [~Q(**{name: F(f"actual_{name}")}) for name in PROGRESS_COUNTERS])
+        | ~Q(progress=progress_expression({name: F(f"actual_{name}") for name in PROGRESS_COUNTERS}))
+    )
+    ids = list(drifted.values_list("user_id", flat=True))
+    for start in range(0, len(ids), BATCH_SIZE):
+        chunk = ids[start : start + BATCH_SIZE]
+        StudentProfile.objects.filter(user_id__in=chunk).update(progress=progress_expression(counters), **counters)
+        bump_versions(chunk, PROFILE)
+    return len(ids)
+
+
+def rebuild_summaries() -> int:
+    students = User.objects.filter(role=User.Role.ALUNO).values_list("id", flat=True)
+    ensure_profiles(students.iterator(chunk_size=2000))
+    refresh_professor_names()
+    return refresh_lesson_summaries()
@@ -0,0 +1,465 @@
+import hashlib
+import tempfile
+import threading
+from collections import Counter
+from io import BytesIO, StringIO
+from datetime import datetime, time, timedelta
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import OperationalError, connection, connections, transaction
+from django.db.models.signals import post_init
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from academy.booking import _serialize_bookings
+from academy.exports import iter_export
+from academy.imports import import_users
+from academy.models import (
+    Lesson,
+    Material,
+    MaterialAsset,
+    StudentProfile,
+    StudentVersion,
+    Turma,
+    Upload,
+    WorkingHours,
+)
+from academy.search import search
+from academy.storage import get_storage
+from accounts.hashing import hash_passwords
+from academy.uploads import UploadError, receive_chunk
+
+
+User = get_user_model()
+
+
+def client_for(user) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(user)
+    return client
+
+
+def create_students(count: int, prefix: str = "aluno", **profile) -> list:
+    emails = [f"{prefix}{i}@example.com" for i in range(count)]
+    User.objects.bulk_create([User(username=email, email=email, role=User.Role.ALUNO) for email in emails])
+    students = list(User.objects.filter(username__startswith=prefix, role=User.Role.ALUNO).order_by("id"))
+    StudentProfile.objects.bulk_create([StudentProfile(user=student, **profile) for student in students])
+    return students
+
+
+class ProfessorRosterQueryTests(TestCase):
+    def setUp(self):
+        self.professor = User.objects.create_user(
+            username="prof@example.com", email="prof@example.com", role=User.Role.PROFESSOR
+        )
+        self.client = client_for(self.professor)
+
+    def test_roster_query_count_does_not_grow_with_students(self):
+        now = timezone.now()
+        total = 0
+        for count in (10, 100, 1000):
+            with self.subTest(students=count):
+                students = create_students(count - total, prefix=f"aluno{count}-", professor=self.professor)
+                total = count
+                Lesson.objects.bulk_create(
+                    [
+                        Lesson(
+                            student=student,
+                            professor=self.professor,
+                            start=now - timedelta(days=1, hours=1),
+                            end=now - timedelta(days=1),
+                            status=Lesson.Status.CONCLUIDA,
+                        )
+                        for student in students
+                    ]
+                    + [
+                        Lesson(
+                            student=student,
+                            professor=self.professor,
+                            start=now + timedelta(days=1),
+                            end=now + timedelta(days=1, hours=1),
+                        )
+                        for student in students
+                    ]
+                )
+                with self.assertNumQueries(1):
+                    response = self.client.get("/api/professor/students/")
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.json()), count)
+                self.assertTrue(all(row["last_lesson"] and row["next_lesson"] for row in response.json()))
+
+                with self.assertNumQueries(2):
+                    response = self.client.get("/api/professor/students/?page=2&page_size=5")
+                self.assertEqual(response.json()["count"], count)
+                self.assertEqual(len(response.json()["results"]), 5)
+
+
+class AdminUserQueryTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username="admin@example.com", email="admin@example.com", role=User.Role.ADMIN
+        )
+        self.professor = User.objects.create_user(
+            username="prof@example.com", email="prof@example.com", role=User.Role.PROFESSOR
+        )
+        self.students = create_students(60, professor=self.professor)
+        self.client = client_for(self.admin)
+
+    def test_list_query_count_is_fixed_for_any_page_size(self):
+        for page_size in (1, 10, 50):
+            with self.subTest(page_size=page_size):
+                with self.assertNumQueries(2):
+                    response = self.client.get(f"/api/users/?page_size={page_size}")
+                self.assertEqual(len(response.json()["results"]), page_size)
+                students = [row for row in response.json()["results"] if row["role"] == User.Role.ALUNO]
+                self.assertTrue(all(row["professor_id"] == self.professor.pk for row in students))
+
+                with self.assertNumQueries(1):
+                    response = self.client.get(f"/api/users/?page_size={page_size}&pagination=cursor")
+                self.assertEqual(len(response.json()["results"]), page_size)
+
+    def test_detail_is_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(f"/api/users/{self.students[0].pk}/")
+        self.assertEqual(response.json()["professor_id"], self.professor.pk)
+
+
+class BookingRaceTests(TransactionTestCase):
+    students = 200
+
+    def setUp(self):
+        self.professor = User.objects.create_user(
+            username="prof@example.com", email="prof@example.com", role=User.Role.PROFESSOR
+        )
+        WorkingHours.objects.bulk_create(
+            [
+                WorkingHours(professor=self.professor, weekday=weekday, start_time=time(8), end_time=time(18))
+                for weekday in range(7)
+            ]
+        )
+        tomorrow = timezone.localdate() + timedelta(days=1)
+        self.start = timezone.make_aware(datetime.combine(tomorrow, time(10)))
+
+    def test_parallel_bookings_of_one_slot(self):
+        students = create_students(self.students)
+        # None of them has a StudentVersion row to lock yet.
+        self.assertFalse(StudentVersion.objects.filter(user_id__in=[student.pk for student in students]).exists())
+        barrier = threading.Barrier(len(students))
+        codes = []
+
+        def book(student):
+            try:
+                client = client_for(student)
+                barrier.wait()
+                response = client.post(
+                    "/api/student/lessons/",
+                    {"professor_id": self.professor.pk, "start": self.start.isoformat(), "duration": 60},
+                    format="json",
+                )
+                codes.append(response.status_code)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=book, args=(student,)) for student in students]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(Counter(codes), {201: 1, 409: self.students - 1})
+        self.assertEqual(Lesson.objects.filter(professor=self.professor).count(), 1)
+
+    @skipUnless(connection.vendor == "sqlite", "SQLite database write lock")
+    def test_serializing_takes_the_write_lock_without_version_rows(self):
+        (student,) = create_students(1)
+        StudentVersion.objects.filter(user_id__in=[student.pk, self.professor.pk]).delete()
+        errors = []
+
+        def write_elsewhere():
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute("PRAGMA busy_timeout = 100")
+                StudentVersion.objects.create(user_id=0)
+            except OperationalError as e:
+                errors.append(e)
+            finally:
+                connections.close_all()
+
+        with transaction.atomic():
+            self.assertEqual(_serialize_bookings([student.pk, self.professor.pk]), 2)
+            thread = threading.Thread(target=write_elsewhere)
+            thread.start()
+            thread.join()
+
+        self.assertEqual(len(errors), 1)
+        self.assertIn("locked", str(errors[0]))
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username="admin@example.com", email="admin@example.com", role=User.Role.ADMIN
+        )
+        for email, first_name, last_name in [
+            ("andre@example.com", "André", "Gonçalves"),
+            ("andrea@example.com", "Andréa", "Lima"),
+            ("zoe@example.com", "Zoé", "Souza"),
+        ]:
+            User.objects.create_user(username=email, email=email, first_name=first_name, last_name=last_name)
+        Turma.objects.create(name="Français Avancé", description="turma da noite")
+        self.client = client_for(self.admin)
+
+    def names(self, term: str) -> set[str]:
+        response = self.client.get("/api/users/", {"search": term})
+        self.assertEqual(response.status_code, 200)
+        return {row["name"] for row in response.json()["results"]}
+
+    def test_accent_and_case_insensitive(self):
+        self.assertEqual(self.names("Andre"), {"André Gonçalves", "Andréa Lima"})
+        self.assertEqual(self.names("ANDRÉA"), {"Andréa Lima"})
+        self.assertEqual(self.names("goncalves"), {"André Gonçalves"})
+        response = self.client.get("/api/turmas/", {"search": "avance"})
+        self.assertEqual([row["name"] for row in response.json()], ["Français Avancé"])
+
+    def test_terms_shorter_than_a_trigram(self):
+        self.assertEqual(self.names("zo"), {"Zoé Souza"})
+        self.assertEqual(self.names("ZÓ"), {"Zoé Souza"})
+
+    def test_index_follows_saves_and_deletes(self):
+        user = User.objects.get(email="zoe@example.com")
+        user.first_name = "Bruno"
+        user.save(update_fields=["first_name"])
+        self.assertEqual(self.names("brun"), {"Bruno Souza"})
+        user.delete()
+        self.assertEqual(self.names("brun"), set())
+
+    @skipUnless(connection.vendor == "sqlite", "FTS5 trigram index")
+    def test_sqlite_uses_fts5_for_trigram_terms(self):
+        self.assertIn('_fts" MATCH', str(search(User.objects.all(), "Andre").query))
+        self.assertNotIn('_fts" MATCH', str(search(User.objects.all(), "an").query))
+
+    @skipUnless(connection.vendor == "postgresql", "pg_trgm index")
+    def test_postgres_matches_similar_words(self):
+        self.assertIn("word_similarity", str(search(User.objects.all(), "Andre").query))
+        self.assertEqual(self.names("goncalvs"), {"André Gonçalves"})
+
+
+class QueryPlanTests(TestCase):
+    def test_hot_queries_use_indexes(self):
+        professor = User.objects.create_user(
+            username="prof@example.com", email="prof@example.com", role=User.Role.PROFESSOR
+        )
+        students = create_students(50, professor=professor)
+        now = timezone.now()
+        Lesson.objects.bulk_create(
+            [
+                Lesson(
+                    student=student,
+                    professor=professor,
+                    start=now + timedelta(days=offset),
+                    end=now + timedelta(days=offset, hours=1),
+                    status=Lesson.Status.CONCLUIDA if offset < 0 else Lesson.Status.AGENDADA,
+                )
+                for student in students
+                for offset in (-2, -1, 1, 2)
+            ]
+        )
+        asset = MaterialAsset.objects.create(professor=professor, title="Verbos", type=MaterialAsset.MaterialType.PDF)
+        Material.objects.bulk_create(
+            [Material(asset=asset, student=student, professor=professor) for student in students]
+        )
+
+        stdout, stderr = StringIO(), StringIO()
+        call_command("check_query_plans", stdout=stdout, stderr=stderr)
+        self.assertEqual(stderr.getvalue(), "")
+        self.assertIn("Todas as consultas usam índices.", stdout.getvalue())
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        for i, first_name in enumerate(["=HYPERLINK(\"http://x\")", "+1", "-2", "@SUM(A1)", "Ana"]):
+            User.objects.create_user(username=f"u{i}@example.com", email=f"u{i}@example.com", first_name=first_name)
+
+    def export(self, fmt: str, **kwargs) -> str:
+        return "".join(iter_export("users", fmt, **kwargs))
+
+    def test_csv_escapes_formulas(self):
+        names = [line.split(",")[2] for line in self.export("csv").splitlines()[1:]]
+        self.assertEqual(names, ['"\'=HYPERLINK(""http://x"")"', "'+1", "'-2", "'@SUM(A1)", "Ana"])
+        self.assertIn('"first_name": "=HYPERLINK', self.export("ndjson"))
+
+    def test_keyset_pages_without_server_side_cursors(self):
+        expected = self.export("csv")
+        with (
+            mock.patch.object(connection, "vendor", "postgresql"),
+            mock.patch.dict(connection.settings_dict, {"DISABLE_SERVER_SIDE_CURSORS": True}),
+            self.assertNumQueries(3),
+        ):
+            self.assertEqual(self.export("csv", chunk_size=2), expected)
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class ImportTests(TestCase):
+    def csv(self, count: int) -> bytes:
+        lines = ["email,password,role"] + [f"aluno{i}@example.com,senha-forte-{i},aluno" for i in range(count)]
+        return "\n".join(lines).encode()
+
+    def test_conflict_reports_only_the_conflicting_row(self):
+        def hash_while_another_writer_inserts(passwords, executor):
+            User.objects.create_user(
+                username="aluno1@example.com", email="aluno1@example.com", role=User.Role.PROFESSOR
+            )
+            return hash_passwords(passwords, executor)
+
+        with mock.patch("academy.imports.hash_passwords", side_effect=hash_while_another_writer_inserts):
+            results = list(import_users(BytesIO(self.csv(3)), "csv", executor=None))
+
+        self.assertEqual([result["status"] for result in results], ["created", "duplicate", "created"])
+        self.assertEqual(User.objects.filter(role=User.Role.ALUNO).count(), 2)
+
+    @override_settings(USER_IMPORT_MAX_ROWS=2)
+    def test_endpoint_refuses_large_files(self):
+        admin = User.objects.create_user(username="admin@example.com", email="admin@example.com", role=User.Role.ADMIN)
+        client = client_for(admin)
+
+        response = client.post("/api/users/import/", {"file": SimpleUploadedFile("u.csv", self.csv(3))})
+        self.assertEqual(response.status_code, 413)
+        self.assertIn("manage.py import_users", response.json()["detail"])
+        self.assertFalse(User.objects.filter(role=User.Role.ALUNO).exists())
+
+        response = client.post("/api/users/import/", {"file": SimpleUploadedFile("u.csv", self.csv(2))})
+        self.assertEqual(response.json()["created"], 2)
+
+
+class ProgressTests(TestCase):
+    def test_booking_a_lesson_does_not_lower_progress(self):
+        professor = User.objects.create_user(
+            username="prof@example.com", email="prof@example.com", role=User.Role.PROFESSOR
+        )
+        (student,) = create_students(1, professor=professor)
+        asset = MaterialAsset.objects.create(professor=professor, title="Verbos", type=MaterialAsset.MaterialType.PDF)
+        material = Material.objects.create(asset=asset, student=student, professor=professor)
+        material.status = Material.Status.CONCLUIDO
+        material.save()
+
+        def progress():
+            return StudentProfile.objects.get(user=student).progress
+
+        self.assertEqual(progress(), 100)
+        now = timezone.now()
+        lesson = Lesson.objects.create(
+            student=student, professor=professor, start=now + timedelta(days=1), end=now + timedelta(days=1, hours=1)
+        )
+        self.assertEqual(progress(), 100)
+        lesson.status = Lesson.Status.CONCLUIDA
+        lesson.save()
+        self.assertEqual(progress(), 100)
+        second = MaterialAsset.objects.create(professor=professor, title="Texto", type=MaterialAsset.MaterialType.PDF)
+        Material.objects.create(asset=second, student=student, professor=professor)
+        self.assertEqual(progress(), 66)
+
+        stdout = StringIO()
+        call_command("reconcile_progress", stdout=stdout)
+        self.assertIn("Progresso corrigido para 0 alunos.", stdout.getvalue())
+
+
+class SaveSignalTests(TestCase):
+    def test_loading_rows_runs_no_receivers(self):
+        for model in (Lesson, Material, StudentProfile, User):
+            with self.subTest(model=model.__name__):
+                self.assertFalse(post_init.has_listeners(model))
+
+    def test_saves_that_skip_compared_fields_skip_the_lookup(self):
+        (student,) = create_students(1)
+        with self.assertNumQueries(1):
+            student.save(update_fields=["last_login"])
+        StudentVersion.objects.create(user_id=student.pk)
+        profile = StudentProfile.objects.get(user=student)
+        with self.assertNumQueries(2):
+            # The UPDATE and the profile version bump.
+            profile.save(update_fields=["turma"])
+
+    def test_moving_a_profile_to_another_professor_renames_it(self):
+        professor = User.objects.create_user(
+            username="prof@example.com", email="prof@example.com", first_name="Ana", role=User.Role.PROFESSOR
+        )
+        (student,) = create_students(1)
+        profile = StudentProfile.objects.get(user=student)
+        profile.professor = professor
+        profile.save(update_fields=["professor"])
+        self.assertEqual(StudentProfile.objects.get(user=student).professor_name, "Ana")
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "lessons"}}
+)
+class StudentLessonsCacheTests(TestCase):
+    def test_cache_key_ignores_unused_parameters(self):
+        (student,) = create_students(1)
+        client = client_for(student)
+        self.assertEqual(client.get("/api/student/lessons/?pagination=cursor&page_size=5").status_code, 200)
+        for query in ("page_size=5&pagination=cursor&utm_source=x", "pagination=cursor&page_size=5&count=bogus"):
+            with self.subTest(query=query), self.assertNumQueries(1):
+                self.assertEqual(client.get(f"/api/student/lessons/?{query}").status_code, 200)
+        with self.assertNumQueries(2):
+            client.get("/api/student/lessons/?pagination=cursor&page_size=6")
+
+
+class OutsideTransactionStream(BytesIO):
+    def read(self, size=-1):
+        assert not connection.in_atomic_block, "request body read inside a transaction"
+        return super().read(size)
+
+
+@override_settings(MATERIAL_STORAGE_ROOT=tempfile.mkdtemp(), MATERIAL_UPLOAD_CHUNK_SIZE=1000)
+class UploadTests(TransactionTestCase):
+    data = bytes(range(256)) * 10
+
+    def setUp(self):
+        professor = User.objects.create_user(
+            username="prof@example.com", email="prof@example.com", role=User.Role.PROFESSOR
+        )
+        self.upload = Upload.objects.create(
+            owner=professor, filename="aula.pdf", size=len(self.data), sha256=hashlib.sha256(self.data).hexdigest()
+        )
+
+    def send(self, offset: int, end: int):
+        chunk = self.data[offset:end]
+        upload = Upload.objects.get(pk=self.upload.pk)
+        return receive_chunk(upload, offset, OutsideTransactionStream(chunk), len(chunk))
+
+    def test_chunks_are_read_outside_the_transaction(self):
+        for offset in range(0, len(self.data), 1000):
+            upload = self.send(offset, offset + 1000)
+        self.assertEqual(upload.offset, len(self.data))
+        self.assertEqual(upload.file.sha256, self.upload.sha256)
+        self.assertEqual(Upload.objects.get(pk=self.upload.pk).file_id, upload.file_id)
+        with get_storage().open(upload.file.sha256) as blob:
+            self.assertEqual(blob.read(), self.data)
+
+    def test_zero_length_chunk_retries_an_interrupted_finish(self):
+        self.send(0, 1000)
+        self.send(1000, 2000)
+        with mock.patch("academy.uploads.finish_upload", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.send(2000, len(self.data))
+        self.assertEqual(Upload.objects.get(pk=self.upload.pk).offset, len(self.data))
+
+        upload = self.send(len(self.data), len(self.data))
+        self.assertEqual(upload.file.sha256, self.upload.sha256)
+        with self.assertRaises(UploadError) as raised:
+            self.send(len(self.data), len(self.data))
+        self.assertEqual(raised.exception.status_code, 409)
+
+    def test_file_checksum_mismatch_starts_over(self):
+        Upload.objects.filter(pk=self.upload.pk).update(sha256="0" * 64)
+        self.send(0, 1000)
+        self.send(1000, 2000)
+        with self.assertRaises(UploadError) as raised:
+            self.send(2000, len(self.data))
+        self.assertEqual(raised.exception.offset, 0)
+        self.assertEqual(Upload.objects.get(pk=self.upload.pk).offset, 0)
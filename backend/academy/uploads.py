@@ -0,0 +1,96 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from academy.models import StoredFile, Upload
+from academy.storage import get_storage
+
+
+# Unfinished uploads older than this are discarded by `prune_uploads`.
+UPLOAD_RETENTION = timedelta(days=7)
+
+
+class UploadError(Exception):
+    def __init__(self, detail: str, status_code: int = 400, offset: int | None = None):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+        self.offset = offset
+
+
+def _check_chunk(upload: Upload, offset: int, length: int) -> None:
+    if upload.file_id:
+        raise UploadError("Upload já concluído.", 409, upload.offset)
+    if offset != upload.offset:
+        raise UploadError("Offset divergente; retome a partir do offset informado.", 409, upload.offset)
+    if length > settings.MATERIAL_UPLOAD_CHUNK_SIZE:
+        raise UploadError("Bloco maior que o permitido.", 413, upload.offset)
+    if offset + length > upload.size:
+        raise UploadError("O bloco ultrapassa o tamanho declarado.", 400, upload.offset)
+
+
+def receive_chunk(upload: Upload, offset: int, stream, length: int, checksum: str = "") -> Upload:
+    """Append ``length`` bytes of ``stream`` to ``upload`` at ``offset``.
+
+    ``offset`` must match what the server already has, so a client that
+    lost a response asks for the upload's offset and resends from there.
+    A chunk whose SHA-256 differs from ``checksum`` is dropped. The body
+    is read into a staged file before the upload row is locked; the lock
+    is only held to check the offset again and move the chunk in place.
+    When the last byte arrives the upload is finished by
+    ``finish_upload``; a zero-length chunk at the final offset retries
+    that step.
+    """
+    storage = get_storage()
+    _check_chunk(upload, offset, length)
+    try:
+        staged, digest = storage.stage(upload.pk, stream, length)
+    except EOFError as exc:
+        raise UploadError(str(exc), 400, upload.offset)
+    try:
+        if checksum and checksum.lower() != digest:
+            raise UploadError("Checksum do bloco não confere.", 400, upload.offset)
+        with transaction.atomic():
+            upload = Upload.objects.select_for_update().get(pk=upload.pk)
+            _check_chunk(upload, offset, length)
+            if length:
+                storage.place(upload.pk, staged, offset)
+                upload.offset += length
+                upload.save(update_fields=["offset"])
+    finally:
+        storage.drop(upload.pk, staged)
+    if upload.offset == upload.size:
+        upload = finish_upload(upload)
+    return upload
+
+
+def finish_upload(upload: Upload) -> Upload:
+    """Check a fully received upload against its declared hash and store it.
+
+    Runs after the last chunk's transaction has committed, so reading the
+    whole file back holds no lock. A blob with the same digest is reused;
+    on a mismatch the chunks are discarded and the upload starts over.
+    """
+    storage = get_storage()
+    staged, digest = storage.assemble(upload.pk)
+    if digest != upload.sha256:
+        storage.discard(upload.pk)
+        Upload.objects.filter(pk=upload.pk, file__isnull=True).update(offset=0)
+        raise UploadError("Checksum do arquivo não confere; reenvie desde o início.", 400, 0)
+    storage.commit(upload.pk, staged, digest)
+    upload.file, _ = StoredFile.objects.get_or_create(
+        sha256=digest, defaults={"size": upload.size, "content_type": upload.content_type}
+    )
+    Upload.objects.filter(pk=upload.pk).update(file=upload.file)
+    return upload
+
+
+def prune_uploads() -> int:
+    storage = get_storage()
+    stale = Upload.objects.filter(created_at__lt=timezone.now() - UPLOAD_RETENTION)
+    for upload_id in stale.filter(file__isnull=True).values_list("id", flat=True).iterator():
+        storage.discard(upload_id)
+    deleted, _ = stale.delete()
+    return deleted
@@ -1,28 +1,70 @@
 from django.urls import path
 
 from academy.views import (
+    AdminExportView,
     AdminTurmaDetailView,
     AdminTurmaListCreateView,
     AdminUserDetailView,
+    AdminUserImportView,
     AdminUserListCreateView,
     AssignStudentsView,
+    MaterialBatchCompleteView,
     MaterialCompleteView,
+    MaterialFileView,
+    ProfessorChangesView,
+    ProfessorLessonsView,
+    ProfessorMaterialAssignView,
+    ProfessorMaterialListView,
+    ProfessorScheduleExceptionDetailView,
+    ProfessorScheduleExceptionListView,
+    ProfessorScheduleView,
+    ProfessorSlotsView,
     ProfessorStudentsView,
+    StudentChangesView,
     StudentLessonsView,
     StudentProfileView,
     StudentRepositoryView,
+    UploadDetailView,
+    UploadListView,
 )
 
 
 urlpatterns = [
     path("users/", AdminUserListCreateView.as_view(), name="admin-users"),
+    path("users/import/", AdminUserImportView.as_view(), name="admin-users-import"),
     path("users/assign/", AssignStudentsView.as_view(), name="assign-students"),
     path("users/<int:user_id>/", AdminUserDetailView.as_view(), name="admin-user-detail"),
+    path("exports/<str:name>/", AdminExportView.as_view(), name="admin-export"),
     path("turmas/", AdminTurmaListCreateView.as_view(), name="admin-turmas"),
     path("turmas/<int:turma_id>/", AdminTurmaDetailView.as_view(), name="admin-turma-detail"),
     path("professor/students/", ProfessorStudentsView.as_view(), name="professor-students"),
+    path("professor/lessons/", ProfessorLessonsView.as_view(), name="professor-lessons"),
+    path("professor/changes/", ProfessorChangesView.as_view(), name="professor-changes"),
+    path("professor/schedule/", ProfessorScheduleView.as_view(), name="professor-schedule"),
+    path(
+        "professor/schedule/exceptions/",
+        ProfessorScheduleExceptionListView.as_view(),
+        name="professor-schedule-exceptions",
+    ),
+    path(
+        "professor/schedule/exceptions/<int:exception_id>/",
+        ProfessorScheduleExceptionDetailView.as_view(),
+        name="professor-schedule-exception-detail",
+    ),
+    path("professors/<int:professor_id>/slots/", ProfessorSlotsView.as_view(), name="professor-slots"),
     path("student/repository/", StudentRepositoryView.as_view(), name="student-repository"),
     path("student/profile/", StudentProfileView.as_view(), name="student-profile"),
     path("student/lessons/", StudentLessonsView.as_view(), name="student-lessons"),
+    path("student/changes/", StudentChangesView.as_view(), name="student-changes"),
+    path("professor/materials/", ProfessorMaterialListView.as_view(), name="professor-materials"),
+    path(
+        "professor/materials/<int:asset_id>/assign/",
+        ProfessorMaterialAssignView.as_view(),
+        name="professor-material-assign",
+    ),
+    path("uploads/", UploadListView.as_view(), name="uploads"),
+    path("uploads/<uuid:upload_id>/", UploadDetailView.as_view(), name="upload-detail"),
+    path("materials/complete", MaterialBatchCompleteView.as_view(), name="material-batch-complete"),
+    path("materials/<int:material_id>/file", MaterialFileView.as_view(), name="material-file"),
     path("materials/<int:material_id>/complete", MaterialCompleteView.as_view(), name="material-complete"),
 ]
@@ -0,0 +1,78 @@
+import hashlib
+import json
+
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from django.utils import timezone
+from django.utils.cache import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from academy.models import StudentVersion
+
+
+MATERIALS = "materials"
+LESSONS = "lessons"
+PROFILE = "profile"
+SCHEDULE = "schedule"
+
+VERSIONED_BODY_TIMEOUT = 60 * 60
+
+
+def bump_versions(user_ids, *kinds: str) -> None:
+    """Increment the ``kinds`` counters of every user in ``user_ids``."""
+    ids = {user_id for user_id in user_ids if user_id}
+    if not ids or not kinds:
+        return
+    increments = {kind: F(kind) + 1 for kind in kinds}
+    updated = StudentVersion.objects.filter(user_id__in=ids).update(**increments)
+    if updated < len(ids):
+        missing = ids - set(StudentVersion.objects.filter(user_id__in=ids).values_list("user_id", flat=True))
+        # Insert zeros and increment afterwards so a concurrent first bump
+        # for the same user is not lost to the ignored conflict.
+        StudentVersion.objects.bulk_create(
+            [StudentVersion(user_id=user_id) for user_id in missing], ignore_conflicts=True
+        )
+        StudentVersion.objects.filter(user_id__in=missing).update(**increments)
+
+
+def get_version(user_id, kind: str) -> int:
+    version = StudentVersion.objects.filter(user_id=user_id).values_list(kind, flat=True).first()
+    return version or 0
+
+
+def get_versions(user_ids, kind: str) -> dict[int, int]:
+    ids = set(user_ids)
+    versions = dict(StudentVersion.objects.filter(user_id__in=ids).values_list("user_id", kind))
+    return {user_id: versions.get(user_id, 0) for user_id in ids}
+
+
+def versioned_response(request, user_id, kind: str, build, variant: str = "") -> Response:
+    """Serve ``build()`` cached under the user's ``kind`` version, with an ETag.
+
+    ``build`` returns ``(data, expires_at)``; ``expires_at`` (or None) marks
+    when the body goes stale without any write, e.g. when the next lesson
+    starts. With a warm cache the only query is the version lookup, so a
+    matching ``If-None-Match`` is answered with 304 without reading data
+    tables.
+    """
+    version = get_version(user_id, kind)
+    key = f"versioned:{kind}:{user_id}:{version}:{variant}"
+    entry = cache.get(key)
+    if entry is not None and entry["expires_at"] is not None and entry["expires_at"] <= timezone.now():
+        entry = None
+    if entry is None:
+        data, expires_at = build()
+        body = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True)
+        entry = {
+            "data": data,
+            "etag": '"%s"' % hashlib.sha1(body.encode()).hexdigest(),
+            "expires_at": expires_at,
+        }
+        cache.set(key, entry, VERSIONED_BODY_TIMEOUT)
+
+    headers = {"ETag": entry["etag"], "Cache-Control": "private, no-cache"}
+    if entry["etag"] in parse_etags(request.headers.get("If-None-Match", "")):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(entry["data"], headers=headers)
@@ -1,27 +1,77 @@
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from academy.models import Lesson, Material, StudentProfile, Turma
+from academy.booking import SlotUnavailable, book_lesson
+from academy.downloads import file_response
+from academy.exports import EXPORT_FORMATS, EXPORTS, export_queryset, iter_export
+from academy.imports import IMPORT_FORMATS, detect_format, import_users, summarize
+from academy.models import (
+    Lesson,
+    Material,
+    MaterialAsset,
+    ScheduleException,
+    StudentProfile,
+    Tombstone,
+    Turma,
+    Upload,
+    WorkingHours,
+)
+from academy.materials import COMPLETED, NOT_FOUND, assign_asset, complete_materials, recipient_ids
+from academy.outbox import welcome_email
+from academy.pagination import cursor_paginate, cursor_variant, paginate, wants_cursor, wants_pagination
 from academy.permissions import IsAdmin, IsAluno, IsProfessor
+from academy.search import search as search_queryset
+from academy.slots import available_slots
+from academy.sync import changes
+from academy.summaries import display_name, last_lesson_end, next_lesson_start
+from academy.uploads import UploadError, receive_chunk
+from academy.versions import LESSONS, MATERIALS, PROFILE, SCHEDULE, bump_versions, versioned_response
+from accounts.authentication import get_full_user
 from academy.serializers import (
     AdminUserSerializer,
     AdminUserUpdateSerializer,
     AssignStudentsSerializer,
+    BookLessonSerializer,
+    CalendarWindowSerializer,
     LessonSerializer,
+    LessonWindowSerializer,
+    MaterialAssetSerializer,
+    MaterialBatchCompleteSerializer,
+    MaterialCreateSerializer,
+    MaterialRecipientsSerializer,
     MaterialSerializer,
+    ProfessorCalendarLessonSerializer,
+    ProfessorLessonSerializer,
+    ProfessorMaterialSerializer,
     ProfessorStudentSerializer,
+    ScheduleExceptionSerializer,
+    SlotQuerySerializer,
     StudentProfileSerializer,
     TurmaSerializer,
+    UploadCreateSerializer,
+    UploadSerializer,
     UserCreateSerializer,
+    WorkingHoursSerializer,
 )
 
 
 User = get_user_model()
 
+TURMA_ORDERINGS = {"created_at", "-created_at", "name", "-name", "student_count", "-student_count"}
+
+
+def _turmas_with_counts():
+    return Turma.objects.select_related("professor").annotate(student_count=Count("students"))
+
 
 class AdminUserListCreateView(APIView):
     permission_classes = [IsAdmin]
@@ -30,32 +80,21 @@ class AdminUserListCreateView(APIView):
         role = request.query_params.get("role")
         status_param = request.query_params.get("status")
         search = request.query_params.get("search", "").strip()
-        page = int(request.query_params.get("page", 1))
-        page_size = int(request.query_params.get("page_size", 10))
 
-        qs = User.objects.all().order_by("-date_joined")
+        qs = User.objects.select_related("student_profile").order_by("-date_joined")
         if role in {User.Role.ADMIN, User.Role.PROFESSOR, User.Role.ALUNO}:
             qs = qs.filter(role=role)
         if status_param in {"ativo", "inativo"}:
             qs = qs.filter(is_active=status_param == "ativo")
         if search:
-            qs = qs.filter(
-                Q(email__icontains=search)
-                | Q(username__icontains=search)
-                | Q(first_name__icontains=search)
-                | Q(last_name__icontains=search)
-            )
+            qs = search_queryset(qs, search).order_by("-search_rank", "-date_joined")
 
-        page = max(page, 1)
-        page_size = max(min(page_size, 50), 1)
-        total = qs.count()
-        start = (page - 1) * page_size
-        end = start + page_size
-        results = AdminUserSerializer(qs[start:end], many=True).data
+        def serialize(rows):
+            return AdminUserSerializer(rows, many=True).data
 
-        return Response(
-            {"count": total, "page": page, "page_size": page_size, "results": results}
-        )
+        if wants_cursor(request):
+            return Response(cursor_paginate(qs, request, serialize, fields=("date_joined", "id")))
+        return Response(paginate(qs, request, serialize))
 
     def post(self, request):
         serializer = UserCreateSerializer(data=request.data)
@@ -68,44 +107,108 @@ class AdminUserListCreateView(APIView):
                 {"detail": "Email já cadastrado."}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        user = User.objects.create_user(
-            username=email,
-            email=email,
-            password=data["password"],
-            first_name=data.get("first_name", ""),
-            last_name=data.get("last_name", ""),
-            role=data["role"],
-        )
+        with transaction.atomic():
+            user = User.objects.create_user(
+                username=email,
+                email=email,
+                password=data["password"],
+                first_name=data.get("first_name", ""),
+                last_name=data.get("last_name", ""),
+                role=data["role"],
+            )
 
-        if data["role"] == User.Role.ALUNO:
-            professor_id = data.get("professor_id")
-            turma_id = data.get("turma_id")
-            if professor_id or turma_id:
-                profile, _ = StudentProfile.objects.get_or_create(user=user)
-                if professor_id:
-                    professor = User.objects.filter(id=professor_id, role=User.Role.PROFESSOR).first()
-                    if professor:
-                        profile.professor = professor
-                if turma_id:
-                    turma = Turma.objects.filter(id=turma_id).first()
-                    if turma:
-                        profile.turma = turma
-                profile.save()
+            if data["role"] == User.Role.ALUNO:
+                professor_id = data.get("professor_id")
+                turma_id = data.get("turma_id")
+                if professor_id or turma_id:
+                    profile, _ = StudentProfile.objects.get_or_create(user=user)
+                    if professor_id:
+                        professor = User.objects.filter(id=professor_id, role=User.Role.PROFESSOR).first()
+                        if professor:
+                            profile.professor = professor
+                    if turma_id:
+                        turma = Turma.objects.filter(id=turma_id).first()
+                        if turma:
+                            profile.turma = turma
+                    profile.save()
+            welcome_email(user)
 
         return Response(AdminUserSerializer(user).data, status=status.HTTP_201_CREATED)
 
 
+class AdminUserImportView(APIView):
+    """Import a small CSV/NDJSON file within the request.
+
+    Files over ``USER_IMPORT_MAX_SIZE`` bytes or ``USER_IMPORT_MAX_ROWS``
+    lines are refused before anything is written; they belong to
+    ``manage.py import_users``, which hashes on a process pool.
+    """
+
+    permission_classes = [IsAdmin]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if not upload:
+            return Response({"detail": "Arquivo é obrigatório."}, status=status.HTTP_400_BAD_REQUEST)
+        fmt = request.query_params.get("format") or request.data.get("format") or detect_format(upload.name)
+        if fmt not in IMPORT_FORMATS:
+            return Response({"detail": "Formato inválido. Use csv ou ndjson."}, status=status.HTTP_400_BAD_REQUEST)
+        too_large = upload.size > settings.USER_IMPORT_MAX_SIZE
+        if not too_large:
+            # Lines, not rows: a quoted CSV field may span several, which
+            # only makes the cap stricter.
+            too_large = sum(1 for line in upload if line.strip()) - (fmt == "csv") > settings.USER_IMPORT_MAX_ROWS
+            upload.seek(0)
+        if too_large:
+            return Response(
+                {
+                    "detail": (
+                        f"Arquivo grande demais para importar pela API (até {settings.USER_IMPORT_MAX_ROWS} linhas "
+                        f"e {settings.USER_IMPORT_MAX_SIZE} bytes); use `python manage.py import_users`."
+                    )
+                },
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+        return Response(summarize(import_users(upload, fmt)))
+
+
+class AdminExportView(APIView):
+    permission_classes = [IsAdmin]
+
+    def get(self, request, name: str):
+        if name not in EXPORTS:
+            return Response({"detail": "Exportação não encontrada."}, status=status.HTTP_404_NOT_FOUND)
+        # Not "format": DRF reserves that one for renderer selection.
+        fmt = request.query_params.get("output", "csv")
+        if fmt not in EXPORT_FORMATS:
+            return Response({"detail": "Formato inválido."}, status=status.HTTP_400_BAD_REQUEST)
+        qs = export_queryset(name)
+        if name == "users":
+            role = request.query_params.get("role")
+            if role in {User.Role.ADMIN, User.Role.PROFESSOR, User.Role.ALUNO}:
+                qs = qs.filter(role=role)
+        elif name == "lessons":
+            window = LessonWindowSerializer(data=request.query_params)
+            window.is_valid(raise_exception=True)
+            qs = _lessons_in_window(qs, window.validated_data)
+
+        response = StreamingHttpResponse(iter_export(name, fmt, qs), content_type=EXPORT_FORMATS[fmt])
+        response["Content-Disposition"] = f'attachment; filename="{name}.{fmt}"'
+        response["Cache-Control"] = "no-store"
+        return response
+
+
 class AdminUserDetailView(APIView):
     permission_classes = [IsAdmin]
 
     def get(self, request, user_id: int):
-        user = User.objects.filter(id=user_id).first()
+        user = User.objects.select_related("student_profile").filter(id=user_id).first()
         if not user:
             return Response({"detail": "Usuário não encontrado."}, status=status.HTTP_404_NOT_FOUND)
         return Response(AdminUserSerializer(user).data)
 
     def patch(self, request, user_id: int):
-        user = User.objects.filter(id=user_id).first()
+        user = User.objects.select_related("student_profile").filter(id=user_id).first()
         if not user:
             return Response({"detail": "Usuário não encontrado."}, status=status.HTTP_404_NOT_FOUND)
 
@@ -165,11 +268,21 @@ class AdminTurmaListCreateView(APIView):
     def get(self, request):
         search = request.query_params.get("search", "").strip()
         professor_id = request.query_params.get("professor_id")
-        qs = Turma.objects.select_related("professor").all().order_by("-created_at")
+        has_students = request.query_params.get("has_students")
+        ordering = request.query_params.get("ordering")
+        qs = _turmas_with_counts()
         if search:
-            qs = qs.filter(Q(name__icontains=search) | Q(description__icontains=search))
+            qs = search_queryset(qs, search)
+        if ordering in TURMA_ORDERINGS:
+            qs = qs.order_by(ordering, "-id")
+        elif search:
+            qs = qs.order_by("-search_rank", "-created_at")
+        else:
+            qs = qs.order_by("-created_at", "-id")
         if professor_id:
             qs = qs.filter(professor_id=professor_id)
+        if has_students in {"true", "false"}:
+            qs = qs.filter(student_count__gt=0) if has_students == "true" else qs.filter(student_count=0)
         return Response(TurmaSerializer(qs, many=True).data)
 
     def post(self, request):
@@ -184,6 +297,7 @@ class AdminTurmaListCreateView(APIView):
             description=data.get("description", ""),
             professor=professor,
         )
+        turma.student_count = 0
         return Response(TurmaSerializer(turma).data, status=status.HTTP_201_CREATED)
 
 
@@ -191,13 +305,13 @@ class AdminTurmaDetailView(APIView):
     permission_classes = [IsAdmin]
 
     def get(self, request, turma_id: int):
-        turma = Turma.objects.filter(id=turma_id).first()
+        turma = _turmas_with_counts().filter(id=turma_id).first()
         if not turma:
             return Response({"detail": "Turma não encontrada."}, status=status.HTTP_404_NOT_FOUND)
         return Response(TurmaSerializer(turma).data)
 
     def patch(self, request, turma_id: int):
-        turma = Turma.objects.filter(id=turma_id).first()
+        turma = _turmas_with_counts().filter(id=turma_id).first()
         if not turma:
             return Response({"detail": "Turma não encontrada."}, status=status.HTTP_404_NOT_FOUND)
         serializer = TurmaSerializer(turma, data=request.data, partial=True)
@@ -221,137 +335,460 @@ class AdminTurmaDetailView(APIView):
 
 class AssignStudentsView(APIView):
     permission_classes = [IsAdmin]
+    batch_size = 1000
 
     def post(self, request):
         serializer = AssignStudentsSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         data = serializer.validated_data
 
-        professor_id = data["professor_id"]
-        student_ids = data["student_ids"]
+        updates = {}
+        if "professor_id" in data:
+            professor = None
+            if data["professor_id"] is not None:
+                professor = User.objects.filter(id=data["professor_id"], role=User.Role.PROFESSOR).first()
+                if not professor:
+                    return Response(
+                        {"detail": "Professor inválido."}, status=status.HTTP_400_BAD_REQUEST
+                    )
+            updates["professor"] = professor
+            updates["professor_name"] = display_name(professor) if professor else ""
+        if "turma_id" in data:
+            turma = None
+            if data["turma_id"] is not None:
+                turma = Turma.objects.filter(id=data["turma_id"]).first()
+                if not turma:
+                    return Response({"detail": "Turma inválida."}, status=status.HTTP_400_BAD_REQUEST)
+            updates["turma"] = turma
+
+        student_ids = list(dict.fromkeys(data["student_ids"]))
+        with transaction.atomic():
+            valid_ids = set()
+            for start in range(0, len(student_ids), self.batch_size):
+                chunk = student_ids[start : start + self.batch_size]
+                valid_ids.update(
+                    User.objects.filter(id__in=chunk, role=User.Role.ALUNO).values_list("id", flat=True)
+                )
+            # One upsert per batch: creates missing profiles and only touches
+            # the assigned columns of existing ones.
+            StudentProfile.objects.bulk_create(
+                [StudentProfile(user_id=student_id, **updates) for student_id in valid_ids],
+                batch_size=self.batch_size,
+                update_conflicts=True,
+                unique_fields=["user"],
+                update_fields=list(updates),
+            )
+            bump_versions(valid_ids, PROFILE)
+
+        results = [
+            {"id": student_id, "status": "assigned" if student_id in valid_ids else "invalid"}
+            for student_id in student_ids
+        ]
+        return Response({"assigned": len(valid_ids), "invalid": len(student_ids) - len(valid_ids), "results": results})
+
+
+class ProfessorStudentsView(APIView):
+    permission_classes = [IsProfessor]
+
+    def get(self, request):
+        lessons = Lesson.objects.filter(student=OuterRef("pk"), professor=request.user)
+        last_lesson = last_lesson_end(lessons)
+        next_lesson = next_lesson_start(lessons, timezone.now())
+        qs = (
+            User.objects.select_related("student_profile")
+            .filter(student_profile__professor=request.user)
+            .annotate(last_lesson=Subquery(last_lesson), next_lesson=Subquery(next_lesson))
+            .order_by("first_name", "last_name", "id")
+        )
+        turma_id = request.query_params.get("turma_id")
+        if turma_id:
+            qs = qs.filter(student_profile__turma_id=turma_id)
+
+        def serialize(rows):
+            return ProfessorStudentSerializer(rows, many=True).data
+
+        if wants_pagination(request):
+            return Response(paginate(qs, request, serialize))
+        return Response(serialize(qs))
+
+
+def professor_calendar(professor_id: int, window: dict):
+    return (
+        _lessons_in_window(Lesson.objects.filter(professor_id=professor_id), window)
+        .select_related("student")
+        .only("id", "start", "end", "status", "student__first_name", "student__last_name", "student__email")
+        .order_by("start", "id")
+    )
 
-        professor = User.objects.filter(id=professor_id, role=User.Role.PROFESSOR).first()
-        if not professor:
+
+class ProfessorLessonsView(APIView):
+    permission_classes = [IsProfessor]
+
+    def get(self, request):
+        window = CalendarWindowSerializer(data=request.query_params)
+        window.is_valid(raise_exception=True)
+        qs = professor_calendar(request.user.pk, window.validated_data)
+
+        def serialize(rows):
+            return ProfessorCalendarLessonSerializer(rows, many=True).data
+
+        if wants_cursor(request):
             return Response(
-                {"detail": "Professor inválido."}, status=status.HTTP_400_BAD_REQUEST
+                cursor_paginate(qs, request, serialize, fields=("start", "id"), max_page_size=500, descending=False)
             )
+        return Response(serialize(qs))
 
-        students = User.objects.filter(id__in=student_ids, role=User.Role.ALUNO)
-        if students.count() != len(student_ids):
-            return Response(
-                {"detail": "Um ou mais alunos inválidos."},
-                status=status.HTTP_400_BAD_REQUEST,
+
+class ProfessorScheduleView(APIView):
+    permission_classes = [IsProfessor]
+
+    def get(self, request):
+        hours = WorkingHours.objects.filter(professor=request.user)
+        exceptions = ScheduleException.objects.filter(professor=request.user, end__gt=timezone.now()).order_by(
+            "start"
+        )
+        return Response(
+            {
+                "working_hours": WorkingHoursSerializer(hours, many=True).data,
+                "exceptions": ScheduleExceptionSerializer(exceptions, many=True).data,
+            }
+        )
+
+    def put(self, request):
+        serializer = WorkingHoursSerializer(data=request.data.get("working_hours"), many=True)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            WorkingHours.objects.filter(professor=request.user).delete()
+            hours = WorkingHours.objects.bulk_create(
+                [WorkingHours(professor=request.user, **row) for row in serializer.validated_data]
             )
+            bump_versions([request.user.pk], SCHEDULE)
+        hours.sort(key=lambda row: (row.weekday, row.start_time))
+        return Response({"working_hours": WorkingHoursSerializer(hours, many=True).data})
 
-        for student in students:
-            profile, _ = StudentProfile.objects.get_or_create(user=student)
-            profile.professor = professor
-            profile.save(update_fields=["professor"])
 
-        return Response({"assigned": students.count()})
+class ProfessorScheduleExceptionListView(APIView):
+    permission_classes = [IsProfessor]
 
+    def post(self, request):
+        serializer = ScheduleExceptionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        exception = serializer.save(professor=request.user)
+        return Response(ScheduleExceptionSerializer(exception).data, status=status.HTTP_201_CREATED)
 
-class ProfessorStudentsView(APIView):
+
+class ProfessorScheduleExceptionDetailView(APIView):
     permission_classes = [IsProfessor]
 
-    def get(self, request):
-        profiles = (
-            StudentProfile.objects.select_related("user")
-            .filter(professor=request.user)
-            .order_by("user__first_name", "user__last_name")
+    def delete(self, request, exception_id: int):
+        exception = ScheduleException.objects.filter(id=exception_id, professor=request.user).first()
+        if not exception:
+            return Response({"detail": "Exceção não encontrada."}, status=status.HTTP_404_NOT_FOUND)
+        exception.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ProfessorSlotsView(APIView):
+    def get(self, request, professor_id: int):
+        if not User.objects.filter(id=professor_id, role=User.Role.PROFESSOR, is_active=True).exists():
+            return Response({"detail": "Professor não encontrado."}, status=status.HTTP_404_NOT_FOUND)
+        query = SlotQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        tz = timezone.get_current_timezone()
+        start = timezone.make_aware(datetime.combine(query.validated_data["start"], time.min), tz)
+        end = timezone.make_aware(datetime.combine(query.validated_data["end"] + timedelta(days=1), time.min), tz)
+        duration = timedelta(minutes=query.validated_data["duration"])
+
+        now = timezone.now()
+        slots = available_slots([professor_id], start, end, duration)[professor_id]
+        return Response(
+            {
+                "professor_id": professor_id,
+                "duration": query.validated_data["duration"],
+                "slots": [{"start": slot_start, "end": slot_end} for slot_start, slot_end in slots if slot_start >= now],
+            }
         )
 
-        results = []
-        for profile in profiles:
-            student = profile.user
-            last_lesson = (
-                Lesson.objects.filter(
-                    student=student, professor=request.user, status=Lesson.Status.CONCLUIDA
-                )
-                .order_by("-end")
-                .values_list("end", flat=True)
-                .first()
-            )
-            next_lesson = (
-                Lesson.objects.filter(
-                    student=student, professor=request.user, status=Lesson.Status.AGENDADA
-                )
-                .filter(start__gte=timezone.now())
-                .order_by("start")
-                .values_list("start", flat=True)
-                .first()
-            )
-            payload = ProfessorStudentSerializer(student).data
-            payload["last_lesson"] = last_lesson
-            payload["next_lesson"] = next_lesson
-            results.append(payload)
 
-        return Response(results)
+def student_materials(student_id: int):
+    return Material.objects.filter(student_id=student_id).select_related("asset").order_by("-uploaded_at", "-id")
 
 
 class StudentRepositoryView(APIView):
     permission_classes = [IsAluno]
 
     def get(self, request):
-        qs = Material.objects.filter(student=request.user).order_by("-uploaded_at")
-        return Response(MaterialSerializer(qs, many=True).data)
+        def build():
+            return MaterialSerializer(student_materials(request.user.pk), many=True).data, None
+
+        return versioned_response(request, request.user.pk, MATERIALS, build)
+
+
+def _lessons_in_window(qs, window: dict):
+    if "from" in window:
+        qs = qs.filter(start__gte=window["from"])
+    if "to" in window:
+        qs = qs.filter(start__lt=window["to"])
+    return qs
+
+
+def student_lessons(student_id: int, window: dict):
+    return _lessons_in_window(Lesson.objects.filter(student_id=student_id), window).order_by("-start", "-id")
 
 
 class StudentLessonsView(APIView):
     permission_classes = [IsAluno]
 
     def get(self, request):
-        qs = Lesson.objects.filter(student=request.user).order_by("-start")
-        return Response(LessonSerializer(qs, many=True).data)
+        window = LessonWindowSerializer(data=request.query_params)
+        window.is_valid(raise_exception=True)
+
+        def build():
+            qs = student_lessons(request.user.pk, window.validated_data)
+
+            def serialize(rows):
+                return LessonSerializer(rows, many=True).data
+
+            if wants_cursor(request):
+                return cursor_paginate(qs, request, serialize, fields=("start", "id")), None
+            return serialize(qs), None
+
+        # Each window and page is cached separately under the same version,
+        # keyed only by the parameters above so unrelated ones add no entries.
+        bounds = [window.validated_data.get(name) for name in ("from", "to")]
+        variant = ":".join(bound.isoformat() if bound else "" for bound in bounds)
+        variant += ":" + (cursor_variant(request) if wants_cursor(request) else "list")
+        return versioned_response(request, request.user.pk, LESSONS, build, variant=variant)
+
+    def post(self, request):
+        serializer = BookLessonSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        if not User.objects.filter(id=data["professor_id"], role=User.Role.PROFESSOR, is_active=True).exists():
+            return Response({"detail": "Professor não encontrado."}, status=status.HTTP_404_NOT_FOUND)
+        start = data["start"]
+        end = start + timedelta(minutes=data["duration"])
+        try:
+            lesson = book_lesson(request.user, data["professor_id"], start, end)
+        except SlotUnavailable:
+            return Response({"detail": "Horário indisponível."}, status=status.HTTP_409_CONFLICT)
+        return Response(LessonSerializer(lesson).data, status=status.HTTP_201_CREATED)
 
 
 class StudentProfileView(APIView):
     permission_classes = [IsAluno]
+    summary_fields = ("progress", "last_lesson", "next_lesson", "professor_name")
 
     def get(self, request):
-        profile, _ = StudentProfile.objects.get_or_create(user=request.user)
-        last_lesson = (
-            Lesson.objects.filter(student=request.user, status=Lesson.Status.CONCLUIDA)
-            .order_by("-end")
-            .values_list("end", flat=True)
-            .first()
+        def build():
+            user = get_full_user(request.user)
+            profiles = StudentProfile.objects.filter(user_id=user.pk).values(*self.summary_fields)
+            summary = profiles.first() or dict.fromkeys(self.summary_fields)
+            now = timezone.now()
+            if summary["next_lesson"] and summary["next_lesson"] <= now:
+                # The scheduler moves the summary on at the lesson start;
+                # until it runs, read the next lesson without writing.
+                upcoming = Lesson.objects.filter(student_id=user.pk, status=Lesson.Status.AGENDADA, start__gt=now)
+                summary["next_lesson"] = upcoming.order_by("start").values_list("start", flat=True).first()
+            payload = StudentProfileSerializer(
+                {
+                    "id": user.id,
+                    "name": display_name(user),
+                    "email": user.email,
+                    "role": user.role,
+                    "progress": summary["progress"] or 0,
+                    "last_lesson": summary["last_lesson"],
+                    "next_lesson": summary["next_lesson"],
+                    "professor": summary["professor_name"] or "",
+                }
+            ).data
+            return payload, summary["next_lesson"]
+
+        return versioned_response(request, request.user.pk, PROFILE, build)
+
+
+def student_change_sources(student_id: int) -> dict:
+    owner = {"student_id": student_id}
+    return {
+        "lessons": (Lesson.objects.filter(student_id=student_id), Tombstone.Kind.LESSON, owner, LessonSerializer),
+        "materials": (
+            Material.objects.filter(student_id=student_id).select_related("asset"),
+            Tombstone.Kind.MATERIAL,
+            owner,
+            MaterialSerializer,
+        ),
+    }
+
+
+def professor_change_sources(professor_id: int) -> dict:
+    owner = {"professor_id": professor_id}
+    return {
+        "lessons": (
+            Lesson.objects.filter(professor_id=professor_id),
+            Tombstone.Kind.LESSON,
+            owner,
+            ProfessorLessonSerializer,
+        ),
+        "materials": (
+            Material.objects.filter(professor_id=professor_id).select_related("asset"),
+            Tombstone.Kind.MATERIAL,
+            owner,
+            ProfessorMaterialSerializer,
+        ),
+    }
+
+
+class StudentChangesView(APIView):
+    permission_classes = [IsAluno]
+
+    def get(self, request):
+        return Response(changes(request, student_change_sources(request.user.pk)))
+
+
+class ProfessorChangesView(APIView):
+    permission_classes = [IsProfessor]
+
+    def get(self, request):
+        return Response(changes(request, professor_change_sources(request.user.pk)))
+
+
+class UploadListView(APIView):
+    permission_classes = [IsProfessor]
+
+    def post(self, request):
+        serializer = UploadCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = Upload.objects.create(owner=request.user, **serializer.validated_data)
+        return Response(UploadSerializer(upload).data, status=status.HTTP_201_CREATED)
+
+
+class UploadDetailView(APIView):
+    """Resumable upload: GET reports the offset, PATCH appends a raw chunk.
+
+    PATCH carries ``Upload-Offset`` (where the chunk starts) and optionally
+    ``Upload-Checksum`` (hex SHA-256 of the chunk). The body is streamed
+    to storage without being parsed.
+    """
+
+    permission_classes = [IsProfessor]
+
+    def get(self, request, upload_id):
+        upload = Upload.objects.filter(id=upload_id, owner=request.user).first()
+        if not upload:
+            return Response({"detail": "Upload não encontrado."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(UploadSerializer(upload).data)
+
+    def patch(self, request, upload_id):
+        upload = Upload.objects.filter(id=upload_id, owner=request.user).first()
+        if not upload:
+            return Response({"detail": "Upload não encontrado."}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            offset = int(request.headers["Upload-Offset"])
+            length = int(request.headers["Content-Length"])
+        except (KeyError, ValueError):
+            return Response(
+                {"detail": "Informe Upload-Offset e Content-Length."}, status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            upload = receive_chunk(
+                upload, offset, request._request, length, request.headers.get("Upload-Checksum", "")
+            )
+        except UploadError as exc:
+            return Response({"detail": exc.detail, "offset": exc.offset}, status=exc.status_code)
+        return Response(UploadSerializer(upload).data)
+
+
+def _material_recipients(request, data):
+    """Resolve ``student_ids``/``turma_id``; returns ``(ids, invalid count, error response)``."""
+    turma = None
+    if "turma_id" in data:
+        turma = Turma.objects.filter(id=data["turma_id"]).first()
+        if turma is None:
+            return None, 0, Response({"detail": "Turma inválida."}, status=status.HTTP_400_BAD_REQUEST)
+        if turma.professor_id != request.user.pk:
+            return None, 0, Response({"detail": "Turma de outro professor."}, status=status.HTTP_403_FORBIDDEN)
+    requested = set(data.get("student_ids", []))
+    ids = recipient_ids(request.user, requested, turma)
+    return ids, len(requested - ids), None
+
+
+class ProfessorMaterialListView(APIView):
+    permission_classes = [IsProfessor]
+
+    def post(self, request):
+        serializer = MaterialCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        ids, invalid, error = _material_recipients(request, data)
+        if error:
+            return error
+        stored, file_name = None, ""
+        if "upload_id" in data:
+            upload = Upload.objects.filter(id=data["upload_id"], owner=request.user).select_related("file").first()
+            if not upload or upload.file is None:
+                return Response({"detail": "Upload não encontrado ou incompleto."}, status=status.HTTP_400_BAD_REQUEST)
+            stored, file_name = upload.file, upload.filename
+        with transaction.atomic():
+            asset = MaterialAsset.objects.create(
+                professor=request.user, title=data["title"], type=data["type"], file=stored, file_name=file_name
+            )
+            assigned = assign_asset(asset, ids, professor=request.user)
+        return Response(
+            {"asset": MaterialAssetSerializer(asset).data, "assigned": assigned, "invalid": invalid},
+            status=status.HTTP_201_CREATED,
         )
-        next_lesson = (
-            Lesson.objects.filter(student=request.user, status=Lesson.Status.AGENDADA)
-            .filter(start__gte=timezone.now())
-            .order_by("start")
-            .values_list("start", flat=True)
+
+
+class ProfessorMaterialAssignView(APIView):
+    permission_classes = [IsProfessor]
+
+    def post(self, request, asset_id: int):
+        asset = MaterialAsset.objects.filter(id=asset_id, professor=request.user).first()
+        if not asset:
+            return Response({"detail": "Material não encontrado."}, status=status.HTTP_404_NOT_FOUND)
+        serializer = MaterialRecipientsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids, invalid, error = _material_recipients(request, serializer.validated_data)
+        if error:
+            return error
+        assigned = assign_asset(asset, ids, professor=request.user)
+        return Response({"assigned": assigned, "already_assigned": len(ids) - assigned, "invalid": invalid})
+
+
+class MaterialFileView(APIView):
+    def get(self, request, material_id: int):
+        material = (
+            Material.objects.filter(Q(student=request.user) | Q(professor=request.user), id=material_id)
+            .select_related("asset__file")
             .first()
         )
-        name = f"{request.user.first_name} {request.user.last_name}".strip() or request.user.email
-        professor_name = ""
-        if profile.professor_id:
-            professor = profile.professor
-            professor_name = (
-                f"{professor.first_name} {professor.last_name}".strip() or professor.email
-            )
-        payload = StudentProfileSerializer(
-            {
-                "id": request.user.id,
-                "name": name,
-                "email": request.user.email,
-                "role": request.user.role,
-                "progress": profile.progress,
-                "last_lesson": last_lesson,
-                "next_lesson": next_lesson,
-                "professor": professor_name,
-            }
-        ).data
-        return Response(payload)
+        if not material or material.asset.file is None:
+            return Response({"detail": "Arquivo não encontrado."}, status=status.HTTP_404_NOT_FOUND)
+        return file_response(request, material.asset.file, material.asset.file_name)
 
 
 class MaterialCompleteView(APIView):
     permission_classes = [IsAluno]
 
     def put(self, request, material_id: int):
-        material = Material.objects.filter(id=material_id, student=request.user).first()
-        if not material:
+        if complete_materials(request.user, [material_id])[material_id] == NOT_FOUND:
             return Response({"detail": "Material não encontrado."}, status=status.HTTP_404_NOT_FOUND)
-        material.status = Material.Status.CONCLUIDO
-        material.save(update_fields=["status"])
+        material = Material.objects.select_related("asset").get(id=material_id)
         return Response(MaterialSerializer(material).data)
+
+
+class MaterialBatchCompleteView(APIView):
+    """Complete several materials at once, e.g. an offline client's queue."""
+
+    permission_classes = [IsAluno]
+
+    def post(self, request):
+        serializer = MaterialBatchCompleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = complete_materials(request.user, serializer.validated_data["ids"])
+        return Response(
+            {
+                "completed": sum(result == COMPLETED for result in results.values()),
+                "results": [{"id": material_id, "result": result} for material_id, result in results.items()],
+            }
+        )
@@ -0,0 +1,111 @@
+"""Async login/registration for ASGI deployments (``AUTH_ASYNC_VIEWS``).
+
+Same request/response contract as ``LoginView`` and ``RegisterView``, but
+PBKDF2 runs in the bounded ``PasswordPool`` so the event loop keeps serving
+other requests, and a saturated pool answers 503 instead of queueing.
+"""
+
+import json
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.db import IntegrityError
+from django.db.models import Q
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+
+from accounts.hashing import PoolSaturated, check_password_only, get_password_pool
+from accounts.serializers import LoginSerializer, RegisterSerializer, UserSerializer
+from accounts.views import _tokens_for_user
+
+
+User = get_user_model()
+
+
+def _busy():
+    return JsonResponse(
+        {"detail": "Servidor ocupado, tente novamente em instantes."},
+        status=503,
+        headers={"Retry-After": "1"},
+    )
+
+
+def _body(request):
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _needs_rehash(encoded: str) -> bool:
+    try:
+        return identify_hasher(encoded).must_update(encoded)
+    except ValueError:
+        return False
+
+
+@csrf_exempt
+@require_POST
+async def login(request):
+    data = _body(request)
+    if data is None:
+        return JsonResponse({"detail": "JSON inválido."}, status=400)
+    serializer = LoginSerializer(data=data)
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=400)
+    email = serializer.validated_data["email"].strip().lower()
+    password = serializer.validated_data["password"]
+
+    pool = get_password_pool()
+    user = await User.objects.filter(username=email).afirst()
+    try:
+        if user is None:
+            # Hash anyway so unknown emails take as long as wrong passwords,
+            # like ModelBackend does.
+            await pool.run(make_password, password)
+            valid = False
+        else:
+            valid = await pool.run(check_password_only, password, user.password)
+            if valid and _needs_rehash(user.password):
+                user.password = await pool.run(make_password, password)
+                await User.objects.filter(pk=user.pk).aupdate(password=user.password)
+    except PoolSaturated:
+        return _busy()
+
+    if not valid or not user.is_active:
+        return JsonResponse({"detail": "Credenciais inválidas."}, status=401)
+    return JsonResponse({"tokens": _tokens_for_user(user), "user": UserSerializer(user).data})
+
+
+@csrf_exempt
+@require_POST
+async def register(request):
+    data = _body(request)
+    if data is None:
+        return JsonResponse({"detail": "JSON inválido."}, status=400)
+    serializer = RegisterSerializer(data=data)
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=400)
+    data = serializer.validated_data
+    email = data["email"].strip().lower()
+
+    if await User.objects.filter(Q(username=email) | Q(email=email)).aexists():
+        return JsonResponse({"detail": "Email já cadastrado."}, status=400)
+    try:
+        password = await get_password_pool().run(make_password, data["password"])
+    except PoolSaturated:
+        return _busy()
+    try:
+        user = await User.objects.acreate(
+            username=email,
+            email=email,
+            password=password,
+            first_name=data.get("first_name", ""),
+            last_name=data.get("last_name", ""),
+            role=User.Role.ALUNO,
+        )
+    except IntegrityError:
+        return JsonResponse({"detail": "Email já cadastrado."}, status=400)
+    return JsonResponse({"tokens": _tokens_for_user(user), "user": UserSerializer(user).data}, status=201)
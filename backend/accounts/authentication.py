@@ -0,0 +1,154 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+
+# Fields kept in the cache and loaded on users built by the authenticators.
+# Everything else (password hash included) stays deferred.
+USER_CACHE_FIELDS = ("role", "is_active", "is_staff", "is_superuser")
+
+
+def user_cache_key(user_id) -> str:
+    return f"auth:user:{user_id}"
+
+
+def shared_cache() -> bool:
+    """Whether the default cache is seen by every process.
+
+    Invalidations and revocation markers written to a local-memory cache
+    only reach the process that wrote them. The user cache tolerates that
+    for ``AUTH_USER_CACHE_TIMEOUT`` seconds; claim-only authentication,
+    which relies on revocation markers, needs ``REDIS_URL``.
+    """
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache))
+
+
+def _build_user(model, values: dict):
+    """A ``model`` instance with only the fields in ``values`` loaded."""
+    # from_db expects values in concrete field order; token claims may
+    # carry the id as a string.
+    fields = [f for f in model._meta.concrete_fields if f.attname in values]
+    return model.from_db(
+        router.db_for_read(model), [f.attname for f in fields], [f.to_python(values[f.attname]) for f in fields]
+    )
+
+
+def invalidate_cached_user(user_id) -> None:
+    cache.delete(user_cache_key(user_id))
+
+
+def _revoked_key(user_id) -> str:
+    return f"auth:revoked:{user_id}"
+
+
+def revoke_access_tokens(user_id) -> None:
+    """Reject access tokens issued to ``user_id`` before now.
+
+    Needed when claims in outstanding tokens (role, active) go stale. The
+    marker only has to outlive the access tokens themselves; refreshing
+    re-reads the user, so new tokens carry the current claims.
+
+    ``iat`` is in whole seconds, so the marker is truncated the same way:
+    a token issued in the second of the revocation is still accepted,
+    which lets the user log in again right after a role change.
+    """
+    lifetime = int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+    cache.set(_revoked_key(user_id), int(time.time()), lifetime + 60)
+
+
+def add_role_claims(token, user) -> None:
+    token["role"] = user.role
+    token["active"] = user.is_active
+
+
+def get_full_user(user):
+    """Return ``user`` with every field loaded.
+
+    Authenticated users only carry id and the ``USER_CACHE_FIELDS``; views
+    that need names or email call this instead of loading fields one by one.
+    """
+    if not user.get_deferred_fields():
+        return user
+    return get_user_model().objects.get(pk=user.pk)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """``JWTAuthentication`` that keeps resolved users in the cache.
+
+    Only id and ``USER_CACHE_FIELDS`` are cached, and the user is rebuilt
+    from them with every other field deferred. Entries live for
+    ``AUTH_USER_CACHE_TIMEOUT`` seconds and are dropped whenever the user
+    row is saved or deleted (see ``accounts.signals``). With a shared cache
+    role and status changes apply on the next request; with the per-process
+    local-memory cache other workers may serve the old values until the
+    entry expires. With ``CHECK_REVOKE_TOKEN`` (which needs the password
+    hash) this is plain ``JWTAuthentication``.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        key = user_cache_key(user_id)
+        values = cache.get(key)
+        if values is None:
+            users = self.user_model.objects.filter(**{api_settings.USER_ID_FIELD: user_id})
+            values = users.values(api_settings.USER_ID_FIELD, *USER_CACHE_FIELDS).first()
+            if values is None:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            cache.set(key, values, settings.AUTH_USER_CACHE_TIMEOUT)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not values["is_active"]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return _build_user(self.user_model, values)
+
+
+class TokenClaimsAuthentication(CachedJWTAuthentication):
+    """Authenticate from the ``role``/``active`` claims without a user query.
+
+    Returns a ``User`` whose only loaded fields are id, role and is_active
+    (the rest are deferred), so role permissions and ORM filters on
+    ``request.user`` work without touching ``accounts_user``. Tokens issued
+    before ``revoke_access_tokens`` are rejected; tokens without the claims,
+    or a cache that is not shared, fall back to the cached lookup.
+    """
+
+    def get_user(self, validated_token):
+        if (
+            "role" not in validated_token
+            or "active" not in validated_token
+            or api_settings.CHECK_REVOKE_TOKEN
+            or not shared_cache()
+        ):
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        revoked_at = cache.get(_revoked_key(user_id))
+        if revoked_at is not None and validated_token.get("iat", 0) < revoked_at:
+            raise AuthenticationFailed(_("Token is invalid"), code="token_revoked")
+        if api_settings.CHECK_USER_IS_ACTIVE and not validated_token["active"]:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        claims = {
+            api_settings.USER_ID_FIELD: user_id,
+            "role": validated_token["role"],
+            "is_active": validated_token["active"],
+        }
+        return _build_user(self.user_model, claims)
@@ -0,0 +1,113 @@
+import base64
+import json
+import re
+import threading
+import time
+import urllib.request
+
+from django.conf import settings
+
+
+GOOGLE_ISSUERS = {"accounts.google.com", "https://accounts.google.com"}
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class InvalidGoogleToken(ValueError):
+    pass
+
+
+class HTTPCertSource:
+    """Google's signing certificates, cached for the response's max-age.
+
+    Any endpoint serving ``{"key id": "PEM certificate"}`` works, so tests
+    can point ``GOOGLE_CERTS_URL`` at a local stand-in server.
+    """
+
+    def __init__(self, url: str, default_max_age: int = 300, min_refresh_interval: int = 60, timeout: float = 5):
+        self.url = url
+        self.default_max_age = default_max_age
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        self._certs: dict[str, str] = {}
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+
+    def get_certs(self, refresh: bool = False) -> dict[str, str]:
+        now = time.monotonic()
+        if self._certs and now < self._expires_at and not refresh:
+            return self._certs
+        with self._lock:
+            now = time.monotonic()
+            stale = not self._certs or now >= self._expires_at
+            # A forced refresh handles key rotation; the interval stops tokens
+            # with made-up key ids from turning into a fetch per request.
+            forced = refresh and now - self._fetched_at >= self.min_refresh_interval
+            if stale or forced:
+                self._certs, max_age = self.fetch()
+                self._fetched_at = now
+                self._expires_at = now + max_age
+            return self._certs
+
+    def fetch(self) -> tuple[dict[str, str], int]:
+        with urllib.request.urlopen(self.url, timeout=self.timeout) as response:
+            certs = json.loads(response.read().decode("utf-8"))
+            match = _MAX_AGE.search(response.headers.get("Cache-Control", ""))
+        max_age = int(match.group(1)) if match else self.default_max_age
+        return certs, max_age
+
+
+def _unverified_kid(token: str) -> str | None:
+    try:
+        header = token.split(".", 1)[0]
+        header += "=" * (-len(header) % 4)
+        return json.loads(base64.urlsafe_b64decode(header.encode())).get("kid")
+    except (ValueError, AttributeError):
+        raise InvalidGoogleToken("Token malformado.")
+
+
+class GoogleIDTokenVerifier:
+    """Checks the signature once and accepts any configured client id as ``aud``."""
+
+    def __init__(self, client_ids, source, clock_skew_in_seconds: int = 10):
+        self.client_ids = list(client_ids)
+        self.source = source
+        self.clock_skew_in_seconds = clock_skew_in_seconds
+
+    def verify(self, token: str) -> dict:
+        from google.auth import jwt as google_jwt
+
+        kid = _unverified_kid(token)
+        certs = self.source.get_certs()
+        if kid not in certs:
+            certs = self.source.get_certs(refresh=True)
+        try:
+            payload = google_jwt.decode(
+                token,
+                certs=certs,
+                audience=self.client_ids,
+                clock_skew_in_seconds=self.clock_skew_in_seconds,
+            )
+        except ValueError as e:
+            raise InvalidGoogleToken(str(e)) from e
+        if payload.get("iss") not in GOOGLE_ISSUERS:
+            raise InvalidGoogleToken("Emissor inválido.")
+        return payload
+
+
+_sources: dict[str, HTTPCertSource] = {}
+_sources_lock = threading.Lock()
+
+
+def get_cert_source(url: str | None = None) -> HTTPCertSource:
+    url = url or settings.GOOGLE_CERTS_URL
+    with _sources_lock:
+        if url not in _sources:
+            _sources[url] = HTTPCertSource(url)
+        return _sources[url]
+
+
+def verify_google_id_token(token: str) -> dict:
+    verifier = GoogleIDTokenVerifier(settings.GOOGLE_CLIENT_IDS, get_cert_source())
+    return verifier.verify(token)
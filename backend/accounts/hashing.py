@@ -0,0 +1,82 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+
+
+def hash_password(raw_password: str) -> str:
+    # Module-level so process pools can pickle it by reference.
+    return make_password(raw_password)
+
+
+def hash_passwords(raw_passwords: list[str], executor=None) -> list[str]:
+    if executor is None or len(raw_passwords) < 2:
+        return [make_password(raw) for raw in raw_passwords]
+    workers = getattr(executor, "_max_workers", 1) or 1
+    chunksize = max(1, len(raw_passwords) // (workers * 4))
+    return list(executor.map(hash_password, raw_passwords, chunksize=chunksize))
+
+
+class PoolSaturated(Exception):
+    pass
+
+
+class PasswordPool:
+    """Bounded executor that keeps password hashing off the event loop.
+
+    At most ``max_workers`` hashes run at once and ``max_pending`` more may
+    wait; beyond that ``run`` raises ``PoolSaturated`` immediately so the
+    caller can shed load instead of queueing without limit.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.capacity = max_workers + max_pending
+        self._executor = None
+        self._inflight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """The pool's threads, for synchronous batches such as user imports."""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # hashlib releases the GIL while hashing, so threads run
+                    # PBKDF2 in parallel without the cost of a process pool.
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="password"
+                    )
+        return self._executor
+
+    async def run(self, func, *args):
+        with self._lock:
+            if self._inflight >= self.capacity:
+                raise PoolSaturated()
+            self._inflight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+        finally:
+            with self._lock:
+                self._inflight -= 1
+
+
+_pool = None
+
+
+def get_password_pool() -> PasswordPool:
+    global _pool
+    if _pool is None:
+        _pool = PasswordPool(
+            max_workers=settings.PASSWORD_HASH_WORKERS, max_pending=settings.PASSWORD_HASH_QUEUE
+        )
+    return _pool
+
+
+def check_password_only(raw_password: str, encoded: str) -> bool:
+    # No setter: rehashing on upgrade is done by the caller, outside the pool,
+    # so pool threads never touch the database.
+    return check_password(raw_password, encoded)
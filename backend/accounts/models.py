@@ -9,4 +9,9 @@ class User(AbstractUser):
         ALUNO = "aluno", "Aluno"
 
     role = models.CharField(max_length=20, choices=Role.choices, default=Role.ALUNO)
+    search_text = models.TextField(blank=True, default="", editable=False)
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=["-date_joined", "-id"], name="user_date_joined_id_idx"),
+        ]
@@ -0,0 +1,37 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from accounts.authentication import invalidate_cached_user, revoke_access_tokens
+
+
+User = get_user_model()
+
+
+# Fields carried as token claims; changing them revokes outstanding tokens.
+TOKEN_CLAIM_FIELDS = ("role", "is_active")
+
+
+@receiver(pre_save, sender=User)
+def remember_token_claims(sender, instance, using, update_fields=None, **kwargs):
+    # Only saves that may change a claim read the stored values, so
+    # last_login updates on every login stay a single UPDATE.
+    instance._token_claims = None
+    if instance._state.adding or (update_fields is not None and not set(TOKEN_CLAIM_FIELDS) & set(update_fields)):
+        return
+    users = sender._default_manager.using(using).filter(pk=instance.pk)
+    instance._token_claims = users.values_list(*TOKEN_CLAIM_FIELDS).first()
+
+
+@receiver(post_save, sender=User)
+def drop_cached_user(sender, instance, created, **kwargs):
+    invalidate_cached_user(instance.pk)
+    saved = instance._token_claims
+    if not created and saved is not None and saved != (instance.role, instance.is_active):
+        revoke_access_tokens(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def drop_deleted_user(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+    revoke_access_tokens(instance.pk)
@@ -0,0 +1,73 @@
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.authentication import CachedJWTAuthentication, TokenClaimsAuthentication
+
+
+User = get_user_model()
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": tempfile.mkdtemp(),
+        }
+    },
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+)
+class TokenRevocationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="aluno@example.com", email="aluno@example.com", password="senha", role=User.Role.ALUNO
+        )
+
+    def login(self):
+        response = APIClient().post(
+            "/api/auth/login/", {"email": "aluno@example.com", "password": "senha"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        return AccessToken(response.json()["tokens"]["access"])
+
+    def authenticate(self, token):
+        return TokenClaimsAuthentication().get_user(token)
+
+    def test_relogin_right_after_role_change(self):
+        self.login()
+        self.user.role = User.Role.PROFESSOR
+        self.user.save()
+
+        user = self.authenticate(self.login())
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertEqual(user.role, User.Role.PROFESSOR)
+
+    def test_tokens_issued_before_role_change_are_rejected(self):
+        token = self.login()
+        with mock.patch("accounts.authentication.time.time", return_value=token["iat"] + 1.5):
+            self.user.role = User.Role.PROFESSOR
+            self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(token)
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class LocalUserCacheTests(TestCase):
+    def test_local_memory_cache_serves_repeat_requests(self):
+        user = User.objects.create_user(username="prof@example.com", email="prof@example.com", role=User.Role.PROFESSOR)
+        token = AccessToken.for_user(user)
+        with self.assertNumQueries(1):
+            CachedJWTAuthentication().get_user(token)
+        with self.assertNumQueries(0):
+            cached = CachedJWTAuthentication().get_user(token)
+        self.assertEqual(cached.role, User.Role.PROFESSOR)
+
+        user.role = User.Role.ADMIN
+        user.save()
+        self.assertEqual(CachedJWTAuthentication().get_user(token).role, User.Role.ADMIN)
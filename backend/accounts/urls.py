@@ -1,13 +1,20 @@
+from django.conf import settings
 from django.urls import path
 
+from accounts import async_views
 from accounts.views import GoogleLoginView, LoginView, MeView, RefreshView, RegisterView
 
 
+if settings.AUTH_ASYNC_VIEWS:
+    register_view, login_view = async_views.register, async_views.login
+else:
+    register_view, login_view = RegisterView.as_view(), LoginView.as_view()
+
+
 urlpatterns = [
-    path("register/", RegisterView.as_view(), name="register"),
-    path("login/", LoginView.as_view(), name="login"),
+    path("register/", register_view, name="register"),
+    path("login/", login_view, name="login"),
     path("refresh/", RefreshView.as_view(), name="refresh"),
     path("google/", GoogleLoginView.as_view(), name="google"),
     path("me/", MeView.as_view(), name="me"),
 ]
-
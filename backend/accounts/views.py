@@ -6,8 +6,11 @@ from rest_framework import status
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from accounts.authentication import add_role_claims, get_full_user
+from accounts.google import verify_google_id_token
 from accounts.serializers import (
     GoogleAuthSerializer,
     LoginSerializer,
@@ -21,6 +24,7 @@ User = get_user_model()
 
 def _tokens_for_user(user):
     refresh = RefreshToken.for_user(user)
+    add_role_claims(refresh, user)
     return {"refresh": str(refresh), "access": str(refresh.access_token)}
 
 
@@ -78,18 +82,27 @@ class RefreshView(APIView):
 
         try:
             refresh = RefreshToken(raw)
-            access = str(refresh.access_token)
+            access = refresh.access_token
         except Exception:
             return Response({"detail": "Refresh token inválido."}, status=status.HTTP_401_UNAUTHORIZED)
 
-        return Response({"access": access})
+        # Claims copied from the refresh token may be stale; reissue them
+        # from the current row so role changes reach the new access token.
+        user = User.objects.filter(
+            **{api_settings.USER_ID_FIELD: refresh.get(api_settings.USER_ID_CLAIM)}
+        ).first()
+        if user is None or not user.is_active:
+            return Response({"detail": "Refresh token inválido."}, status=status.HTTP_401_UNAUTHORIZED)
+        add_role_claims(access, user)
+
+        return Response({"access": str(access)})
 
 
 class MeView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        return Response(UserSerializer(request.user).data)
+        return Response(UserSerializer(get_full_user(request.user)).data)
 
 
 class GoogleLoginView(APIView):
@@ -100,16 +113,14 @@ class GoogleLoginView(APIView):
         serializer.is_valid(raise_exception=True)
         token = serializer.validated_data["id_token"]
 
-        client_ids = list(getattr(settings, "GOOGLE_CLIENT_IDS", []) or [])
-        if not client_ids:
+        if not getattr(settings, "GOOGLE_CLIENT_IDS", None):
             return Response(
                 {"detail": "Login Google desabilitado: GOOGLE_CLIENT_ID(S) não configurado no backend."},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
         try:
-            from google.auth.transport import requests as google_requests
-            from google.oauth2 import id_token as google_id_token
+            import google.auth.jwt  # noqa: F401
         except Exception:
             return Response(
                 {
@@ -119,26 +130,10 @@ class GoogleLoginView(APIView):
             )
 
         try:
-            payload = None
-            last_error = None
-            for client_id in client_ids:
-                try:
-                    payload = google_id_token.verify_oauth2_token(
-                        token, google_requests.Request(), audience=client_id
-                    )
-                    break
-                except Exception as e:
-                    last_error = e
-                    continue
-            if payload is None:
-                raise last_error or Exception("Token inválido")
+            payload = verify_google_id_token(token)
         except Exception:
             return Response({"detail": "Token do Google inválido."}, status=status.HTTP_401_UNAUTHORIZED)
 
-        issuer = payload.get("iss")
-        if issuer not in {"accounts.google.com", "https://accounts.google.com"}:
-            return Response({"detail": "Token do Google inválido."}, status=status.HTTP_401_UNAUTHORIZED)
-
         if payload.get("email_verified") is False:
             return Response({"detail": "Email do Google não verificado."}, status=status.HTTP_401_UNAUTHORIZED)
 
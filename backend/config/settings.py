@@ -80,8 +80,28 @@ WSGI_APPLICATION = "config.wsgi.application"
 DATABASE_URL = os.getenv("DATABASE_URL", "")
 if DATABASE_URL:
     DATABASES = {"default": dj_database_url.parse(DATABASE_URL, conn_max_age=600, ssl_require=True)}
+    # Named (server-side) cursors only live inside one transaction on one
+    # server connection, which a transaction pooler such as Supabase's does
+    # not guarantee. Turn off only with a direct or session-pooled URL.
+    DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = _env_bool("DATABASE_DISABLE_SERVER_SIDE_CURSORS", True)
 else:
-    DATABASES = {"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": BASE_DIR / "db.sqlite3"}}
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": BASE_DIR / "db.sqlite3",
+            # A file instead of the shared in-memory database, whose table
+            # locks fail at once instead of waiting: the booking race test
+            # sends requests from several threads.
+            "TEST": {"NAME": BASE_DIR / "test_db.sqlite3"},
+        }
+    }
+
+
+REDIS_URL = os.getenv("REDIS_URL", "")
+if REDIS_URL:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": REDIS_URL}}
+else:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
 
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -108,13 +128,59 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 AUTH_USER_MODEL = "accounts.User"
 
+AUTH_ASYNC_VIEWS = _env_bool("AUTH_ASYNC_VIEWS", default=False)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS") or os.cpu_count() or 1)
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE") or PASSWORD_HASH_WORKERS * 4)
+AUTH_USER_CACHE_TIMEOUT = int(os.getenv("AUTH_USER_CACHE_TIMEOUT") or 60)
+# Larger imports go through `manage.py import_users` instead of a web request.
+USER_IMPORT_MAX_SIZE = int(os.getenv("USER_IMPORT_MAX_SIZE") or 1024**2)
+USER_IMPORT_MAX_ROWS = int(os.getenv("USER_IMPORT_MAX_ROWS") or 1000)
+
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID", "")
 GOOGLE_CLIENT_IDS = _env_list("GOOGLE_CLIENT_IDS") or ([GOOGLE_CLIENT_ID] if GOOGLE_CLIENT_ID else [])
+GOOGLE_CERTS_URL = os.getenv("GOOGLE_CERTS_URL", "https://www.googleapis.com/oauth2/v1/certs")
+
+
+MATERIAL_STORAGE_ROOT = Path(os.getenv("MATERIAL_STORAGE_ROOT") or BASE_DIR / "media" / "materials")
+MATERIAL_UPLOAD_MAX_SIZE = int(os.getenv("MATERIAL_UPLOAD_MAX_SIZE") or 2 * 1024**3)
+MATERIAL_UPLOAD_CHUNK_SIZE = int(os.getenv("MATERIAL_UPLOAD_CHUNK_SIZE") or 8 * 1024**2)
+# With a front proxy serving MATERIAL_STORAGE_ROOT (nginx: X-Accel-Redirect,
+# Apache/Caddy: X-Sendfile), downloads are handed off to it entirely.
+MATERIAL_SENDFILE_HEADER = os.getenv("MATERIAL_SENDFILE_HEADER", "")
+MATERIAL_SENDFILE_PREFIX = os.getenv("MATERIAL_SENDFILE_PREFIX", "/protected-materials/")
+
+
+EMAIL_BACKEND = os.getenv("EMAIL_BACKEND") or "django.core.mail.backends.smtp.EmailBackend"
+EMAIL_HOST = os.getenv("EMAIL_HOST") or "localhost"
+EMAIL_PORT = int(os.getenv("EMAIL_PORT") or 25)
+EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER", "")
+EMAIL_HOST_PASSWORD = os.getenv("EMAIL_HOST_PASSWORD", "")
+EMAIL_USE_TLS = _env_bool("EMAIL_USE_TLS", default=False)
+EMAIL_USE_SSL = _env_bool("EMAIL_USE_SSL", default=False)
+EMAIL_TIMEOUT = int(os.getenv("EMAIL_TIMEOUT") or 30)
+EMAIL_FILE_PATH = os.getenv("EMAIL_FILE_PATH") or BASE_DIR / "sent_emails"
+DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL") or "webmaster@localhost"
+
+# Notification outbox (academy.outbox), drained by `manage.py send_outbox_emails`.
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE") or 100)
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS") or 8)
+OUTBOX_RETRY_BASE = int(os.getenv("OUTBOX_RETRY_BASE") or 60)
+OUTBOX_RETRY_MAX = int(os.getenv("OUTBOX_RETRY_MAX") or 6 * 60 * 60)
+OUTBOX_CLAIM_TIMEOUT = int(os.getenv("OUTBOX_CLAIM_TIMEOUT") or 5 * 60)
+
+
+# Lesson scheduler (`manage.py run_lesson_scheduler`), in seconds.
+LESSON_CANCEL_CUTOFF = int(os.getenv("LESSON_CANCEL_CUTOFF") or 3 * 60 * 60)
+LESSON_REMINDER_LEAD = int(os.getenv("LESSON_REMINDER_LEAD") or 24 * 60 * 60)
+
 
+AUTH_TOKEN_CLAIMS_ONLY = _env_bool("AUTH_TOKEN_CLAIMS_ONLY", default=False)
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.TokenClaimsAuthentication"
+        if AUTH_TOKEN_CLAIMS_ONLY
+        else "accounts.authentication.CachedJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
         "rest_framework.authentication.BasicAuthentication",
     ],
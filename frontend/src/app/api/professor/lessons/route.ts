@@ -0,0 +1,8 @@
+import { NextRequest } from "next/server";
+
+import { authorizedFetch, finalizeResponse } from "@/app/api/_authorized";
+
+export async function GET(request: NextRequest) {
+  const result = await authorizedFetch(`/api/professor/lessons/${request.nextUrl.search}`, { method: "GET" });
+  return finalizeResponse(result);
+}
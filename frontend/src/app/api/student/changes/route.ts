@@ -0,0 +1,10 @@
+import { NextRequest } from "next/server";
+
+import { authorizedFetch, finalizeResponse } from "@/app/api/_authorized";
+
+export async function GET(request: NextRequest) {
+  const since = request.nextUrl.searchParams.get("since");
+  const query = since ? `?since=${encodeURIComponent(since)}` : "";
+  const result = await authorizedFetch(`/api/student/changes/${query}`, { method: "GET" });
+  return finalizeResponse(result);
+}
@@ -1,6 +1,8 @@
+import { NextRequest } from "next/server";
+
 import { authorizedFetch, finalizeResponse } from "@/app/api/_authorized";
 
-export async function GET() {
-  const result = await authorizedFetch("/api/student/lessons/", { method: "GET" });
+export async function GET(request: NextRequest) {
+  const result = await authorizedFetch(`/api/student/lessons/${request.nextUrl.search}`, { method: "GET" });
   return finalizeResponse(result);
 }